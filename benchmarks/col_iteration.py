@@ -0,0 +1,62 @@
+"""Measures the time and allocations of iterating twice over all
+the entries and windows of :meth:`Consolidator.generate_col`.
+
+Usage::
+
+    python -m benchmarks.col_iteration
+"""
+
+import random
+import time
+import tracemalloc
+
+from owl_data_tools.consolidation import Consolidator
+
+N_ENTRIES = 200_000
+N_WINDOWS_PER_ENTRY = 8
+CHANGE_PROBABILITY = 0.05
+
+
+def create_consolidator() -> Consolidator:
+    rng = random.Random(0)
+    windows = [
+        {"path": f"/program/{j}.exe", "title": f"Window {j}"}
+        for j in range(N_WINDOWS_PER_ENTRY)
+    ]
+    consolidator = Consolidator()
+    for i in range(N_ENTRIES):
+        if rng.random() < CHANGE_PROBABILITY:
+            windows = list(windows)
+            j = rng.randrange(N_WINDOWS_PER_ENTRY)
+            windows[j] = {"path": windows[j]["path"], "title": f"Window {i}"}
+        consolidator.append_entry({"timestamp": i, "windows": windows})  # type: ignore
+    return consolidator
+
+
+def traverse(consolidator: Consolidator) -> int:
+    col = consolidator.generate_col()
+    n_active = 0
+    for _ in range(2):
+        for entry in col.get_entries_view(0, N_ENTRIES):
+            for window in entry.windows_view:
+                n_active += window.is_active
+    return n_active
+
+
+def main():
+    consolidator = create_consolidator()
+    print(f"{N_ENTRIES:,} entries, {N_WINDOWS_PER_ENTRY} windows per entry")
+
+    start = time.perf_counter()
+    traverse(consolidator)
+    print(f"{'time:':<14}{time.perf_counter() - start:.3f}s")
+
+    tracemalloc.start()
+    traverse(consolidator)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'peak memory:':<14}{peak:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measures the memory used while merging a COLF file
+into a :class:`Consolidator`, with :class:`ColfReader`
+and with ``json.load``.
+
+Usage::
+
+    python -m benchmarks.colf_read_memory
+"""
+
+import json
+import os
+import tempfile
+import tracemalloc
+
+from owl_data_tools.consolidation import ColfReader, Consolidator
+
+
+def write_colf(path: str, n_entries: int):
+    consolidator = Consolidator()
+    for i in range(n_entries):
+        consolidator.append_entry(
+            {  # type: ignore
+                "timestamp": i,
+                "windows": [
+                    {"path": f"/program/{j}.exe", "title": f"Window {j}"}
+                    for j in range(8)
+                ],
+            }
+        )
+    with open(path, "w", encoding="utf-8") as f:
+        consolidator.write_serialized([f])
+
+
+def measure(path: str, streaming: bool) -> int:
+    tracemalloc.start()
+    consolidator = Consolidator()
+    with open(path, "r", encoding="utf-8") as f:
+        if streaming:
+            reader = ColfReader(f)
+            consolidator.append_serialized_entries(
+                reader.dictionaries, reader.iter_entries()
+            )
+        else:
+            consolidator.append_from_serialized(json.load(f))
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - retained
+
+
+def main():
+    print("Transient memory while merging, on top of the consolidator itself.")
+    print(f"{'file size':>12} {'json.load':>12} {'ColfReader':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.colf.json")
+        for n_entries in (10_000, 40_000, 160_000):
+            write_colf(path, n_entries)
+            json_load = measure(path, False)
+            colf_reader = measure(path, True)
+            size = os.path.getsize(path)
+            print(f"{size:>12,} {json_load:>12,} {colf_reader:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Measures the memory held by a :class:`Consolidator` per window.
+
+Usage::
+
+    python -m benchmarks.consolidator_memory
+"""
+
+import tracemalloc
+
+from owl_data_tools.consolidation import Consolidator
+
+N_WINDOWS_PER_ENTRY = 8
+
+
+def measure(n_entries: int) -> int:
+    entries = [
+        {
+            "timestamp": i,
+            "windows": [
+                {
+                    "path": f"/program/{j}.exe",
+                    "title": f"Window {j}",
+                    "isActive": j == i % N_WINDOWS_PER_ENTRY,
+                }
+                for j in range(N_WINDOWS_PER_ENTRY)
+            ],
+        }
+        for i in range(n_entries)
+    ]
+
+    tracemalloc.start()
+    consolidator = Consolidator()
+    consolidator.append_entries(entries)  # type: ignore
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del consolidator
+    return size
+
+
+def main():
+    print(f"{'windows':>10} {'bytes':>12} {'bytes/window':>13}")
+    for n_entries in (10_000, 100_000):
+        n_windows = n_entries * N_WINDOWS_PER_ENTRY
+        size = measure(n_entries)
+        print(f"{n_windows:>10,} {size:>12,} {size / n_windows:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Measures the time taken to sum the foreground time of every program
+by day, with a loop over the entry views and with
+:meth:`ConsolidatedOwlLogs.get_durations`.
+
+Usage::
+
+    python -m benchmarks.durations
+"""
+
+import random
+import time
+
+from owl_data_tools.consolidation import Consolidator
+
+N_ENTRIES = 1_000_000
+"""About 58 days of snapshots taken every 5 seconds."""
+N_WINDOWS_PER_ENTRY = 8
+N_PROGRAMS = 40
+CHANGE_PROBABILITY = 0.05
+"""Probability of the windows changing between two snapshots."""
+MAX_DURATION = 60
+DAY = 86400
+
+
+def create_consolidator() -> Consolidator:
+    rng = random.Random(0)
+    consolidator = Consolidator()
+    windows = []
+    for i in range(N_ENTRIES):
+        if not windows or rng.random() < CHANGE_PROBABILITY:
+            windows = [
+                {
+                    "path": f"/program/{rng.randrange(N_PROGRAMS)}.exe",
+                    "title": f"Window {rng.randrange(50)}",
+                    "isActive": j == 0,
+                }
+                for j in range(N_WINDOWS_PER_ENTRY)
+            ]
+        consolidator.append_entry({"timestamp": i * 5, "windows": windows})  # type: ignore
+    return consolidator
+
+
+def loop(col) -> dict[str, dict[int, int]]:
+    durations: dict[str, dict[int, int]] = {}
+    entries = col.get_entries_view(0, N_ENTRIES * 5)
+    for entry, next_entry in zip(entries, entries[1:]):
+        duration = min(next_entry.timestamp - entry.timestamp, MAX_DURATION)
+        day = entry.timestamp // DAY * DAY
+        for path in {w.path for w in entry.windows_view if w.is_active}:
+            days = durations.setdefault(path, {})
+            days[day] = days.get(day, 0) + duration
+    return durations
+
+
+def main():
+    col = create_consolidator().generate_col()
+    print(f"{N_ENTRIES:,} entries")
+
+    start = time.perf_counter()
+    reference = loop(col)
+    print(f"{'loop:':<12}{time.perf_counter() - start:.3f}s")
+
+    if not hasattr(col, "get_durations"):
+        return
+
+    start = time.perf_counter()
+    durations = col.get_durations(resolution=DAY, max_duration=MAX_DURATION)
+    print(f"{'first:':<12}{time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    durations = col.get_durations(resolution=DAY, max_duration=MAX_DURATION)
+    print(f"{'next:':<12}{time.perf_counter() - start:.3f}s")
+    assert durations == reference
+
+
+if __name__ == "__main__":
+    main()
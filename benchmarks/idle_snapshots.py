@@ -0,0 +1,59 @@
+"""Measures the memory and COLF size of a :class:`Consolidator`
+fed with snapshots where the windows rarely change,
+like the ones taken by Watchful Owl while the user is idle.
+
+Usage::
+
+    python -m benchmarks.idle_snapshots
+"""
+
+import io
+import random
+import tracemalloc
+
+from owl_data_tools.consolidation import Consolidator
+
+N_ENTRIES = 100_000
+N_WINDOWS_PER_ENTRY = 8
+CHANGE_PROBABILITY = 0.05
+"""Probability of the windows changing between two snapshots."""
+
+
+def create_entries() -> list[dict]:
+    rng = random.Random(0)
+    windows = [
+        {"path": f"/program/{j}.exe", "title": f"Window {j}"}
+        for j in range(N_WINDOWS_PER_ENTRY)
+    ]
+    entries = []
+    for i in range(N_ENTRIES):
+        if rng.random() < CHANGE_PROBABILITY:
+            windows = list(windows)
+            j = rng.randrange(N_WINDOWS_PER_ENTRY)
+            windows[j] = {"path": windows[j]["path"], "title": f"Window {i}"}
+        entries.append({"timestamp": i, "windows": windows})
+    return entries
+
+
+def main():
+    entries = create_entries()
+
+    tracemalloc.start()
+    consolidator = Consolidator()
+    consolidator.append_entries(entries)  # type: ignore
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{N_ENTRIES:,} entries, {N_ENTRIES * N_WINDOWS_PER_ENTRY:,} windows")
+    print(f"{'memory:':<15}{size:>12,} bytes")
+    print(f"{'stored windows:':<15}{len(consolidator._window_is):>12,}")
+
+    for compact in (False, True):
+        buffer = io.StringIO()
+        consolidator.write_serialized([buffer], compact=compact)
+        label = "compact COLF:" if compact else "COLF:"
+        print(f"{label:<15}{len(buffer.getvalue()):>12,} characters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Measures the transient memory used while ingesting '.json.log' files.
+
+The transient memory is the peak traced memory during
+:func:`consolidator_from_files`, minus the memory still held
+by the resulting :class:`Consolidator`. With a streaming ingest
+path it should stay flat as the input grows.
+
+Usage::
+
+    python -m benchmarks.ingest_memory
+"""
+
+import contextlib
+import io
+import json
+import os
+from pathlib import Path
+import tempfile
+import tracemalloc
+
+from owl_data_tools.consolidation import consolidator_from_files
+
+TITLE_PADDING = "x" * 200
+
+
+def write_log(path: Path, n_entries: int):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n_entries):
+            entry = {
+                "timestamp": i,
+                "windows": [
+                    {
+                        "path": f"/program/{j}.exe",
+                        "title": f"{j} {TITLE_PADDING}",
+                        "isActive": j == i % 8,
+                    }
+                    for j in range(8)
+                ],
+            }
+            f.write(json.dumps(entry) + "\n")
+
+
+def measure(n_entries: int) -> tuple[int, int, int]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.json.log"
+        write_log(path, n_entries)
+        file_size = os.path.getsize(path)
+
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            consolidator = consolidator_from_files([str(path)])
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        del consolidator
+        return file_size, peak, peak - retained
+
+
+def main():
+    print(f"{'file size':>12} {'peak':>12} {'transient':>12}")
+    for n_entries in (2_000, 8_000, 32_000):
+        file_size, peak, transient = measure(n_entries)
+        print(f"{file_size:>12,} {peak:>12,} {transient:>12,}")
+
+
+if __name__ == "__main__":
+    main()
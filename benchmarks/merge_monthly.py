@@ -0,0 +1,61 @@
+"""Measures the time taken to merge 12 monthly COLF files,
+which share most of their windows, into a single :class:`Consolidator`.
+
+Usage::
+
+    python -m benchmarks.merge_monthly
+"""
+
+import random
+import time
+
+from owl_data_tools.consolidation import Consolidator
+
+N_MONTHS = 12
+N_ENTRIES_PER_MONTH = 20_000
+N_WINDOWS_PER_ENTRY = 8
+
+
+def create_months() -> list[Consolidator]:
+    rng = random.Random(0)
+    months = []
+    for month in range(N_MONTHS):
+        consolidator = Consolidator()
+        for i in range(N_ENTRIES_PER_MONTH):
+            consolidator.append_entry(
+                {  # type: ignore
+                    "timestamp": month * N_ENTRIES_PER_MONTH + i,
+                    "windows": [
+                        {
+                            "path": f"/program/{j}.exe",
+                            "title": f"Window {rng.randrange(50)}",
+                            "isActive": j == 0,
+                        }
+                        for j in range(N_WINDOWS_PER_ENTRY)
+                    ],
+                }
+            )
+        months.append(consolidator)
+    return months
+
+
+def main():
+    months = create_months()
+    print(f"{N_MONTHS} months of {N_ENTRIES_PER_MONTH:,} entries")
+
+    for compact in (False, True):
+        serialized = [month.serialize(compact=compact) for month in months]
+        start = time.perf_counter()
+        consolidator = Consolidator()
+        for month in serialized:
+            consolidator.append_from_serialized(month)
+        label = "compact COLF:" if compact else "COLF:"
+        print(f"{label:<15}{time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    Consolidator().append_from_consolidators(months)
+    print(f"{'consolidators:':<15}{time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Measures the time taken by :meth:`Consolidator.optimize`.
+
+Usage::
+
+    python -m benchmarks.optimize_speed
+"""
+
+import random
+import time
+
+from owl_data_tools.consolidation import Consolidator
+from owl_data_tools.consolidation import consolidator as consolidator_module
+
+N_ENTRIES = 200_000
+N_WINDOWS_PER_ENTRY = 10
+
+
+def create_consolidator() -> Consolidator:
+    rng = random.Random(0)
+    consolidator = Consolidator()
+    for i in range(N_ENTRIES):
+        consolidator.append_entry(
+            {  # type: ignore
+                "timestamp": i,
+                "windows": [
+                    {
+                        "path": f"/program/{rng.randrange(200)}.exe",
+                        "title": f"Window {rng.randrange(20_000)}",
+                    }
+                    for _ in range(N_WINDOWS_PER_ENTRY)
+                ],
+            }
+        )
+    return consolidator
+
+
+def measure() -> float:
+    consolidator = create_consolidator()
+    start = time.perf_counter()
+    consolidator.optimize()
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{N_ENTRIES * N_WINDOWS_PER_ENTRY:,} windows")
+
+    np = getattr(consolidator_module, "np", None)
+    if np is not None:
+        print(f"numpy:    {measure():.3f}s")
+        consolidator_module.np = None
+    print(f"fallback: {measure():.3f}s")
+    consolidator_module.np = np
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measures the memory used while writing a consolidator
+as a COLF file, with :meth:`Consolidator.write_serialized`
+and with ``json.dumps(consolidator.serialize())``.
+
+Usage::
+
+    python -m benchmarks.output_memory
+"""
+
+import json
+import os
+import tempfile
+import tracemalloc
+
+from owl_data_tools.consolidation import Consolidator
+
+
+def create_consolidator(n_entries: int) -> Consolidator:
+    consolidator = Consolidator()
+    for i in range(n_entries):
+        consolidator.append_entry(
+            {  # type: ignore
+                "timestamp": i,
+                "windows": [
+                    {"path": f"/program/{j}.exe", "title": f"Window {j}"}
+                    for j in range(8)
+                ],
+            }
+        )
+    consolidator.optimize()
+    return consolidator
+
+
+def measure(consolidator: Consolidator, streaming: bool) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "out.json"), "w", encoding="utf-8") as f:
+            tracemalloc.start()
+            if streaming:
+                consolidator.write_serialized([f])
+            else:
+                f.write(json.dumps(consolidator.serialize()))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return peak
+
+
+def main():
+    print(f"{'entries':>8} {'json.dumps':>12} {'streaming':>12}")
+    for n_entries in (10_000, 40_000, 160_000):
+        consolidator = create_consolidator(n_entries)
+        dumps_peak = measure(consolidator, False)
+        streaming_peak = measure(consolidator, True)
+        print(f"{n_entries:>8} {dumps_peak:>12,} {streaming_peak:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Measures the throughput of :func:`consolidator_from_files`
+with different numbers of worker processes.
+
+Usage::
+
+    python -m benchmarks.parallel_ingest
+"""
+
+import contextlib
+import io
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from owl_data_tools.consolidation import consolidator_from_files
+
+N_FILES = 16
+N_ENTRIES_PER_FILE = 5_000
+
+
+def write_logs(root: Path):
+    for day in range(N_FILES):
+        with open(root / f"{day:03}.json.log", "w", encoding="utf-8") as f:
+            for i in range(N_ENTRIES_PER_FILE):
+                entry = {
+                    "timestamp": day * N_ENTRIES_PER_FILE + i,
+                    "windows": [
+                        {
+                            "path": f"/program/{j}.exe",
+                            "title": f"Window {j} of day {day}",
+                            "isActive": j == i % 8,
+                        }
+                        for j in range(8)
+                    ],
+                }
+                f.write(json.dumps(entry) + "\n")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_logs(root)
+        paths = [str(p) for p in sorted(root.glob("*.json.log"))]
+
+        print(f"{'jobs':>4} {'seconds':>8} {'speedup':>8}")
+        baseline = None
+        for jobs in sorted({1, 2, 4, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                consolidator_from_files(paths, jobs=jobs)
+            elapsed = time.perf_counter() - start
+
+            baseline = baseline or elapsed
+            print(f"{jobs:>4} {elapsed:>8.2f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Measures the time taken to find the entries of a program,
+scanning the windows of every entry and with
+:meth:`ConsolidatedOwlLogs.get_entries_with_path`.
+
+Usage::
+
+    python -m benchmarks.path_queries
+"""
+
+import random
+import time
+
+from owl_data_tools.consolidation import Consolidator
+
+N_ENTRIES = 200_000
+N_WINDOWS_PER_ENTRY = 8
+N_PROGRAMS = 40
+N_QUERIES = 200
+CHANGE_PROBABILITY = 0.1
+"""Probability of the windows changing between two snapshots."""
+
+
+def create_consolidator() -> Consolidator:
+    rng = random.Random(0)
+    consolidator = Consolidator()
+    windows = []
+    for i in range(N_ENTRIES):
+        if not windows or rng.random() < CHANGE_PROBABILITY:
+            windows = [
+                {
+                    "path": f"/program/{rng.randrange(N_PROGRAMS)}.exe",
+                    "title": f"Window {rng.randrange(50)}",
+                    "isActive": j == 0,
+                }
+                for j in range(N_WINDOWS_PER_ENTRY)
+            ]
+        consolidator.append_entry({"timestamp": i * 5, "windows": windows})  # type: ignore
+    return consolidator
+
+
+def main():
+    col = create_consolidator().generate_col()
+    rng = random.Random(1)
+    queries = []
+    for _ in range(N_QUERIES):
+        start_time = rng.randrange(N_ENTRIES * 5)
+        queries.append(
+            (f"/program/{rng.randrange(N_PROGRAMS)}.exe", start_time, start_time + 3600)
+        )
+    print(f"{N_QUERIES:,} one hour queries over {N_ENTRIES:,} entries")
+
+    start = time.perf_counter()
+    n_scanned = 0
+    for path, start_time, end_time in queries[:10]:
+        for entry in col.get_entries_view(start_time, end_time):
+            n_scanned += any(w.path == path for w in entry.windows_view)
+    elapsed = (time.perf_counter() - start) * N_QUERIES / 10
+    print(f"{'scan:':<12}{elapsed:.3f}s (extrapolated from 10 queries)")
+
+    if not hasattr(col, "get_entries_with_path"):
+        return
+
+    start = time.perf_counter()
+    col.get_entries_with_path(queries[0][0])
+    print(f"{'index:':<12}{time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    n_found = 0
+    for path, start_time, end_time in queries:
+        runs = col.get_entries_with_path(path, start_time, end_time)
+        n_found += sum(len(run) for run in runs)
+    print(f"{'queries:':<12}{time.perf_counter() - start:.3f}s ({n_found:,} entries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Measures the time taken by many small time range queries
+on :meth:`ConsolidatedOwlLogs.get_entries_view`, one at a time
+and batched with :meth:`ConsolidatedOwlLogs.get_entries_views`.
+
+Usage::
+
+    python -m benchmarks.range_queries
+"""
+
+import random
+import time
+
+from owl_data_tools.consolidation import Consolidator
+
+N_ENTRIES = 500_000
+N_QUERIES = 20_000
+QUERY_LENGTH = 300
+
+
+def main():
+    consolidator = Consolidator()
+    for i in range(N_ENTRIES):
+        consolidator.append_entry({"timestamp": i * 5})  # type: ignore
+    col = consolidator.generate_col()
+
+    rng = random.Random(0)
+    time_ranges = []
+    for _ in range(N_QUERIES):
+        start = rng.randrange(N_ENTRIES * 5)
+        time_ranges.append((start, start + QUERY_LENGTH))
+    print(f"{N_QUERIES:,} queries over {N_ENTRIES:,} entries")
+
+    start = time.perf_counter()
+    for start_time, end_time in time_ranges:
+        col.get_entries_view(start_time, end_time)
+    print(f"{'one by one:':<12}{time.perf_counter() - start:.3f}s")
+
+    if hasattr(col, "get_entries_views"):
+        start = time.perf_counter()
+        col.get_entries_views(time_ranges)
+        print(f"{'batched:':<12}{time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
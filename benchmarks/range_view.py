@@ -0,0 +1,42 @@
+"""Measures the time taken to iterate over a large :class:`RangeView`,
+and to narrow it repeatedly by slicing and filtering.
+
+Usage::
+
+    python -m benchmarks.range_view
+"""
+
+import time
+
+from owl_data_tools.types import RangeView
+
+N_ITEMS = 5_000_000
+
+
+def main():
+    items = list(range(N_ITEMS))
+    view = RangeView(1, N_ITEMS - 2, items)
+    print(f"{N_ITEMS:,} items")
+
+    start = time.perf_counter()
+    for _ in view:
+        pass
+    print(f"{'iteration:':<12}{time.perf_counter() - start:.3f}s")
+
+    if not hasattr(view, "where"):
+        return
+
+    start = time.perf_counter()
+    narrowed = view
+    for _ in range(1000):
+        narrowed = narrowed[1:-1]
+    narrowed = narrowed.stride(2).where(lambda x: x % 3 == 0)
+    print(f"{'narrowing:':<12}{time.perf_counter() - start:.6f}s")
+
+    start = time.perf_counter()
+    n_items = sum(1 for _ in narrowed)
+    print(f"{'filtering:':<12}{time.perf_counter() - start:.3f}s ({n_items:,} items)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Measures the time taken to total the foreground time of every program
+over random time ranges, aggregating every entry of the ranges with
+:meth:`ConsolidatedOwlLogs.get_durations`, and combining rollups
+with the entries at the edges with
+:meth:`ConsolidatedOwlLogs.get_total_durations`.
+
+Usage::
+
+    python -m benchmarks.rollups
+"""
+
+import random
+import time
+
+from benchmarks.durations import N_ENTRIES, create_consolidator
+
+N_QUERIES = 200
+
+
+def main():
+    col = create_consolidator().generate_col()
+    rng = random.Random(1)
+    time_ranges = []
+    for _ in range(N_QUERIES):
+        start_time = rng.randrange(N_ENTRIES * 5)
+        time_ranges.append((start_time, rng.randrange(start_time, N_ENTRIES * 5)))
+    print(f"{N_QUERIES} queries over {N_ENTRIES:,} entries")
+
+    start = time.perf_counter()
+    for start_time, end_time in time_ranges:
+        col.get_durations(resolution=1 << 40, start_time=start_time, end_time=end_time)
+    print(f"{'entries:':<12}{time.perf_counter() - start:.3f}s")
+
+    if not hasattr(col, "get_total_durations"):
+        return
+
+    start = time.perf_counter()
+    col.get_rollups()
+    print(f"{'rollups:':<12}{time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    for start_time, end_time in time_ranges:
+        col.get_total_durations(start_time, end_time)
+    print(f"{'queries:':<12}{time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
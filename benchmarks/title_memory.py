@@ -0,0 +1,63 @@
+"""Measures the memory held by a :class:`Consolidator` per distinct
+title, with and without ``compact_titles``.
+
+Usage::
+
+    python -m benchmarks.title_memory
+"""
+
+import time
+import tracemalloc
+from typing import Iterator
+
+from owl_data_tools.consolidation import Consolidator
+
+N_TITLES = 200_000
+
+
+def create_entries() -> Iterator[dict]:
+    # Created while tracing, so titles held by the consolidator are measured.
+    for i in range(N_TITLES):
+        yield {
+            "timestamp": i,
+            "windows": [
+                {
+                    "path": "/program/code.exe",
+                    "title": f"file_{i}.py - project - Visual Studio Code",
+                }
+            ],
+        }
+
+
+def consolidate(compact_titles: bool) -> Consolidator:
+    consolidator = Consolidator(compact_titles=compact_titles)
+    for entry in create_entries():
+        consolidator.append_entry(entry)  # type: ignore
+    return consolidator
+
+
+def measure(compact_titles: bool) -> tuple[int, float]:
+    tracemalloc.start()
+    consolidator = consolidate(compact_titles)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del consolidator
+
+    # Timed separately, as tracing slows allocations down.
+    start = time.perf_counter()
+    consolidate(compact_titles)
+    return size, time.perf_counter() - start
+
+
+def main():
+    raw = sum(len(e["windows"][0]["title"].encode()) for e in create_entries())
+    print(f"{N_TITLES:,} titles, {raw / N_TITLES:.1f} UTF-8 bytes/title")
+    print(f"{'':<15}{'bytes/title':>12} {'time':>8}")
+    for compact_titles in (False, True):
+        size, elapsed = measure(compact_titles)
+        label = "compact titles:" if compact_titles else "default:"
+        print(f"{label:<15}{size / N_TITLES:>12.1f} {elapsed:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
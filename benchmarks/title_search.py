@@ -0,0 +1,72 @@
+"""Measures the time taken to find the entries with a title
+containing a text, scanning the windows of every entry and with
+:meth:`ConsolidatedOwlLogs.get_entries_with_title_containing`.
+
+Usage::
+
+    python -m benchmarks.title_search
+"""
+
+import random
+import time
+
+from owl_data_tools.consolidation import Consolidator
+
+N_ENTRIES = 300_000
+N_WINDOWS_PER_ENTRY = 8
+N_PROJECTS = 500
+CHANGE_PROBABILITY = 0.2
+"""Probability of the windows changing between two snapshots."""
+QUERIES = ["project-42", "PROJECT-7/", "github.com/owl/project-1", "no match"]
+
+
+def create_consolidator() -> Consolidator:
+    rng = random.Random(0)
+    consolidator = Consolidator()
+    windows = []
+    for i in range(N_ENTRIES):
+        if not windows or rng.random() < CHANGE_PROBABILITY:
+            windows = [
+                {
+                    "path": f"/program/{j}.exe",
+                    "title": f"github.com/owl/project-{rng.randrange(N_PROJECTS)}/"
+                    f"file_{rng.randrange(200)}.py - Editor",
+                    "isActive": j == 0,
+                }
+                for j in range(N_WINDOWS_PER_ENTRY)
+            ]
+        consolidator.append_entry({"timestamp": i * 5, "windows": windows})  # type: ignore
+    return consolidator
+
+
+def main():
+    col = create_consolidator().generate_col()
+    n_titles = len(col._titles)
+    print(f"{len(QUERIES)} queries over {N_ENTRIES:,} entries, {n_titles:,} titles")
+
+    start = time.perf_counter()
+    for text in QUERIES:
+        text = text.casefold()
+        sum(
+            any(text in w.title.casefold() for w in entry.windows_view)
+            for entry in col.get_entries_view(0, N_ENTRIES * 5)
+        )
+    print(f"{'scan:':<12}{time.perf_counter() - start:.3f}s")
+
+    if not hasattr(col, "get_entries_with_title_containing"):
+        return
+
+    start = time.perf_counter()
+    col.get_entries_with_title_containing(QUERIES[0])
+    print(f"{'indexes:':<12}{time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    n_found = 0
+    for text in QUERIES:
+        runs = col.get_entries_with_title_containing(text)
+        n_found += sum(len(run) for run in runs)
+    print(f"{'queries:':<12}{time.perf_counter() - start:.3f}s ({n_found:,} entries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Measures the size and parse time of the title dictionary of COLF,
+with and without the shared title suffixes of the compact version.
+
+Usage::
+
+    python -m benchmarks.title_suffixes
+"""
+
+import json
+import random
+import time
+
+from owl_data_tools.consolidation import Consolidator
+from owl_data_tools.consolidation.consolidator import _dictionary_values
+
+N_TITLES = 100_000
+APPS = [" - Visual Studio Code", " - Google Chrome", " - Mozilla Firefox"]
+PROJECTS = [f" - project_{i}" for i in range(20)]
+
+
+def create_consolidator() -> Consolidator:
+    rng = random.Random(0)
+    consolidator = Consolidator()
+    for i in range(N_TITLES):
+        app = rng.choice(APPS)
+        project = rng.choice(PROJECTS) if app == APPS[0] else ""
+        consolidator.append_entry(
+            {  # type: ignore
+                "timestamp": i,
+                "windows": [
+                    {"path": "/program/app.exe", "title": f"page_{i}{project}{app}"}
+                ],
+            }
+        )
+    return consolidator
+
+
+def main():
+    consolidator = create_consolidator()
+    consolidator.optimize()
+    print(f"{N_TITLES:,} titles")
+    print(f"{'':<12}{'characters':>12} {'parse':>8} {'expand':>8}")
+
+    for compact in (False, True):
+        title_dictionary = consolidator._serialize_header(compact)["dictionaries"][1]
+        encoded = json.dumps(title_dictionary)
+
+        start = time.perf_counter()
+        parsed_dictionary = json.loads(encoded)
+        parsed = time.perf_counter()
+        _dictionary_values(parsed_dictionary)
+        expanded = time.perf_counter()
+
+        label = "suffixes:" if compact else "plain:"
+        print(
+            f"{label:<12}{len(encoded):>12,} {parsed - start:>7.3f}s"
+            f" {expanded - parsed:>7.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Measures the memory of entry and window objects, when a large
+range of :class:`ConsolidatedOwlLogs` is materialized, and when
+:class:`Entry` and :class:`Window` are created directly.
+
+Usage::
+
+    python -m benchmarks.view_memory
+"""
+
+import sys
+import tracemalloc
+
+from owl_data_tools.consolidation import Consolidator
+from owl_data_tools.types import Entry, Window
+
+N_ENTRIES = 100_000
+N_WINDOWS_PER_ENTRY = 4
+
+
+def create_consolidator() -> Consolidator:
+    consolidator = Consolidator()
+    for i in range(N_ENTRIES):
+        consolidator.append_entry(
+            {  # type: ignore
+                "timestamp": i,
+                "windows": [
+                    {"path": f"/program/{j}.exe", "title": f"Window {i % 100 + j}"}
+                    for j in range(N_WINDOWS_PER_ENTRY)
+                ],
+            }
+        )
+    return consolidator
+
+
+def main():
+    col = create_consolidator().generate_col()
+    print(f"{N_ENTRIES:,} entries, {N_WINDOWS_PER_ENTRY} windows per entry")
+
+    tracemalloc.start()
+    entries = list(col.get_entries_view(0, N_ENTRIES))
+    windows = [entry.windows_view for entry in entries]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{'views:':<10}{size / N_ENTRIES:>8.1f} bytes/entry,"
+        f" entry view {sys.getsizeof(entries[0])} bytes,"
+        f" window view {sys.getsizeof(windows[0][0])} bytes"
+    )
+    del entries, windows
+
+    tracemalloc.start()
+    objects = [
+        Entry(i, [Window("/program.exe", "Title") for _ in range(N_WINDOWS_PER_ENTRY)])
+        for i in range(N_ENTRIES)
+    ]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    entry_size = sys.getsizeof(objects[0]) + sys.getsizeof(
+        getattr(objects[0], "__dict__", None) or ()
+    )
+    print(
+        f"{'objects:':<10}{size / N_ENTRIES:>8.1f} bytes/entry,"
+        f" entry {entry_size} bytes"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from pathlib import Path
 import sys
 from typing import Any, Optional, Sequence
 
+from .consolidation.consolidated_owl_logs import ConsolidatedOwlLogs
 from .consolidation.files import consolidator_from_files
 
 
@@ -15,12 +16,51 @@ def create_parser() -> argparse.ArgumentParser:
         "-i",
         action="append",
         metavar="in",
-        help="Path to a '.json.log' or '.COLF' file. Glob pattern is also supported.",
+        help="Path to a '.json.log' or '.COLF' file, optionally compressed "
+        "('.gz', '.bz2', '.xz'). Glob pattern is also supported.",
         required=True,
     )
     parser.add_argument(
         "--output", "-o", action="append", metavar="out", help="Output path."
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of processes used to decode the input files.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only consolidate input files that changed since the last run "
+        "into the existing output.",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write the output in the compact COLF version, where windows "
+        "that did not change since the previous entry are not repeated.",
+    )
+    parser.add_argument(
+        "--deduplicate",
+        action="store_true",
+        help="Drop duplicate entries, with the same timestamp and windows, "
+        "of input files that overlap.",
+    )
+    parser.add_argument(
+        "--rollups",
+        action="store_true",
+        help="Add the hourly, daily and weekly foreground time of every "
+        "program to the output.",
+    )
+    parser.add_argument(
+        "--search",
+        metavar="text",
+        help="Print the titles containing the text, ignoring case, "
+        "with the number of entries they are in.",
+    )
     return parser
 
 
@@ -37,14 +77,41 @@ def transform_entry(entry: dict[str, Any]):
         entry["durationSinceLastUserInput"] = entry.pop("durationSinceLastInput")
 
 
+def print_search(col: ConsolidatedOwlLogs, text: str):
+    results = []
+    for title in col.search_titles(text):
+        runs = col.get_entries_with_title(title)
+        results.append((sum(len(run) for run in runs), title))
+
+    results.sort(key=lambda result: -result[0])
+    for n_entries, title in results:
+        print(f"{n_entries:>10}  {title}")
+
+
 def main(args: Sequence[str], _test_cwd: Optional[Path] = None):
     parser = create_parser()
     parsed = parser.parse_args(args[1:])
 
-    consolidator_from_files(
-        parsed.input, parsed.output, root_dir=_test_cwd, entry_transform=transform_entry
+    consolidator = consolidator_from_files(
+        parsed.input,
+        parsed.output,
+        root_dir=_test_cwd,
+        entry_transform=transform_entry,
+        jobs=parsed.jobs,
+        incremental=parsed.incremental,
+        compact=parsed.compact,
+        deduplicate=parsed.deduplicate,
+        rollups=parsed.rollups,
     )
 
+    if parsed.search is not None:
+        if consolidator is None:
+            # The output is up to date, it is only loaded to be searched.
+            consolidator = consolidator_from_files(
+                parsed.output[:1], root_dir=_test_cwd
+            )
+        print_search(consolidator.generate_col(), parsed.search)  # type: ignore
+
 
 if __name__ == "__main__":
     main(sys.argv)
@@ -108,3 +108,54 @@ def test_serialized_json(tmp_path: Path):
             ["main.py", "-i", "one.json.log", "-i", "two.json", "-o", "./output.json"],
             root,
         )
+
+
+def test_jobs(tmp_path: Path):
+    root = tmp_path
+
+    p_one = root / "one.json.log"
+    p_two = root / "two.json"
+    p_three = root / "three.json.log"
+
+    p_one.write_text(entries_to_json_lines(ENTRIES_ORIGINAL[:1]))
+
+    p_two_consolidator = Consolidator()
+    p_two_consolidator.append_entries(ENTRIES_ORIGINAL[1:3])
+    p_two.write_text(json.dumps(p_two_consolidator.serialize()))
+
+    p_three.write_text(entries_to_json_lines(ENTRIES_ORIGINAL[3:]))
+
+    args = ["main.py", "-i", "one.json.log", "-i", "two.json", "-i", "three.json.log"]
+    main(args + ["-o", "serial.json"], root)
+    main(args + ["-o", "parallel.json", "--jobs", "2"], root)
+
+    assert (root / "serial.json").read_bytes() == (root / "parallel.json").read_bytes()
+
+    main(args + ["-o", "compact.json", "--compact"], root)
+    main(["main.py", "-i", "compact.json", "-o", "expanded.json"], root)
+
+    assert (root / "serial.json").read_bytes() == (root / "expanded.json").read_bytes()
+
+
+def test_search(tmp_path: Path, capsys):
+    (tmp_path / "one.json.log").write_text(entries_to_json_lines(ENTRIES_ORIGINAL))
+
+    main(["main.py", "-i", "one.json.log", "--search", "o"], tmp_path)
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split() for line in lines[1:]] == [
+        ["2", "Zero"],
+        ["2", "One"],
+        ["2", "Two"],
+    ]
+
+    main(["main.py", "-i", "one.json.log", "--search", "ZER"], tmp_path)
+    assert capsys.readouterr().out.splitlines()[1].split() == ["2", "Zero"]
+
+    # An up to date output is loaded to be searched.
+    args = ["main.py", "-i", "one.json.log", "-o", "out.json", "--incremental"]
+    main(args, tmp_path)
+    capsys.readouterr()
+    main(args + ["--search", "ZER"], tmp_path)
+    lines = capsys.readouterr().out.splitlines()
+    assert "(UNCHANGED OUTPUT)" in lines[1]
+    assert lines[-1].split() == ["2", "Zero"]
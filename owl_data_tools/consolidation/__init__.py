@@ -1,12 +1,18 @@
+from .colf_reader import ColfReader
 from .consolidator import Consolidator
-from .dictionary import Dictionary, DictionaryMapper
+from .dictionary import CompactDictionary, Dictionary, DictionaryMapper
 from .consolidated_owl_logs import ConsolidatedOwlLogs
-from .files import consolidator_from_files
+from .files import LogFileReader, consolidator_from_files
+from .manifest import Manifest
 
 __all__ = [
+    "ColfReader",
+    "CompactDictionary",
     "ConsolidatedOwlLogs",
     "Consolidator",
     "Dictionary",
     "DictionaryMapper",
+    "LogFileReader",
+    "Manifest",
     "consolidator_from_files",
 ]
@@ -0,0 +1,484 @@
+"""Aggregation of the time spent in windows, by path or title
+and by time bucket, over integer-coded columns.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterable, Iterator, Optional, Sequence, TypedDict
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+MONDAY = 4 * DAY
+"""Origin of the weeks starting on Monday, the UNIX epoch being a Thursday."""
+DEFAULT_MAX_DURATION = 60
+"""Default maximum duration of an entry, in seconds. A longer gap
+until the next entry is treated as the computer being off or asleep."""
+
+Durations = dict[int, dict[int, int]]
+"""Durations in seconds by dictionary index, then by bucket start time."""
+
+
+class BlockKeys:
+    """Distinct path or title indexes of the windows
+    of every block of consecutive entries."""
+
+    __slots__ = ("starts", "offsets", "keys")
+
+    starts: array[int]
+    """Index of the first entry of every block,
+    followed by the index after the last entry."""
+    offsets: array[int]
+    """Offset of the keys of every block in :attr:`keys`,
+    followed by the number of keys."""
+    keys: array[int]
+
+    def __init__(
+        self,
+        window_blocks: Iterable[tuple[int, int, Sequence[tuple[int, int, bool]]]],
+        n_entries: int,
+        key_i: int,
+        active_only: bool,
+    ):
+        """
+        Parameters
+        ----------
+        window_blocks : WindowBlocks
+            Blocks of entries in chronological order.
+            Entries outside of any block have no windows.
+        n_entries : int
+            Number of entries.
+        key_i : int
+            Index of the key in the window tuples,
+            0 for the path index, 1 for the title index.
+        active_only : bool
+            Only keep the windows where the user is active.
+        """
+        self.starts = array("q")
+        self.offsets = array("q")
+        self.keys = array("I")
+
+        starts = self.starts
+        offsets = self.offsets
+        keys = self.keys
+        previous_end = 0
+        for start, end, windows in window_blocks:
+            if start != previous_end:
+                starts.append(previous_end)
+                offsets.append(len(keys))
+            starts.append(start)
+            offsets.append(len(keys))
+            keys.extend(sorted({w[key_i] for w in windows if w[2] or not active_only}))
+            previous_end = end
+        if previous_end != n_entries:
+            starts.append(previous_end)
+            offsets.append(len(keys))
+        starts.append(n_entries)
+        offsets.append(len(keys))
+
+
+def aggregate_durations(
+    timestamps: Sequence[int],
+    n_entries: int,
+    block_keys: BlockKeys,
+    lo: int,
+    hi: int,
+    resolution: int,
+    origin: int = 0,
+    max_duration: int = DEFAULT_MAX_DURATION,
+) -> Durations:
+    """Sum the durations of the entries from `lo` to `hi`,
+    by key of :class:`BlockKeys` and by time bucket.
+
+    The duration of an entry is the time until the next entry,
+    capped to `max_duration`, and it is counted in the bucket
+    of the entry's timestamp. The last entry has no duration.
+    NumPy is used if it is available.
+
+    Parameters
+    ----------
+    timestamps : Sequence[int]
+        Timestamp of every entry, can be longer than `n_entries`.
+    n_entries : int
+        Number of entries.
+    block_keys : BlockKeys
+        Keys of the blocks of entries.
+    lo : int
+        Index of the first entry.
+    hi : int
+        Index after the last entry.
+    resolution : int
+        Duration of a bucket in seconds, e.g. :data:`HOUR` or :data:`DAY`.
+    origin : int, optional
+        UNIX timestamp of the start of a bucket, by default 0.
+        E.g. :data:`MONDAY` for weeks starting on Monday, or the negated
+        UTC offset of a time zone for its days.
+    max_duration : int, optional
+        Maximum duration of an entry in seconds,
+        by default :data:`DEFAULT_MAX_DURATION`.
+
+    Returns
+    -------
+    Durations
+        Durations in seconds by key, then by bucket start time.
+        Keys and buckets without any duration are omitted.
+    """
+    if lo >= hi:
+        return {}
+    if np is None:
+        return _aggregate_durations_python(
+            timestamps, n_entries, block_keys, lo, hi, resolution, origin, max_duration
+        )
+
+    times = np.array(timestamps[lo : min(hi + 1, n_entries)], dtype=np.int64)
+    durations = np.minimum(np.diff(times), max_duration)
+    if hi == n_entries:
+        durations = np.append(durations, 0)
+    times = times[: hi - lo]
+    buckets = (times - origin) // resolution
+
+    # Segments of consecutive entries in the same block and bucket.
+    block_starts = np.frombuffer(block_keys.starts, dtype=np.int64)
+    blocks = np.searchsorted(block_starts, np.arange(lo, hi), "right") - 1
+    changes = np.flatnonzero(
+        (buckets[1:] != buckets[:-1]) | (blocks[1:] != blocks[:-1])
+    )
+    segment_starts = np.concatenate(([0], changes + 1))
+    segment_durations = np.add.reduceat(durations, segment_starts)
+    segment_blocks = blocks[segment_starts]
+    segment_buckets = buckets[segment_starts]
+
+    # One row per key of every segment.
+    offsets = np.frombuffer(block_keys.offsets, dtype=np.int64)
+    n_keys = offsets[segment_blocks + 1] - offsets[segment_blocks]
+    row_segments = np.repeat(np.arange(len(segment_starts)), n_keys)
+    row_key_is = np.arange(int(n_keys.sum())) + np.repeat(
+        offsets[segment_blocks] - (np.cumsum(n_keys) - n_keys), n_keys
+    )
+    row_keys = np.frombuffer(block_keys.keys, dtype=np.uint32)[row_key_is]
+
+    bucket_min = int(segment_buckets[0])
+    n_buckets = int(segment_buckets[-1]) - bucket_min + 1
+    codes = row_keys.astype(np.int64) * n_buckets + (
+        segment_buckets[row_segments] - bucket_min
+    )
+    unique_codes, inverse = np.unique(codes, return_inverse=True)
+    totals = np.bincount(
+        inverse.reshape(-1), weights=segment_durations[row_segments]
+    ).astype(np.int64)
+
+    result: Durations = {}
+    for code, total in zip(unique_codes.tolist(), totals.tolist()):
+        if total:
+            key, bucket = divmod(code, n_buckets)
+            result.setdefault(key, {})[
+                origin + (bucket_min + bucket) * resolution
+            ] = total
+    return result
+
+
+def _aggregate_durations_python(
+    timestamps: Sequence[int],
+    n_entries: int,
+    block_keys: BlockKeys,
+    lo: int,
+    hi: int,
+    resolution: int,
+    origin: int,
+    max_duration: int,
+) -> Durations:
+    """Pure Python implementation of :func:`aggregate_durations`."""
+    starts = block_keys.starts
+    offsets = block_keys.offsets
+    keys = block_keys.keys
+    totals: dict[tuple[int, int], int] = {}
+
+    def add_segment(block: int, bucket: int, duration: int):
+        if duration:
+            for key in keys[offsets[block] : offsets[block + 1]]:
+                totals[key, bucket] = totals.get((key, bucket), 0) + duration
+
+    block = bisect_right(starts, lo) - 1
+    next_block_start = starts[block + 1]
+    segment_block = block
+    segment_bucket = (timestamps[lo] - origin) // resolution
+    segment_duration = 0
+    for i in range(lo, hi):
+        time = timestamps[i]
+        while i >= next_block_start:
+            block += 1
+            next_block_start = starts[block + 1]
+        bucket = (time - origin) // resolution
+        if block != segment_block or bucket != segment_bucket:
+            add_segment(segment_block, segment_bucket, segment_duration)
+            segment_block = block
+            segment_bucket = bucket
+            segment_duration = 0
+        if i + 1 < n_entries:
+            segment_duration += min(timestamps[i + 1] - time, max_duration)
+    add_segment(segment_block, segment_bucket, segment_duration)
+
+    result: Durations = {}
+    for (key, bucket), total in sorted(totals.items()):
+        result.setdefault(key, {})[origin + bucket * resolution] = total
+    return result
+
+
+ROLLUP_RESOLUTIONS = ((HOUR, 0), (DAY, 0), (WEEK, MONDAY))
+"""Resolution and origin of the levels of :class:`Rollups`, from the finest
+to the coarsest. Every bucket of a level is made of whole buckets
+of the previous level."""
+
+
+class RollupLevel:
+    """Durations of every key by bucket, at one resolution,
+    with their cumulative sums to total any range of buckets."""
+
+    __slots__ = ("resolution", "origin", "starts", "cumulative")
+
+    resolution: int
+    origin: int
+    starts: dict[int, array[int]]
+    """Sorted start time of the buckets of every key."""
+    cumulative: dict[int, array[int]]
+    """Sum of the durations of the buckets before every bucket
+    of every key, followed by the total."""
+
+    def __init__(self, resolution: int, origin: int, durations: Durations):
+        self.resolution = resolution
+        self.origin = origin
+        self.starts = {}
+        self.cumulative = {}
+        for key, buckets in durations.items():
+            starts = self.starts[key] = array("q", sorted(buckets))
+            cumulative = self.cumulative[key] = array("q", [0])
+            total = 0
+            for start in starts:
+                total += buckets[start]
+                cumulative.append(total)
+
+    def get_durations(self) -> Durations:
+        """Get the durations by key, then by bucket start time."""
+        return {
+            key: {
+                start: cumulative[j + 1] - cumulative[j]
+                for j, start in enumerate(starts)
+            }
+            for key, (starts, cumulative) in self._iter_keys()
+        }
+
+    def get_totals(self, start: int, end: int) -> dict[int, int]:
+        """Get the total durations of every key, of the buckets
+        starting from `start` (inclusive) to `end` (exclusive)."""
+        totals = {}
+        for key, (starts, cumulative) in self._iter_keys():
+            total = (
+                cumulative[bisect_left(starts, end)]
+                - cumulative[bisect_left(starts, start)]
+            )
+            if total:
+                totals[key] = total
+        return totals
+
+    def _iter_keys(self) -> Iterator[tuple[int, tuple[array[int], array[int]]]]:
+        for key, starts in self.starts.items():
+            yield key, (starts, self.cumulative[key])
+
+    def floor(self, time: int) -> int:
+        """Get the start of the bucket of `time`."""
+        return time - (time - self.origin) % self.resolution
+
+    def ceil(self, time: int) -> int:
+        """Get the start of the first bucket from `time`."""
+        return time + (self.origin - time) % self.resolution
+
+
+class Rollups:
+    """Pyramid of the durations of every key by bucket at the
+    :data:`ROLLUP_RESOLUTIONS`, typically of the foreground windows
+    by path index. Totals of any time range are computed from the
+    coarsest buckets that fit in it, so only the entries at its edges,
+    outside of any whole bucket, have to be aggregated.
+    """
+
+    __slots__ = ("max_duration", "levels")
+
+    max_duration: int
+    """Maximum duration of an entry the durations are computed with."""
+    levels: list[RollupLevel]
+    """From the finest to the coarsest."""
+
+    def __init__(self, max_duration: int, levels: list[RollupLevel]):
+        self.max_duration = max_duration
+        self.levels = levels
+
+    @staticmethod
+    def from_durations(
+        durations: Durations,
+        max_duration: int = DEFAULT_MAX_DURATION,
+        resolutions: Sequence[tuple[int, int]] = ROLLUP_RESOLUTIONS,
+    ) -> Rollups:
+        """Create the rollups from the durations
+        at the finest of the `resolutions`.
+
+        Parameters
+        ----------
+        durations : Durations
+            Durations by key, then by bucket start time,
+            at the first of `resolutions`.
+        max_duration : int, optional
+            Maximum duration of an entry the durations are computed with,
+            by default :data:`DEFAULT_MAX_DURATION`.
+        resolutions : Sequence[tuple[int, int]], optional
+            Resolution and origin of every level,
+            by default :data:`ROLLUP_RESOLUTIONS`.
+
+        Returns
+        -------
+        Rollups
+        """
+        levels: list[RollupLevel] = []
+        for resolution, origin in resolutions:
+            if levels:
+                # Sum the buckets of the previous level.
+                coarse: Durations = {}
+                for key, buckets in durations.items():
+                    coarse_buckets = coarse[key] = {}
+                    for start, duration in buckets.items():
+                        start -= (start - origin) % resolution
+                        coarse_buckets[start] = coarse_buckets.get(start, 0) + duration
+                durations = coarse
+            levels.append(RollupLevel(resolution, origin, durations))
+
+        return Rollups(max_duration, levels)
+
+    def get_totals(
+        self, start: int, end: int, aggregate: Callable[[int, int], dict[int, int]]
+    ) -> dict[int, int]:
+        """Get the total durations of every key from `start` (inclusive)
+        to `end` (exclusive).
+
+        Parameters
+        ----------
+        start : int
+            UNIX timestamp of the start time.
+        end : int
+            UNIX timestamp after the end time.
+        aggregate : Callable[[int, int], dict[int, int]]
+            Function computing the total durations of every key
+            from the entries between a start and an end time,
+            only called for the edges of the time range.
+
+        Returns
+        -------
+        dict[int, int]
+            Total durations by key.
+        """
+        totals: dict[int, int] = {}
+
+        def add(level_i: int, start: int, end: int):
+            if start >= end:
+                return
+            if level_i < 0:
+                key_totals = aggregate(start, end)
+            else:
+                level = self.levels[level_i]
+                inner_start = level.ceil(start)
+                inner_end = level.floor(end)
+                if inner_start >= inner_end:
+                    add(level_i - 1, start, end)
+                    return
+                add(level_i - 1, start, inner_start)
+                add(level_i - 1, inner_end, end)
+                key_totals = level.get_totals(inner_start, inner_end)
+
+            for key, total in key_totals.items():
+                totals[key] = totals.get(key, 0) + total
+
+        add(len(self.levels) - 1, start, end)
+        return totals
+
+    def serialize(self) -> _RollupsData:
+        """Generate JSON-serializable dictionary."""
+        return {
+            "maxDuration": self.max_duration,
+            "levels": [
+                {
+                    "resolution": level.resolution,
+                    "origin": level.origin,
+                    "keys": list(level.starts),
+                    "starts": [list(starts) for starts in level.starts.values()],
+                    "durations": [
+                        [b - a for a, b in zip(cumulative, cumulative[1:])]
+                        for cumulative in level.cumulative.values()
+                    ],
+                }
+                for level in self.levels
+            ],
+        }
+
+    @staticmethod
+    def from_serialized(
+        serialized: _RollupsData, key_map: Optional[Sequence[Optional[int]]] = None
+    ) -> Rollups:
+        """Create the rollups from serialized data.
+
+        Parameters
+        ----------
+        serialized : _RollupsData
+            Serialized rollups.
+        key_map : Optional[Sequence[Optional[int]]], optional
+            New key of every serialized key, by default None
+            to keep them. Keys mapped to None are dropped.
+
+        Returns
+        -------
+        Rollups
+        """
+        levels: list[RollupLevel] = []
+        for level_data in serialized["levels"]:
+            durations: Durations = {}
+            for key, starts, key_durations in zip(
+                level_data["keys"], level_data["starts"], level_data["durations"]
+            ):
+                if key_map is not None:
+                    mapped_key = key_map[key]
+                    if mapped_key is None:
+                        continue
+                    key = mapped_key
+                durations[key] = dict(zip(starts, key_durations))
+            levels.append(
+                RollupLevel(level_data["resolution"], level_data["origin"], durations)
+            )
+        return Rollups(serialized["maxDuration"], levels)
+
+    def remapped(self, old_to_new: Sequence[int]) -> Rollups:
+        """Get the rollups with every key `i` replaced by ``old_to_new[i]``."""
+        return Rollups.from_serialized(self.serialize(), old_to_new)
+
+
+class _RollupLevelData(TypedDict):
+    """Serialized :class:`RollupLevel`."""
+
+    resolution: int
+    origin: int
+    keys: list[int]
+    """Path indexes."""
+    starts: list[list[int]]
+    """Start time of the buckets of every key."""
+    durations: list[list[int]]
+    """Duration of the buckets of every key."""
+
+
+class _RollupsData(TypedDict):
+    """Serialized :class:`Rollups`."""
+
+    maxDuration: int
+    levels: list[_RollupLevelData]
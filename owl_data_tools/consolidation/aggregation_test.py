@@ -0,0 +1,109 @@
+import json
+import random
+
+import pytest
+
+from . import aggregation as aggregation_module
+from .aggregation import DAY, HOUR, WEEK, BlockKeys, Rollups, aggregate_durations
+
+
+def test_block_keys():
+    blocks = [
+        (1, 3, [(0, 5, True), (1, 6, False), (0, 7, False)]),
+        (3, 4, [(2, 8, False)]),
+        (6, 7, []),
+    ]
+    block_keys = BlockKeys(blocks, 9, 0, False)
+    assert list(block_keys.starts) == [0, 1, 3, 4, 6, 7, 9]
+    assert list(block_keys.offsets) == [0, 0, 2, 3, 3, 3, 3]
+    assert list(block_keys.keys) == [0, 1, 2]
+
+    block_keys = BlockKeys(blocks, 7, 1, True)
+    assert list(block_keys.starts) == [0, 1, 3, 4, 6, 7]
+    assert list(block_keys.keys) == [5]
+
+    assert list(BlockKeys([], 0, 0, False).starts) == [0]
+
+
+def test_numpy_and_python(monkeypatch):
+    pytest.importorskip("numpy")
+
+    rng = random.Random(0)
+    timestamps = []
+    blocks = []
+    time = 0
+    start = 0
+    while start < 2000:
+        end = start + rng.randrange(1, 20)
+        windows = [
+            (rng.randrange(10), rng.randrange(30), rng.random() < 0.3)
+            for _ in range(rng.randrange(5))
+        ]
+        blocks.append((start, end, windows))
+        for _ in range(start, end):
+            time += rng.choice([0, 5, 5, 5, 90])
+            timestamps.append(time)
+        start = end
+
+    n = len(timestamps)
+    cases = []
+    for key_i in (0, 1):
+        for active_only in (True, False):
+            block_keys = BlockKeys(blocks, n, key_i, active_only)
+            for lo, hi in ((0, n), (0, 1), (n - 1, n), (123, 1234), (500, 500)):
+                for resolution, origin in ((HOUR, 0), (100, 17)):
+                    args = (timestamps, n, block_keys, lo, hi, resolution, origin)
+                    cases.append((args, aggregate_durations(*args)))
+
+    monkeypatch.setattr(aggregation_module, "np", None)
+    for args, durations in cases:
+        assert aggregate_durations(*args) == durations
+
+
+def test_rollups():
+    durations = {
+        0: {0: 10, HOUR: 20, DAY + 5 * HOUR: 30, 9 * DAY: 40},
+        1: {2 * HOUR: 5},
+    }
+    rollups = Rollups.from_durations(durations, 60)
+
+    assert [level.resolution for level in rollups.levels] == [HOUR, DAY, WEEK]
+    assert rollups.levels[0].get_durations() == durations
+    assert rollups.levels[1].get_durations() == {
+        0: {0: 30, DAY: 30, 9 * DAY: 40},
+        1: {0: 5},
+    }
+    assert rollups.levels[2].get_durations() == {
+        0: {-3 * DAY: 60, 4 * DAY: 40},
+        1: {-3 * DAY: 5},
+    }
+
+    aggregated = []
+
+    def aggregate(start: int, end: int) -> dict[int, int]:
+        aggregated.append((start, end))
+        return {2: end - start}
+
+    assert rollups.get_totals(-DAY, 12 * DAY, aggregate) == {0: 100, 1: 5}
+    assert aggregated == []
+
+    assert rollups.get_totals(1800, DAY + 6 * HOUR + 1, aggregate) == {
+        0: 20 + 30,
+        1: 5,
+        2: 1800 + 1,
+    }
+    assert aggregated == [(1800, HOUR), (DAY + 6 * HOUR, DAY + 6 * HOUR + 1)]
+
+    serialized = rollups.serialize()
+    assert json.loads(json.dumps(serialized)) == serialized
+    assert Rollups.from_serialized(serialized).serialize() == serialized
+
+    remapped = rollups.remapped([1, 0])
+    assert remapped.max_duration == 60
+    assert remapped.levels[1].get_durations() == {
+        1: {0: 30, DAY: 30, 9 * DAY: 40},
+        0: {0: 5},
+    }
+    assert Rollups.from_serialized(serialized, [None, 3]).levels[0].get_durations() == {
+        3: {2 * HOUR: 5}
+    }
@@ -0,0 +1,194 @@
+from __future__ import annotations
+import json
+from typing import IO, TYPE_CHECKING, Any, Iterator, Optional
+
+if TYPE_CHECKING:
+    from .consolidator import _ColsDictionaryData, _ColsEntryData
+
+_WHITESPACE = " \t\n\r"
+
+
+class ColfReader:
+    """Incrementally reads serialized consolidated owl logs (COLF)
+    from a text stream.
+
+    Everything before the entries (the version and the dictionaries)
+    is read by :meth:`read_header`. The entries are then decoded one
+    at a time by :meth:`iter_entries`, so only a single entry and a small
+    read buffer are held in memory, regardless of the file size.
+
+    Examples
+    --------
+    >>> with open("january.colf.json", "r", encoding="utf-8") as f:
+    ...     reader = ColfReader(f)
+    ...     header = reader.read_header()
+    ...     consolidator.append_serialized_entries(
+    ...         header["dictionaries"], reader.iter_entries(), header["version"]
+    ...     )
+    """
+
+    _f: IO[str]
+    _chunk_size: int
+    _decoder: json.JSONDecoder
+
+    _buf = ""
+    _pos = 0
+    _eof = False
+
+    _header: Optional[dict[str, Any]] = None
+    _buffered_entries: Optional[list[_ColsEntryData]] = None
+    """Entries that had to be read before the dictionaries."""
+
+    def __init__(self, f: IO[str], chunk_size: int = 1 << 16):
+        """
+        Parameters
+        ----------
+        f : IO[str]
+            Text stream to read from.
+        chunk_size : int, optional
+            Minimum number of characters read at once, by default 65536
+        """
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+
+    def read_header(self) -> dict[str, Any]:
+        """Read the document up to its entries.
+
+        If the entries come before the dictionaries in the document,
+        they are read into memory to reach the dictionaries.
+
+        Returns
+        -------
+        dict[str, Any]
+            Every top-level property of the document except the entries,
+            e.g. "version" and "dictionaries".
+
+        Raises
+        ------
+        json.JSONDecodeError
+            If the document is not valid JSON.
+        """
+        if self._header is not None:
+            return self._header
+
+        self._header = {}
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            self._buffered_entries = []
+            return self._header
+
+        while True:
+            key = self._decode_value()
+            self._expect(":")
+
+            if key == "entries":
+                if "dictionaries" in self._header:
+                    return self._header
+                self._buffered_entries = list(self._iter_array())
+            else:
+                self._header[key] = self._decode_value()
+
+            if not self._next_item("}"):
+                if self._buffered_entries is None:
+                    self._buffered_entries = []
+                return self._header
+
+    @property
+    def dictionaries(self) -> list[_ColsDictionaryData]:
+        """Dictionaries of the document."""
+        return self.read_header()["dictionaries"]
+
+    def iter_entries(self) -> Iterator[_ColsEntryData]:
+        """Iterate over the entries of the document.
+        The entries can only be iterated once.
+
+        Raises
+        ------
+        json.JSONDecodeError
+            If the document is not valid JSON.
+        """
+        self.read_header()
+
+        if self._buffered_entries is not None:
+            entries, self._buffered_entries = self._buffered_entries, []
+            yield from entries
+            return
+
+        self._buffered_entries = []
+        yield from self._iter_array()
+        while self._next_item("}"):
+            key = self._decode_value()
+            self._expect(":")
+            self._header[key] = self._decode_value()  # type: ignore
+
+    def _iter_array(self) -> Iterator[Any]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self._decode_value()
+            if not self._next_item("]"):
+                return
+
+    def _next_item(self, closing: str) -> bool:
+        """Consume the separator after an item of an array or object.
+        Returns False if `closing` was consumed instead."""
+        char = self._peek()
+        self._pos += 1
+        if char == ",":
+            return True
+        if char == closing:
+            return False
+        self._raise(f"Expecting ',' delimiter or '{closing}'")
+        return False
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            self._raise(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _peek(self) -> str:
+        """Get the next non-whitespace character, or an empty string
+        at the end of the stream."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf) or not self._fill():
+                return self._buf[self._pos : self._pos + 1]
+
+    def _decode_value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A number can be cut short by the end of the buffer.
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+
+            self._fill(len(self._buf) - self._pos)
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Read more characters into the buffer.
+        Returns False at the end of the stream."""
+        if self._eof:
+            return False
+
+        chunk = self._f.read(max(self._chunk_size, min_size))
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _raise(self, msg: str):
+        raise json.JSONDecodeError(msg, self._buf, self._pos)
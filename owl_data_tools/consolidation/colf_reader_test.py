@@ -0,0 +1,75 @@
+import io
+import json
+
+import pytest
+
+from .colf_reader import ColfReader
+from .consolidator import Consolidator
+from .consolidator_test_objects import SERIALIZATION_TEST_OBJECTS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_read(chunk_size: int):
+    for test_obj in SERIALIZATION_TEST_OBJECTS:
+        serialized = test_obj["after"]
+
+        reader = ColfReader(io.StringIO(json.dumps(serialized, indent=2)), chunk_size)
+        header = reader.read_header()
+
+        assert header == {
+            "version": serialized["version"],
+            "dictionaries": serialized["dictionaries"],
+        }
+        assert reader.dictionaries == serialized["dictionaries"]
+        assert list(reader.iter_entries()) == serialized["entries"]
+        assert list(reader.iter_entries()) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1 << 16])
+def test_unusual_documents(chunk_size: int):
+    def read(doc: str) -> tuple[dict, list]:
+        reader = ColfReader(io.StringIO(doc), chunk_size)
+        return reader.read_header(), list(reader.iter_entries())
+
+    assert read("{}") == ({}, [])
+    assert read(' { "entries" : [ ] } ') == ({}, [])
+    assert read('{"entries": [{"time": 1}], "dictionaries": [], "n": 12345}') == (
+        {"dictionaries": [], "n": 12345},
+        [{"time": 1}],
+    )
+    assert read('{"dictionaries": [], "entries": [{"time": 1}, {"time": 2}]}') == (
+        {"dictionaries": []},
+        [{"time": 1}, {"time": 2}],
+    )
+
+
+@pytest.mark.parametrize(
+    "doc",
+    [
+        "{invalid json",
+        "",
+        '{"dictionaries": [] "entries": []}',
+        '{"dictionaries": [], "entries": [{"time": 1}',
+        '{"dictionaries": [], "entries": [{"time": 1} {"time": 2}]}',
+    ],
+)
+def test_invalid(doc: str):
+    reader = ColfReader(io.StringIO(doc), 4)
+    with pytest.raises(json.JSONDecodeError):
+        reader.read_header()
+        list(reader.iter_entries())
+
+
+def test_append_serialized_entries():
+    consolidator_reference = Consolidator()
+    consolidator = Consolidator()
+
+    for test_obj in SERIALIZATION_TEST_OBJECTS:
+        consolidator_reference.append_from_serialized(test_obj["after"])
+
+        reader = ColfReader(io.StringIO(json.dumps(test_obj["after"])))
+        consolidator.append_serialized_entries(
+            reader.dictionaries, reader.iter_entries()
+        )
+
+    assert consolidator.serialize() == consolidator_reference.serialize()
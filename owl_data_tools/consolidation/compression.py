@@ -0,0 +1,271 @@
+"""Transparent access to files compressed with gzip, bzip2 or xz,
+chosen by the '.gz', '.bz2' or '.xz' suffix of the file path.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+from pathlib import Path
+from typing import IO, Any, Callable, Optional, Union
+
+COMPRESSION_OPENERS: dict[str, Callable[..., Any]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+"""Functions used to open compressed files, keyed by file suffix."""
+
+PREFETCH_CHUNK_SIZE = 1 << 18
+"""Size of the chunks decompressed ahead of the reads, 256 KiB."""
+
+
+def is_compressed(path: Path) -> bool:
+    """Check if `path` has a compression suffix."""
+    return path.suffix in COMPRESSION_OPENERS
+
+
+def strip_compression_suffix(path: Path) -> Path:
+    """Remove the compression suffix of `path`, if any.
+
+    Examples
+    --------
+    >>> strip_compression_suffix(Path("20230912.json.log.gz"))
+    PosixPath('20230912.json.log')
+    """
+    if is_compressed(path):
+        return path.with_suffix("")
+    return path
+
+
+def open_binary(path: Path, offset: int = 0) -> IO[bytes]:
+    """Open a possibly compressed file for reading bytes.
+
+    Compressed files are decompressed in a background thread,
+    ahead of the reads, so that decompression overlaps with
+    whatever the caller does with the data. The data read ahead
+    by all the open files is bounded, see :class:`_ReadAheadBudget`.
+
+    Parameters
+    ----------
+    path : Path
+        File path.
+    offset : int, optional
+        Offset in the decompressed data to start reading from,
+        by default 0
+
+    Returns
+    -------
+    IO[bytes]
+    """
+    if not is_compressed(path):
+        f = open(path, "rb")
+        f.seek(offset)
+        return f
+
+    f = COMPRESSION_OPENERS[path.suffix](path, "rb")
+    if offset:
+        f.seek(offset)
+    return io.BufferedReader(_PrefetchReader(f))
+
+
+def open_text(path: Path, mode: str = "r") -> IO[str]:
+    """Open a possibly compressed file as UTF-8 text.
+
+    Parameters
+    ----------
+    path : Path
+        File path.
+    mode : str, optional
+        "r" to read or "w" to write, by default "r"
+
+    Returns
+    -------
+    IO[str]
+    """
+    if mode == "r":
+        return io.TextIOWrapper(open_binary(path), encoding="utf-8")
+
+    if is_compressed(path):
+        return COMPRESSION_OPENERS[path.suffix](path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class _ReadAheadBudget:
+    """Number of bytes that all the :class:`_PrefetchReader`
+    may read ahead of their consumers, together.
+
+    Every reader may always hold one chunk, so that a consumer
+    waiting for the next chunk of a reader never waits for
+    the other readers. Only the chunks beyond the first one
+    of every reader are taken from the budget. Merging many
+    compressed files thus holds one chunk per file,
+    plus the shared budget.
+    """
+
+    size: int
+    used: int
+    condition: threading.Condition
+    """Notified when bytes are given back to the budget,
+    or a reader has no chunk left."""
+
+    def __init__(self, size: int):
+        """
+        Parameters
+        ----------
+        size : int
+            Number of bytes of the budget.
+        """
+        self.size = size
+        self.used = 0
+        self.condition = threading.Condition()
+
+
+READ_AHEAD_BUDGET = _ReadAheadBudget(1 << 23)
+"""Budget shared by all the compressed files, 8 MiB."""
+
+
+class _PrefetchReader(io.RawIOBase):
+    """Raw stream that reads chunks of another stream
+    in a background thread, ahead of its consumer.
+
+    The standard decompressors release the GIL while decompressing,
+    so the decompression runs in parallel with the consumer.
+    """
+
+    _f: IO[bytes]
+    _chunk_size: int
+    _budget: _ReadAheadBudget
+    _queue: "queue.Queue[tuple[Union[bytes, BaseException], bool]]"
+    """Chunks read ahead, and whether they are taken from the budget."""
+    _n_chunks: int
+    """Number of chunks read and not entirely consumed yet,
+    guarded by the condition of the budget."""
+    _stop: threading.Event
+    _thread: threading.Thread
+
+    _chunk = memoryview(b"")
+    _chunk_i = 0
+    _chunk_budgeted: Optional[bool] = None
+    """Whether the chunk being consumed is taken from the budget,
+    None if there is no such chunk."""
+    _eof = False
+
+    def __init__(
+        self,
+        f: IO[bytes],
+        chunk_size: int = PREFETCH_CHUNK_SIZE,
+        budget: _ReadAheadBudget = READ_AHEAD_BUDGET,
+    ):
+        """
+        Parameters
+        ----------
+        f : IO[bytes]
+            Stream to read from. It is closed along with the reader.
+        chunk_size : int, optional
+            Size of every read from `f`, by default :data:`PREFETCH_CHUNK_SIZE`
+        budget : _ReadAheadBudget, optional
+            Budget of the chunks read ahead, by default shared
+            by all the readers.
+        """
+        self._f = f
+        self._chunk_size = chunk_size
+        self._budget = budget
+        self._queue = queue.Queue()
+        self._n_chunks = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._prefetch, daemon=True)
+        self._thread.start()
+
+    def _prefetch(self):
+        while True:
+            budgeted = self._reserve()
+            if budgeted is None:
+                return
+            try:
+                chunk = self._f.read(self._chunk_size)
+            except BaseException as e:
+                self._queue.put((e, budgeted))
+                return
+            self._queue.put((chunk, budgeted))
+            if not chunk:
+                return
+
+    def _reserve(self) -> Optional[bool]:
+        """Wait until another chunk can be read.
+
+        Returns
+        -------
+        Optional[bool]
+            Whether the chunk is taken from the budget,
+            or None if the reader is closed.
+        """
+        budget = self._budget
+        with budget.condition:
+            while not self._stop.is_set():
+                if self._n_chunks == 0:
+                    self._n_chunks = 1
+                    return False
+                if budget.used + self._chunk_size <= budget.size:
+                    budget.used += self._chunk_size
+                    self._n_chunks += 1
+                    return True
+                budget.condition.wait(0.1)
+        return None
+
+    def _release(self, budgeted: bool):
+        """Give back a chunk that has been consumed."""
+        budget = self._budget
+        with budget.condition:
+            self._n_chunks -= 1
+            if budgeted:
+                budget.used -= self._chunk_size
+            budget.condition.notify_all()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._chunk_i >= len(self._chunk):
+            if self._eof:
+                return 0
+
+            if self._chunk_budgeted is not None:
+                self._release(self._chunk_budgeted)
+                self._chunk = memoryview(b"")
+                self._chunk_budgeted = None
+
+            item, budgeted = self._queue.get()
+            if isinstance(item, BaseException) or not item:
+                self._release(budgeted)
+                if isinstance(item, BaseException):
+                    raise item
+                self._eof = True
+                return 0
+
+            self._chunk = memoryview(item)
+            self._chunk_i = 0
+            self._chunk_budgeted = budgeted
+
+        n = min(len(buffer), len(self._chunk) - self._chunk_i)
+        buffer[:n] = self._chunk[self._chunk_i : self._chunk_i + n]
+        self._chunk_i += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            with self._budget.condition:
+                self._budget.condition.notify_all()
+            self._thread.join()
+            self._f.close()
+
+            # Give back the chunks read ahead that were never consumed.
+            if self._chunk_budgeted is not None:
+                self._release(self._chunk_budgeted)
+                self._chunk = memoryview(b"")
+            while not self._queue.empty():
+                self._release(self._queue.get()[1])
+        super().close()
@@ -0,0 +1,84 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from .compression import (
+    COMPRESSION_OPENERS,
+    _PrefetchReader,
+    _ReadAheadBudget,
+    open_binary,
+    open_text,
+    strip_compression_suffix,
+)
+
+
+def test_strip_compression_suffix():
+    assert strip_compression_suffix(Path("a.json.log.gz")) == Path("a.json.log")
+    assert strip_compression_suffix(Path("a.colf.json.xz")) == Path("a.colf.json")
+    assert strip_compression_suffix(Path("a.json.log")) == Path("a.json.log")
+
+
+@pytest.mark.parametrize("suffix", ["", *COMPRESSION_OPENERS])
+def test_roundtrip(tmp_path: Path, suffix: str):
+    path = tmp_path / f"file.txt{suffix}"
+    lines = [f"line {i} ✓\n" for i in range(10000)]
+
+    with open_text(path, "w") as f:
+        f.writelines(lines)
+
+    with open_text(path) as f:
+        assert f.readlines() == lines
+
+    offset = len(lines[0].encode("utf-8"))
+    with open_binary(path, offset) as f:
+        assert f.readline().decode("utf-8") == lines[1]
+        assert len(list(f)) == len(lines) - 2
+
+
+def test_prefetch_reader_error():
+    class FailingStream:
+        def read(self, size):
+            raise OSError("failed")
+
+        def close(self):
+            pass
+
+    reader = _PrefetchReader(FailingStream(), chunk_size=4)  # type: ignore
+    with pytest.raises(OSError):
+        reader.read(4)
+    reader.close()
+
+
+def test_prefetch_reader_early_close(tmp_path: Path):
+    path = tmp_path / "file.txt.gz"
+    with open_text(path, "w") as f:
+        f.write("x" * 100000)
+
+    with open_binary(path) as f:
+        assert f.read(1) == b"x"
+
+
+def test_prefetch_reader_budget():
+    class Stream:
+        def read(self, size):
+            return b"x" * size
+
+        def close(self):
+            pass
+
+    budget = _ReadAheadBudget(16)
+    readers = [
+        io.BufferedReader(_PrefetchReader(Stream(), 4, budget))  # type: ignore
+        for _ in range(10)
+    ]
+    for reader in readers:
+        assert reader.read(5) == b"xxxxx"
+    # Every reader can always read ahead, beyond the shared budget.
+    for reader in readers:
+        assert reader.read(100) == b"x" * 100
+        assert budget.used <= budget.size
+
+    for reader in readers:
+        reader.close()
+    assert budget.used == 0
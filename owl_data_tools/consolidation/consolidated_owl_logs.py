@@ -1,36 +1,100 @@
+from __future__ import annotations
+
+from array import array
 from bisect import bisect_left, bisect_right
-from ..types import Entry, RangeView
+from itertools import chain
+from typing import Callable, Iterable, Iterator, Literal, Optional, Sequence
+
+from ..types import EntryBase, RangeView
+from .aggregation import (
+    DAY,
+    DEFAULT_MAX_DURATION,
+    ROLLUP_RESOLUTIONS,
+    BlockKeys,
+    Rollups,
+    aggregate_durations,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+WindowBlocks = Iterable[tuple[int, int, Sequence[tuple[int, int, bool]]]]
+"""Blocks of consecutive entries with the same windows: the index of
+the first entry, the index after the last entry, and the path index,
+title index, and if the user is active, of every window."""
 
 
 class ConsolidatedOwlLogs:
     """Readonly container for consolidated owl logs."""
 
-    _entries: list[Entry]
-    _paths: list[str]
-    _titles: list[str]
+    _entries: Sequence[EntryBase]
+    _paths: Sequence[str]
+    _titles: Sequence[str]
+    _timestamps: Sequence[int]
+    """Timestamp of every entry, searched instead of the entries.
+    It may be longer than :attr:`_entries`, the extra ones are ignored."""
+    _window_blocks: Callable[[], WindowBlocks]
+    _index: Optional[_InvertedIndex] = None
+    _path_is: Optional[dict[str, int]] = None
+    _title_is: Optional[dict[str, int]] = None
+    _title_search_index: Optional[_TitleSearchIndex] = None
+    _block_keys: Optional[dict[tuple[str, bool], BlockKeys]] = None
+    _rollups: Optional[Rollups]
 
-    def __init__(self, entries: list[Entry], paths: list[str], titles: list[str]):
+    def __init__(
+        self,
+        entries: Sequence[EntryBase],
+        paths: Sequence[str],
+        titles: Sequence[str],
+        timestamps: Optional[Sequence[int]] = None,
+        window_blocks: Optional[Callable[[], WindowBlocks]] = None,
+        rollups: Optional[Rollups] = None,
+    ):
         """
         Parameters
         ----------
-        entries : list[Entry]
-            List of owl entries
-        paths : list[str]
+        entries : Sequence[EntryBase]
+            List of owl entries, or a sequence creating
+            them when they are accessed.
+        paths : Sequence[str]
             List of window paths used.
-            Typically generated by :meth:`Dictionary.generate_values_list`
-        titles : list[str]
+            Typically :attr:`Dictionary.values`
+        titles : Sequence[str]
             List of window titles used.
-            Typically generated by :meth:`Dictionary.generate_values_list`
+            Typically :attr:`Dictionary.values`
+        timestamps : Optional[Sequence[int]], optional
+            Timestamp of every entry, by default None to collect
+            them from `entries`. It can be longer than `entries`,
+            e.g. the timestamps of a :class:`Consolidator`
+            that are still being appended to.
+        window_blocks : Optional[Callable[[], WindowBlocks]], optional
+            Function generating the :data:`WindowBlocks` of the entries,
+            used to build the index of :meth:`get_entries_with_path`
+            and :meth:`get_entries_with_title`. By default None
+            to generate them from `entries`.
+        rollups : Optional[Rollups], optional
+            Rollups of the foreground durations of the entries by path
+            index, used by :meth:`get_total_durations`. By default None
+            to compute them the first time they are needed.
         """
         self._entries = entries
         self._paths = paths
         self._titles = titles
+        if timestamps is None:
+            timestamps = array("q", [entry.timestamp for entry in entries])
+        self._timestamps = timestamps
+        if window_blocks is None:
+            window_blocks = self._iter_entry_window_blocks
+        self._window_blocks = window_blocks
+        self._rollups = rollups
 
     def get_size(self) -> int:
         """Get the number of entries stored."""
         return len(self._entries)
 
-    def get_entries_view(self, start_time: int, end_time: int) -> RangeView[Entry]:
+    def get_entries_view(self, start_time: int, end_time: int) -> RangeView[EntryBase]:
         """Get a list of entries between `start_time` (inclusive)
         and `end_time` (inclusive).
 
@@ -43,13 +107,400 @@ class ConsolidatedOwlLogs:
 
         Returns
         -------
-        RangeView[Entry]
+        RangeView[EntryBase]
             Readonly entries RangeView.
         """
-        start_i = bisect_left(self._entries, start_time, key=lambda x: x.timestamp)
-        end_i = bisect_right(self._entries, end_time, key=lambda x: x.timestamp) - 1
+        n = len(self._entries)
+        start_i = bisect_left(self._timestamps, start_time, 0, n)
+        end_i = bisect_right(self._timestamps, end_time, start_i, n)
+
+        return RangeView(start_i, end_i - start_i, self._entries)
+
+    def get_entries_views(
+        self, time_ranges: Sequence[tuple[int, int]]
+    ) -> list[RangeView[EntryBase]]:
+        """Get the lists of entries of multiple time ranges at once,
+        like :meth:`get_entries_view`. NumPy is used if it is available.
+
+        Parameters
+        ----------
+        time_ranges : Sequence[tuple[int, int]]
+            UNIX timestamps of the start time (inclusive)
+            and end time (inclusive) of every range.
+
+        Returns
+        -------
+        list[RangeView[EntryBase]]
+            Readonly entries RangeView of every range.
+        """
+        if np is None:
+            return [self.get_entries_view(start, end) for start, end in time_ranges]
+
+        n = len(self._entries)
+        # The array is not kept, so the timestamps can still be appended to.
+        timestamps = np.asarray(self._timestamps, dtype=np.int64)[:n]
+        bounds = np.array(time_ranges, dtype=np.int64).reshape(-1, 2)
+        start_is = np.searchsorted(timestamps, bounds[:, 0], "left").tolist()
+        end_is = np.searchsorted(timestamps, bounds[:, 1], "right").tolist()
+
+        return [
+            RangeView(start_i, max(end_i - start_i, 0), self._entries)
+            for start_i, end_i in zip(start_is, end_is)
+        ]
+
+    def get_entries_with_path(
+        self,
+        path: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        active_only=False,
+    ) -> list[RangeView[EntryBase]]:
+        """Get the entries with a window of the program at `path`,
+        optionally between `start_time` (inclusive) and `end_time` (inclusive).
+
+        An index of the entries of every path and title is built
+        the first time it is needed, after that the time taken
+        is proportional to the number of runs returned.
+
+        Parameters
+        ----------
+        path : str
+            Program path.
+        start_time : Optional[int], optional
+            UNIX timestamp of the start time, by default None
+            for the earliest entry.
+        end_time : Optional[int], optional
+            UNIX timestamp of the end time, by default None
+            for the latest entry.
+        active_only : bool, optional
+            Only get the entries where the user is active
+            in a window of the program, by default False.
+
+        Returns
+        -------
+        list[RangeView[EntryBase]]
+            Runs of consecutive entries, in chronological order.
+        """
+        if self._path_is is None:
+            self._path_is = {p: i for i, p in enumerate(self._paths)}
+        path_i = self._path_is.get(path)
+        index = self._get_index()
+        postings = index.active_paths if active_only else index.paths
+        return self._get_runs(
+            postings, [] if path_i is None else [path_i], start_time, end_time
+        )
+
+    def get_entries_with_title(
+        self,
+        title: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        active_only=False,
+    ) -> list[RangeView[EntryBase]]:
+        """Get the entries with a window titled `title`, optionally
+        between `start_time` (inclusive) and `end_time` (inclusive).
+        See :meth:`get_entries_with_path`.
+
+        Returns
+        -------
+        list[RangeView[EntryBase]]
+            Runs of consecutive entries, in chronological order.
+        """
+        if self._title_is is None:
+            self._title_is = {t: i for i, t in enumerate(self._titles)}
+        title_i = self._title_is.get(title)
+        index = self._get_index()
+        postings = index.active_titles if active_only else index.titles
+        return self._get_runs(
+            postings, [] if title_i is None else [title_i], start_time, end_time
+        )
+
+    def search_titles(self, text: str) -> list[str]:
+        """Get the titles containing `text`, ignoring case.
+
+        A trigram index of the titles is built the first time it is needed,
+        so only the titles sharing the rarest trigram of `text`
+        are compared.
+
+        Parameters
+        ----------
+        text : str
+            Searched text, e.g. a project name or part of an URL.
+
+        Returns
+        -------
+        list[str]
+            Matching titles, in the order of the title dictionary.
+        """
+        return [self._titles[i] for i in self._get_title_search_index().search(text)]
 
-        return RangeView(start_i, end_i - start_i + 1, self._entries)
+    def get_entries_with_title_containing(
+        self,
+        text: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        active_only=False,
+    ) -> list[RangeView[EntryBase]]:
+        """Get the entries with a window whose title contains `text`,
+        ignoring case, optionally between `start_time` (inclusive)
+        and `end_time` (inclusive). See :meth:`search_titles`
+        and :meth:`get_entries_with_path`.
+
+        Returns
+        -------
+        list[RangeView[EntryBase]]
+            Runs of consecutive entries, in chronological order.
+        """
+        title_is = self._get_title_search_index().search(text)
+        index = self._get_index()
+        postings = index.active_titles if active_only else index.titles
+        return self._get_runs(postings, title_is, start_time, end_time)
+
+    def get_durations(
+        self,
+        by: Literal["path", "title"] = "path",
+        resolution: int = DAY,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        active_only=True,
+        origin: int = 0,
+        max_duration: int = DEFAULT_MAX_DURATION,
+    ) -> dict[str, dict[int, int]]:
+        """Get the time spent in the windows of every path or title,
+        by time bucket, optionally between `start_time` (inclusive)
+        and `end_time` (inclusive).
+
+        The duration of an entry is the time until the next entry,
+        capped to `max_duration`. The paths or titles of every block
+        of entries with the same windows are collected once, then
+        the durations are summed by path or title index and bucket
+        in a single pass, vectorized with NumPy if it is available.
+        The indexes are decoded at the end.
+
+        Parameters
+        ----------
+        by : Literal["path", "title"], optional
+            Sum the durations by window path or by window title,
+            by default "path".
+        resolution : int, optional
+            Duration of a bucket in seconds, by default
+            :data:`~.aggregation.DAY`. See :mod:`.aggregation`
+            for the :data:`~.aggregation.HOUR` and
+            :data:`~.aggregation.WEEK` constants.
+        start_time : Optional[int], optional
+            UNIX timestamp of the start time, by default None
+            for the earliest entry.
+        end_time : Optional[int], optional
+            UNIX timestamp of the end time, by default None
+            for the latest entry.
+        active_only : bool, optional
+            Only count the windows where the user is active
+            (in the foreground), by default True.
+        origin : int, optional
+            UNIX timestamp of the start of a bucket, by default 0.
+            E.g. :data:`~.aggregation.MONDAY` for weeks starting on Monday,
+            or the negated UTC offset of a time zone for its days.
+        max_duration : int, optional
+            Maximum duration of an entry in seconds, by default
+            :data:`~.aggregation.DEFAULT_MAX_DURATION`.
+
+        Returns
+        -------
+        dict[str, dict[int, int]]
+            Durations in seconds by path or title,
+            then by UNIX timestamp of the bucket start.
+
+        Raises
+        ------
+        ValueError
+            If `by` is neither "path" nor "title".
+        """
+        if by not in ("path", "title"):
+            raise ValueError(f'`by` must be "path" or "title".\nby={by!r}')
+
+        lo, hi = self._get_bounds(start_time, end_time)
+        durations = aggregate_durations(
+            self._timestamps,
+            len(self._entries),
+            self._get_block_keys(by, active_only),
+            lo,
+            hi,
+            resolution,
+            origin,
+            max_duration,
+        )
+        values = self._paths if by == "path" else self._titles
+        return {values[key]: buckets for key, buckets in durations.items()}
+
+    def get_rollups(self) -> Rollups:
+        """Get the rollups of the foreground durations by path index
+        at the :data:`~.aggregation.ROLLUP_RESOLUTIONS`, computed
+        the first time they are needed unless they were given."""
+        if self._rollups is None:
+            durations = aggregate_durations(
+                self._timestamps,
+                len(self._entries),
+                self._get_block_keys("path", True),
+                0,
+                len(self._entries),
+                *ROLLUP_RESOLUTIONS[0],
+                DEFAULT_MAX_DURATION,
+            )
+            self._rollups = Rollups.from_durations(durations, DEFAULT_MAX_DURATION)
+        return self._rollups
+
+    def get_total_durations(
+        self, start_time: Optional[int] = None, end_time: Optional[int] = None
+    ) -> dict[str, int]:
+        """Get the time spent in the foreground windows of every path,
+        optionally between `start_time` (inclusive) and `end_time` (inclusive).
+
+        The result is the same as summing the buckets of
+        :meth:`get_durations`, but the whole hours, days and weeks of
+        the time range are taken from :meth:`get_rollups`, so only the
+        entries at its edges are aggregated. The time taken is
+        proportional to the number of paths and the logarithm of the number
+        of entries, rather than to the number of entries in the range.
+
+        Parameters
+        ----------
+        start_time : Optional[int], optional
+            UNIX timestamp of the start time, by default None
+            for the earliest entry.
+        end_time : Optional[int], optional
+            UNIX timestamp of the end time, by default None
+            for the latest entry.
+
+        Returns
+        -------
+        dict[str, int]
+            Durations in seconds by path.
+        """
+        lo, hi = self._get_bounds(start_time, end_time)
+        if lo >= hi:
+            return {}
+
+        rollups = self.get_rollups()
+        block_keys = self._get_block_keys("path", True)
+        n = len(self._entries)
+
+        def aggregate(start: int, end: int) -> dict[int, int]:
+            lo = bisect_left(self._timestamps, start, 0, n)
+            hi = bisect_left(self._timestamps, end, lo, n)
+            durations = aggregate_durations(
+                self._timestamps,
+                n,
+                block_keys,
+                lo,
+                hi,
+                end - start,
+                start,
+                rollups.max_duration,
+            )
+            return {key: buckets[start] for key, buckets in durations.items()}
+
+        totals = rollups.get_totals(
+            self._timestamps[lo], self._timestamps[hi - 1] + 1, aggregate
+        )
+        return {self._paths[key]: total for key, total in totals.items()}
+
+    def _get_block_keys(self, by: str, active_only: bool) -> BlockKeys:
+        if self._block_keys is None:
+            self._block_keys = {}
+        block_keys = self._block_keys.get((by, active_only))
+        if block_keys is None:
+            block_keys = BlockKeys(
+                self._window_blocks(),
+                len(self._entries),
+                0 if by == "path" else 1,
+                active_only,
+            )
+            self._block_keys[by, active_only] = block_keys
+        return block_keys
+
+    def _get_title_search_index(self) -> _TitleSearchIndex:
+        if self._title_search_index is None:
+            self._title_search_index = _TitleSearchIndex(self._titles)
+        return self._title_search_index
+
+    def _get_index(self) -> _InvertedIndex:
+        if self._index is None:
+            self._index = _InvertedIndex(self._window_blocks())
+        return self._index
+
+    def _get_runs(
+        self,
+        postings: dict[int, _Postings],
+        keys: Iterable[int],
+        start_time: Optional[int],
+        end_time: Optional[int],
+    ) -> list[RangeView[EntryBase]]:
+        """Get the runs of entries of any of `keys` in `postings`,
+        between `start_time` and `end_time`, merged and in order."""
+        lo, hi = self._get_bounds(start_time, end_time)
+
+        keys_postings = [postings[key] for key in keys if key in postings]
+        if len(keys_postings) == 1:
+            runs: Iterable[tuple[int, int]] = keys_postings[0].iter_runs(lo, hi)
+        else:
+            # Sorting is faster than merging the runs of many titles.
+            runs = sorted(
+                chain.from_iterable(p.iter_runs(lo, hi) for p in keys_postings)
+            )
+        views: list[RangeView[EntryBase]] = []
+        run_start = run_end = -1
+        for start, end in runs:
+            if start > run_end:
+                if run_end > run_start:
+                    views.append(
+                        RangeView(run_start, run_end - run_start, self._entries)
+                    )
+                run_start = start
+            run_end = max(run_end, end)
+        if run_end > run_start:
+            views.append(RangeView(run_start, run_end - run_start, self._entries))
+        return views
+
+    def _get_bounds(
+        self, start_time: Optional[int], end_time: Optional[int]
+    ) -> tuple[int, int]:
+        """Get the index of the first entry from `start_time`,
+        and the index after the last entry until `end_time`."""
+        n = len(self._entries)
+        lo = (
+            0 if start_time is None else bisect_left(self._timestamps, start_time, 0, n)
+        )
+        hi = n if end_time is None else bisect_right(self._timestamps, end_time, lo, n)
+        return lo, hi
+
+    def _iter_entry_window_blocks(self) -> Iterator[tuple[int, int, list]]:
+        """Generate the :data:`WindowBlocks` of the entries, from their
+        windows. Consecutive entries sharing the same windows view object
+        are in the same block."""
+        path_is = {p: i for i, p in enumerate(self._paths)}
+        title_is = {t: i for i, t in enumerate(self._titles)}
+
+        block_start = 0
+        previous_view = None
+        windows: list[tuple[int, int, bool]] = []
+        for i, entry in enumerate(self._entries):
+            view = entry.windows_view
+            if view is previous_view:
+                continue
+            if i:
+                yield block_start, i, windows
+
+            windows = []
+            for w in view:
+                path_i = path_is.get(w.path)
+                title_i = title_is.get(w.title)
+                if path_i is not None and title_i is not None:
+                    windows.append((path_i, title_i, bool(w.is_active)))
+            block_start = i
+            previous_view = view
+
+        if len(self._entries):
+            yield block_start, len(self._entries), windows
 
     def get_time_range(self) -> tuple[int, int]:
         """Get the time range of the entries.
@@ -62,3 +513,109 @@ class ConsolidatedOwlLogs:
         earliest = self._entries[0].timestamp
         latest = self._entries[-1].timestamp
         return (earliest, latest)
+
+
+class _Postings:
+    """Runs of consecutive entries that contain a path or a title."""
+
+    __slots__ = ("starts", "ends")
+
+    starts: array[int]
+    """Index of the first entry of every run."""
+    ends: array[int]
+    """Index after the last entry of every run."""
+
+    def __init__(self):
+        self.starts = array("q")
+        self.ends = array("q")
+
+    def add(self, start: int, end: int):
+        """Add the entries from `start` to `end`, which must not be
+        before the entries already added."""
+        ends = self.ends
+        if ends and ends[-1] >= start:
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            self.starts.append(start)
+            ends.append(end)
+
+    def iter_runs(self, lo: int, hi: int) -> Iterator[tuple[int, int]]:
+        """Generate the runs clipped to the entries from `lo` to `hi`."""
+        starts = self.starts
+        ends = self.ends
+        for j in range(bisect_right(ends, lo), len(starts)):
+            start = starts[j]
+            if start >= hi:
+                return
+            yield max(start, lo), min(ends[j], hi)
+
+
+class _InvertedIndex:
+    """Postings of the entries of every path and title index,
+    and of the ones where the user is active in the window."""
+
+    __slots__ = ("paths", "titles", "active_paths", "active_titles")
+
+    paths: dict[int, _Postings]
+    titles: dict[int, _Postings]
+    active_paths: dict[int, _Postings]
+    active_titles: dict[int, _Postings]
+
+    def __init__(self, window_blocks: WindowBlocks):
+        self.paths = {}
+        self.titles = {}
+        self.active_paths = {}
+        self.active_titles = {}
+
+        for start, end, windows in window_blocks:
+            for path_i, title_i, is_active in windows:
+                self._add(self.paths, path_i, start, end)
+                self._add(self.titles, title_i, start, end)
+                if is_active:
+                    self._add(self.active_paths, path_i, start, end)
+                    self._add(self.active_titles, title_i, start, end)
+
+    @staticmethod
+    def _add(postings: dict[int, _Postings], key: int, start: int, end: int):
+        key_postings = postings.get(key)
+        if key_postings is None:
+            key_postings = postings[key] = _Postings()
+        key_postings.add(start, end)
+
+
+class _TitleSearchIndex:
+    """Trigram index of the titles of the title dictionary, for substring
+    searches ignoring case."""
+
+    __slots__ = ("titles", "trigrams")
+
+    titles: list[str]
+    """Casefolded titles."""
+    trigrams: dict[str, array[int]]
+    """Sorted indexes of the titles containing every trigram."""
+
+    def __init__(self, titles: Iterable[str]):
+        self.titles = [title.casefold() for title in titles]
+        self.trigrams = {}
+
+        trigrams = self.trigrams
+        for i, title in enumerate(self.titles):
+            for trigram in {title[j : j + 3] for j in range(len(title) - 2)}:
+                title_is = trigrams.get(trigram)
+                if title_is is None:
+                    title_is = trigrams[trigram] = array("I")
+                title_is.append(i)
+
+    def search(self, text: str) -> list[int]:
+        """Get the indexes of the titles containing `text`, ignoring case."""
+        text = text.casefold()
+        titles = self.titles
+        if len(text) < 3:
+            return [i for i, title in enumerate(titles) if text in title]
+
+        trigram_title_is = [
+            self.trigrams.get(text[j : j + 3], ()) for j in range(len(text) - 2)
+        ]
+        candidates = min(trigram_title_is, key=len)
+        return [i for i in candidates if text in titles[i]]
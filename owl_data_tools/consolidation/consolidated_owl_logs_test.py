@@ -1,7 +1,13 @@
+import random
+
 import pytest
 
 from .test_utils import PATHS, TITLES, compare_entry, window_mock
+from . import consolidated_owl_logs as consolidated_owl_logs_module
 from .consolidated_owl_logs import ConsolidatedOwlLogs
+from . import aggregation as aggregation_module
+from . import consolidator as consolidator_module
+from .consolidator import Consolidator
 from ..types import Entry
 
 
@@ -88,3 +94,245 @@ def test_3_empty():
 
     with pytest.raises(IndexError):
         col.get_time_range()
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_get_entries_views(monkeypatch, use_numpy: bool):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(consolidated_owl_logs_module, "np", None)
+
+    timestamps = [10010, 10020, 10030, 10031, 10032, 10040]
+    col = ConsolidatedOwlLogs([Entry(t) for t in timestamps], PATHS, TITLES)
+    time_ranges = [
+        (10008, 10009),
+        (10010, 10010),
+        (10031, 10040),
+        (10031, 99999),
+        (10041, 10099),
+        (10040, 10010),
+        (0, 99999),
+    ]
+
+    views = col.get_entries_views(time_ranges)
+    assert [len(view) for view in views] == [0, 1, 3, 3, 0, 0, 6]
+    for view, (start, end) in zip(views, time_ranges):
+        view_reference = col.get_entries_view(start, end)
+        assert len(view) == len(view_reference)
+        for i in range(len(view)):
+            assert view[i] is view_reference[i]
+
+    assert len(ConsolidatedOwlLogs([], [], []).get_entries_views([(0, 1)])[0]) == 0
+
+
+def test_timestamps_from_consolidator():
+    consolidator = Consolidator()
+    consolidator.append_entries([{"timestamp": 10}, {"timestamp": 20}])  # type: ignore
+    col = consolidator.generate_col()
+    consolidator.append_entry({"timestamp": 30})  # type: ignore
+
+    # Entries appended after generate_col are not part of it.
+    assert len(col.get_entries_view(0, 99)) == 2
+    assert [len(view) for view in col.get_entries_views([(0, 99), (20, 30)])] == [2, 1]
+
+
+def create_indexed_entries() -> list[Entry]:
+    windows_a = [window_mock(0, True), window_mock(1)]
+    windows_b = [window_mock(1, True), window_mock(2)]
+    return [
+        Entry(10, windows_a),
+        Entry(20, windows_a),
+        Entry(30, [], 70),
+        Entry(40, windows_b),
+        Entry(50, list(windows_b)),
+        Entry(60, windows_a),
+        Entry(70, [window_mock(3)]),
+    ]
+
+
+def run_timestamps(col: ConsolidatedOwlLogs, runs) -> list[list[int]]:
+    return [[entry.timestamp for entry in run] for run in runs]
+
+
+def check_index(col: ConsolidatedOwlLogs):
+    assert run_timestamps(col, col.get_entries_with_path(PATHS[0])) == [
+        [10, 20],
+        [60],
+    ]
+    assert run_timestamps(col, col.get_entries_with_path(PATHS[1])) == [
+        [10, 20],
+        [40, 50, 60],
+    ]
+    assert run_timestamps(
+        col, col.get_entries_with_path(PATHS[1], active_only=True)
+    ) == [[40, 50]]
+    assert run_timestamps(col, col.get_entries_with_path(PATHS[1], 15, 45)) == [
+        [20],
+        [40],
+    ]
+    assert run_timestamps(col, col.get_entries_with_path(PATHS[0], end_time=19)) == [
+        [10]
+    ]
+    assert run_timestamps(col, col.get_entries_with_path(PATHS[0], 21, 59)) == []
+    assert col.get_entries_with_path("/unknown.exe") == []
+
+    assert run_timestamps(col, col.get_entries_with_title(TITLES[2])) == [[40, 50]]
+    assert run_timestamps(
+        col, col.get_entries_with_title(TITLES[0], active_only=True)
+    ) == [[10, 20], [60]]
+    assert run_timestamps(col, col.get_entries_with_title(TITLES[3])) == [[70]]
+    assert col.get_entries_with_title(TITLES[2], active_only=True) == []
+
+
+def test_index_from_entries():
+    check_index(ConsolidatedOwlLogs(create_indexed_entries(), PATHS, TITLES))
+    assert ConsolidatedOwlLogs([], [], []).get_entries_with_path(PATHS[0]) == []
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_index_from_consolidator(monkeypatch, use_numpy: bool):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(consolidator_module, "np", None)
+
+    consolidator = Consolidator()
+    for entry in create_indexed_entries():
+        consolidator.append_entry(
+            {  # type: ignore
+                "timestamp": entry.timestamp,
+                "windows": [
+                    {"path": w.path, "title": w.title, "isActive": w.is_active}
+                    for w in entry.windows_view
+                ],
+            }
+        )
+    col = consolidator.generate_col()
+    consolidator.append_entry({"timestamp": 80, "windows": []})  # type: ignore
+    consolidator.append_entry({"timestamp": 90})  # type: ignore
+
+    check_index(col)
+    assert Consolidator().generate_col().get_entries_with_title(TITLES[0]) == []
+
+
+def test_search_titles():
+    col = ConsolidatedOwlLogs(create_indexed_entries(), PATHS, TITLES)
+
+    assert col.search_titles("o") == ["Zero", "One", "Two"]
+    assert col.search_titles("THR") == ["Three"]
+    assert col.search_titles("ree") == ["Three"]
+    assert col.search_titles("eros") == []
+    assert col.search_titles("") == TITLES
+
+    assert run_timestamps(col, col.get_entries_with_title_containing("TW")) == [
+        [40, 50]
+    ]
+    assert run_timestamps(col, col.get_entries_with_title_containing("ro")) == [
+        [10, 20],
+        [60],
+    ]
+    assert run_timestamps(col, col.get_entries_with_title_containing("e")) == [
+        [10, 20],
+        [40, 50, 60, 70],
+    ]
+    assert run_timestamps(
+        col, col.get_entries_with_title_containing("e", 45, active_only=True)
+    ) == [[50, 60]]
+    assert col.get_entries_with_title_containing("xyz") == []
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_get_durations(monkeypatch, use_numpy: bool):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(aggregation_module, "np", None)
+
+    col = ConsolidatedOwlLogs(create_indexed_entries(), PATHS, TITLES)
+
+    assert col.get_durations(resolution=25) == {
+        PATHS[0]: {0: 20, 50: 10},
+        PATHS[1]: {25: 10, 50: 10},
+    }
+    assert col.get_durations("title", resolution=25, active_only=False) == {
+        TITLES[0]: {0: 20, 50: 10},
+        TITLES[1]: {0: 20, 25: 10, 50: 20},
+        TITLES[2]: {25: 10, 50: 10},
+    }
+    assert col.get_durations(resolution=1000, origin=15, max_duration=4) == {
+        PATHS[0]: {-985: 4, 15: 8},
+        PATHS[1]: {15: 8},
+    }
+    assert col.get_durations(start_time=20, end_time=50) == {
+        PATHS[0]: {0: 10},
+        PATHS[1]: {0: 20},
+    }
+    assert col.get_durations(start_time=70) == {}
+    assert col.get_durations(start_time=80) == {}
+
+    with pytest.raises(ValueError):
+        col.get_durations("window")  # type: ignore
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_get_durations_from_consolidator(monkeypatch, use_numpy: bool):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(aggregation_module, "np", None)
+        monkeypatch.setattr(consolidator_module, "np", None)
+
+    consolidator = Consolidator()
+    for entry in create_indexed_entries():
+        consolidator.append_entry(
+            {  # type: ignore
+                "timestamp": entry.timestamp,
+                "windows": [
+                    {"path": w.path, "title": w.title, "isActive": w.is_active}
+                    for w in entry.windows_view
+                ],
+            }
+        )
+    col = consolidator.generate_col()
+    consolidator.append_entry({"timestamp": 80, "windows": []})  # type: ignore
+
+    reference = ConsolidatedOwlLogs(create_indexed_entries(), PATHS, TITLES)
+    for by in ("path", "title"):
+        for active_only in (True, False):
+            assert col.get_durations(
+                by, resolution=25, active_only=active_only  # type: ignore
+            ) == reference.get_durations(
+                by, resolution=25, active_only=active_only  # type: ignore
+            )
+
+
+def test_get_total_durations():
+    rng = random.Random(0)
+    entries = []
+    time = 1_700_000_000
+    windows = []
+    for _ in range(3000):
+        time += rng.choice([0, 5, 5, 5, 600, 3000])
+        if not windows or rng.random() < 0.1:
+            windows = [window_mock(rng.randrange(4), j == 0) for j in range(2)]
+        entries.append(Entry(time, windows))
+    col = ConsolidatedOwlLogs(entries, PATHS, TITLES)
+
+    def reference(start_time, end_time) -> dict[str, int]:
+        durations = col.get_durations(
+            resolution=1 << 40, start_time=start_time, end_time=end_time
+        )
+        return {path: sum(buckets.values()) for path, buckets in durations.items()}
+
+    assert col.get_total_durations() == reference(None, None)
+    first, last = entries[0].timestamp, entries[-1].timestamp
+    for _ in range(100):
+        start_time = rng.randrange(first - 100, last + 100)
+        end_time = rng.randrange(start_time, last + 200)
+        expected = reference(start_time, end_time)
+        assert col.get_total_durations(start_time, end_time) == expected
+        assert col.get_total_durations(end_time=end_time) == reference(None, end_time)
+
+    assert col.get_total_durations(last + 1) == {}
+    assert ConsolidatedOwlLogs([], [], []).get_total_durations() == {}
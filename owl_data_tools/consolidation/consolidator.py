@@ -2,33 +2,146 @@
 """
 
 from __future__ import annotations
-from typing import Optional, Sequence, TypedDict
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import partial
+import heapq
+from itertools import islice
+import json
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    TypedDict,
+    overload,
+)
 from ..exceptions import OwlError
 
-from owl_data_tools.types import Window
 from ..utils import find_first
 from ..version import VERSION
 
+from .aggregation import Rollups, _RollupsData
 from .consolidated_owl_logs import ConsolidatedOwlLogs
-from .dictionary import Dictionary, DictionaryMapper
-from ..types import Entry, EntryData, Window, WindowData
+from .dictionary import CompactDictionary, Dictionary, DictionaryMapper
+from ..types import EntryBase, EntryData, WindowBase
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+_NO_DURATION = -1
+"""Stored in place of a missing duration since last input."""
+
+_BULK_RUN_MIN = 64
+"""Minimum number of consecutive entries of a :class:`Consolidator`
+appended in bulk by :meth:`Consolidator.append_from_consolidators`."""
+
+COMPACT_VERSION = (0, 3, 0)
+"""COLF version written by ``serialize(compact=True)``.
+
+Since version 0.1.0, an entry without "windows" has the same windows
+as the previous entry, and an entry with "windowsSplice" has the
+windows of the previous entry, spliced like JavaScript's
+``Array.prototype.splice``: ``[start, deleteCount, insertedWindows]``.
+
+Since version 0.2.0, every distinct window is stored once in the
+"windows[]" dictionary, and entries reference windows by their index in it.
+
+Since version 0.3.0, the "windows[].title" dictionary can have a
+"suffixes" list of title endings shared by multiple titles, e.g.
+``" - Google Chrome"``, and a "suffixIndexes" list with the index
+of the suffix of every title of its set, or -1. The title is
+``set[i] + suffixes[suffixIndexes[i]]``.
+"""
+
+_TITLE_SEPARATOR = " - "
+"""Separator of the parts of a window title, where shared suffixes start."""
+
+_DELTA_VERSION = (0, 1, 0)
+"""First COLF version where the windows of an entry
+can be omitted or spliced."""
+
+_WindowKey = tuple[str, str, bool]
+"""Path, title, and if the user is active in a window."""
 
 
 class Consolidator:
-    """Class used to consolidate multiple entries into a unified object."""
+    """Class used to consolidate multiple entries into a unified object.
+
+    The consolidated data is stored in columns of typed arrays
+    rather than in one object per entry and window.
+    Every distinct window is stored once in a dictionary of windows,
+    and the windows of the entries are indexes of that dictionary.
+    The windows of the `i`-th entry are at the indexes from
+    ``_window_starts[i]`` to ``_window_ends[i]`` of ``_window_is``.
+    An entry whose windows are identical to the ones of the previous
+    entry shares its range rather than storing them again,
+    which is the common case while the user is idle.
+    """
 
-    _path_cd: Dictionary
-    _title_cd: Dictionary
+    _path_cd: Dictionary[str]
+    _title_cd: Dictionary[str]
+    _window_cd: _WindowDictionary
+
+    _timestamps: array[int]
+    """Timestamp of every entry."""
+    _durations: array[int]
+    """Duration since last input of every entry,
+    or :data:`_NO_DURATION` if there is none."""
+    _window_starts: array[int]
+    """Index of the first window of every entry."""
+    _window_ends: array[int]
+    """Index after the last window of every entry."""
+    _window_is: array[int]
+    """Window dictionary index of the windows of the entries."""
 
-    _entries: list[_Entry]
     _optimized = True
     """If :class:`Consolidator` is in an optimized state."""
 
-    def __init__(self):
-        """Constructs :class:`Consolidator`"""
+    _deduplicate: bool
+    """If entries duplicating an entry already appended are dropped."""
+
+    _compact_titles: bool
+    """If the titles are stored in a :class:`CompactDictionary`."""
+
+    _rollups: Optional[Rollups] = None
+    """Rollups loaded with the serialized entries,
+    until other entries are appended."""
+
+    def __init__(self, deduplicate=False, compact_titles=False):
+        """Constructs :class:`Consolidator`
+
+        Parameters
+        ----------
+        deduplicate : bool, optional
+            Drop appended entries that have the same timestamp
+            and windows as an entry already appended, by default False.
+            Useful to merge data that overlaps, e.g. backups.
+        compact_titles : bool, optional
+            Store the titles in a :class:`CompactDictionary`, and index
+            the windows without holding their titles, by default False.
+            It takes much less memory with millions of distinct titles,
+            but appending is slower.
+        """
+        self._deduplicate = deduplicate
+        self._compact_titles = compact_titles
         self._path_cd = Dictionary()
-        self._title_cd = Dictionary()
-        self._entries = []
+        if compact_titles:
+            self._title_cd = CompactDictionary()
+            self._window_cd = _CompactWindowDictionary(self._path_cd, self._title_cd)
+        else:
+            self._title_cd = Dictionary()
+            self._window_cd = _WindowDictionary(self._path_cd, self._title_cd)
+        self._timestamps = array("q")
+        self._durations = array("q")
+        self._window_starts = array("Q")
+        self._window_ends = array("Q")
+        self._window_is = array("I")
 
     def append_entry(self, entry: EntryData):
         """Append and consolidate entry.
@@ -41,7 +154,7 @@ class Consolidator:
         entry : EntryData
             Entry data
         """
-        if len(self._entries) > 0 and self._entries[-1].timestamp > entry["timestamp"]:
+        if len(self._timestamps) > 0 and self._timestamps[-1] > entry["timestamp"]:
             raise OwlError(
                 "Attempting to append an entry with a timestamp earlier "
                 "than the latest entry in the Consolidator.\n\n"
@@ -50,12 +163,98 @@ class Consolidator:
                 f"Offending entry:\n{str(entry)}"
             )
 
-        self._entries.append(
-            _Entry.from_entry_data(entry, self._path_cd, self._title_cd)
-        )
+        duration_since_last_input = entry.get("durationSinceLastUserInput")
+        if duration_since_last_input is None:
+            duration_since_last_input = _NO_DURATION
+
+        use_window = self._window_cd.use_value
+        window_is = array("I")
+        for w in entry.get("windows") or []:
+            path = w.get("path") or ""
+            title = w.get("title") or ""
+            window_is.append(use_window((path, title, bool(w.get("isActive")))))
+        self._append(entry["timestamp"], duration_since_last_input, window_is)
 
         self._optimized = False
 
+    def _append(
+        self, timestamp: int, duration: int, window_is: Optional[array[int]] = None
+    ) -> bool:
+        """Append an entry.
+
+        Parameters
+        ----------
+        timestamp : int
+            Timestamp of the entry.
+        duration : int
+            Duration since last input, or :data:`_NO_DURATION`.
+        window_is : Optional[array[int]], optional
+            Window dictionary indexes of the windows of the entry,
+            whose uses must already be counted. By default None,
+            for the same windows as the latest entry appended.
+
+        Returns
+        -------
+        bool
+            False if the entry was dropped as a duplicate.
+        """
+        starts = self._window_starts
+        ends = self._window_ends
+        self._rollups = None
+
+        if self._deduplicate:
+            compared_is = window_is
+            if compared_is is None:
+                compared_is = self._window_is[starts[-1] : ends[-1]]
+
+            # Entries with the same timestamp are at the end.
+            i = len(self._timestamps) - 1
+            while i >= 0 and self._timestamps[i] == timestamp:
+                if self._window_is[starts[i] : ends[i]] == compared_is:
+                    if window_is is not None:
+                        self._window_cd.count_uses(window_is, -1)
+                    return False
+                i -= 1
+
+        self._timestamps.append(timestamp)
+        self._durations.append(duration)
+
+        if window_is is None:
+            # Same windows as the previous entry.
+            self._window_cd.count_uses(self._window_is[starts[-1] : ends[-1]])
+            starts.append(starts[-1])
+            ends.append(ends[-1])
+            return True
+
+        if ends:
+            start = starts[-1]
+            end = ends[-1]
+            if (
+                end - start == len(window_is)
+                and self._window_is[start:end] == window_is
+            ):
+                # Identical windows are shared with the previous entry.
+                starts.append(start)
+                ends.append(end)
+                return True
+
+        starts.append(len(self._window_is))
+        self._window_is.extend(window_is)
+        ends.append(len(self._window_is))
+        return True
+
+    def _check_chronological(self, timestamp: int):
+        """Raise :class:`OwlError` if `timestamp` is earlier
+        than the latest entry."""
+        if self._timestamps and self._timestamps[-1] > timestamp:
+            raise OwlError(
+                "Attempting to append an entry with a timestamp earlier "
+                "than the latest entry in the Consolidator.\n\n"
+                "Use `merge_from_serialized` or `merge_from_consolidators` "
+                "to merge data that overlaps in time.\n\n"
+                f"Offending entry timestamp: {timestamp}"
+            )
+
     def append_entries(self, entries: Sequence[EntryData]):
         """Append and consolidate entries.
 
@@ -72,57 +271,54 @@ class Consolidator:
 
     def generate_col(self) -> ConsolidatedOwlLogs:
         """Generate a consolidated owl logs object."""
-        paths = self._path_cd.generate_values_list()
-        titles = self._title_cd.generate_values_list()
-        entries: list[Entry] = [_EntryView(x, paths, titles) for x in self._entries]
-
-        return ConsolidatedOwlLogs(entries, paths, titles)
+        columns = _Columns(self)
+        entries = _EntryViews(columns, len(self._timestamps))
+
+        return ConsolidatedOwlLogs(
+            entries,
+            columns.paths,
+            columns.titles,
+            columns.timestamps,
+            partial(columns.iter_window_blocks, len(self._timestamps)),
+            self._rollups,
+        )
 
     def optimize(self):
-        """Optimize internal consolidated data."""
+        """Optimize internal consolidated data.
+
+        The paths and titles are sorted from the most
+        to the least used, so the most used ones get the smallest indexes.
+        """
         if self._optimized:
             return
 
-        path_i_to_count: list[int] = [0] * self._path_cd.size
-        title_i_to_count: list[int] = [0] * self._title_cd.size
-
-        for entry in self._entries:
-            for window in entry.windows:
-                path_i_to_count[window.path_i] += 1
-                title_i_to_count[window.title_i] += 1
-
-        path_i_and_counts: list[tuple[int, int]] = [
-            (path_i, count) for path_i, count in enumerate(path_i_to_count)
-        ]
-        title_i_and_counts: list[tuple[int, int]] = [
-            (title_i, count) for title_i, count in enumerate(title_i_to_count)
-        ]
+        # The uses of the paths and titles are the uses of their windows.
+        windows = self._window_cd
+        window_counts = windows.generate_counts_list()
 
-        path_i_and_counts.sort(key=lambda x: x[1], reverse=True)
-        title_i_and_counts.sort(key=lambda x: x[1], reverse=True)
-
-        old_path_i_to_new: list[int] = [0] * len(path_i_and_counts)
-        old_title_i_to_new: list[int] = [0] * len(title_i_and_counts)
-
-        for new_i, [old_i, _] in enumerate(path_i_and_counts):
-            old_path_i_to_new[old_i] = new_i
-        for new_i, [old_i, _] in enumerate(title_i_and_counts):
-            old_title_i_to_new[old_i] = new_i
-
-        for entry in self._entries:
-            for window in entry.windows:
-                window.path_i = old_path_i_to_new[window.path_i]
-                window.title_i = old_title_i_to_new[window.title_i]
-
-        paths = self._path_cd.generate_values_list()
-        titles = self._title_cd.generate_values_list()
-
-        self._path_cd = Dictionary([paths[i] for [i, _] in path_i_and_counts])
-        self._title_cd = Dictionary([titles[i] for [i, _] in title_i_and_counts])
+        path_order = _frequency_order(
+            _sum_counts(windows.path_is, window_counts, self._path_cd.size)
+        )
+        if path_order is not None:
+            self._path_cd = self._path_cd.reordered(path_order)
+            windows.path_cd = self._path_cd
+            windows.path_is = _remap(windows.path_is, _inverse_order(path_order))
+            if self._rollups is not None:
+                self._rollups = self._rollups.remapped(_inverse_order(path_order))
+
+        title_order = _frequency_order(
+            _sum_counts(windows.title_is, window_counts, self._title_cd.size)
+        )
+        if title_order is not None:
+            self._title_cd = self._title_cd.reordered(title_order)
+            windows.title_cd = self._title_cd
+            windows.title_is = _remap(windows.title_is, _inverse_order(title_order))
 
         self._optimized = True
 
-    def serialize(self, optimize=True) -> ConsolidatedOwlLogsSerialized:
+    def serialize(
+        self, optimize=True, compact=False, rollups=False
+    ) -> ConsolidatedOwlLogsSerialized:
         """Generate JSON-serializable dictionary.
 
         Parameters
@@ -130,6 +326,15 @@ class Consolidator:
         optimize : bool, optional
             Optimize :class:`Consolidator` before
             serializing, by default True.
+        compact : bool, optional
+            Serialize to the :data:`COMPACT_VERSION` of COLF, where
+            every distinct window is serialized once, windows
+            that did not change since the previous entry
+            are not repeated, and suffixes shared by titles are
+            serialized once, by default False.
+        rollups : bool, optional
+            Add the "rollups" of the foreground durations by path index,
+            see :meth:`ConsolidatedOwlLogs.get_rollups`, by default False.
 
         Returns
         -------
@@ -139,44 +344,182 @@ class Consolidator:
         if optimize:
             self.optimize()
 
-        obj: ConsolidatedOwlLogsSerialized = {
-            "version": ".".join(map(str, VERSION)),
-            "dictionaries": [],
-            "entries": [],
-        }
-
-        obj["dictionaries"].append(
-            {"name": "windows[].path", "set": self._path_cd.generate_values_list()}
-        )
-        obj["dictionaries"].append(
-            {"name": "windows[].title", "set": self._title_cd.generate_values_list()}
+        obj: ConsolidatedOwlLogsSerialized = self._serialize_header(  # type: ignore
+            compact, rollups
         )
+        # The sets must not change as more entries are appended.
+        for dictionary in obj["dictionaries"]:
+            dictionary["set"] = list(dictionary["set"])
+        obj["entries"] = list(self._iter_serialized_entries(compact))
 
-        for entry in self._entries:
-            windows_serialized: list[_ColsWindowData] = []
+        return obj
 
-            for window in entry.windows:
-                window_serialized: _ColsWindowData = {  # type: ignore
-                    "title": window.title_i,
-                    "path": window.path_i,
+    def write_serialized(
+        self,
+        files: Sequence[IO[str]],
+        optimize=True,
+        chunk_size=1000,
+        compact=False,
+        rollups=False,
+    ):
+        """Write the serialized consolidated owl logs as JSON to `files`.
+
+        The JSON is identical to ``json.dumps(self.serialize())``,
+        but it is encoded and written `chunk_size` entries at a time,
+        so the whole document is never held in memory.
+
+        Parameters
+        ----------
+        files : Sequence[IO[str]]
+            Text files to write to.
+        optimize : bool, optional
+            Optimize :class:`Consolidator` before
+            serializing, by default True.
+        chunk_size : int, optional
+            Number of entries encoded at once, by default 1000
+        compact : bool, optional
+            Serialize to the :data:`COMPACT_VERSION` of COLF,
+            by default False. See :meth:`serialize`.
+        rollups : bool, optional
+            Add the "rollups", by default False. See :meth:`serialize`.
+        """
+        if optimize:
+            self.optimize()
+
+        def write(s: str):
+            for f in files:
+                f.write(s)
+
+        header = json.dumps(self._serialize_header(compact, rollups))
+        write(header[:-1] + ', "entries": [')
+
+        separator = ""
+        entries = self._iter_serialized_entries(compact)
+        while chunk := list(islice(entries, chunk_size)):
+            # Strip the brackets of the encoded list of entries.
+            write(separator + json.dumps(chunk)[1:-1])
+            separator = ", "
+
+        write("]}")
+
+    def _serialize_header(self, compact=False, rollups=False) -> dict:
+        """Generate the serialized consolidated owl logs without the entries."""
+        titles = self._title_cd.values
+        if not isinstance(titles, list):
+            titles = list(titles)
+
+        title_dictionary = {"name": "windows[].title", "set": titles}
+        if compact:
+            stems, suffixes, suffix_is = _split_suffixes(titles)
+            if suffixes:
+                title_dictionary = {
+                    "name": "windows[].title",
+                    "suffixes": suffixes,
+                    "suffixIndexes": suffix_is,
+                    "set": stems,
                 }
-                if window.is_active:
-                    window_serialized["isActive"] = True
 
-                windows_serialized.append(window_serialized)
+        dictionaries: list[_ColsDictionaryData] = [
+            {"name": "windows[].path", "set": self._path_cd.values},  # type: ignore
+            title_dictionary,  # type: ignore
+        ]
+        if compact:
+            dictionaries.append(
+                {"name": "windows[]", "set": self._serialize_windows()}  # type: ignore
+            )
 
-            entry_serialized: _ColsEntryData = {  # type: ignore
-                "time": entry.timestamp,
-                "windows": windows_serialized,
+        header: dict[str, Any] = {
+            "version": ".".join(map(str, COMPACT_VERSION if compact else VERSION)),
+            "dictionaries": dictionaries,
+        }
+        if rollups:
+            header["rollups"] = self.generate_col().get_rollups().serialize()
+        return header
+
+    def _serialize_windows(self) -> list[_ColsWindowData]:
+        """Generate the serialized window of every window dictionary index."""
+        windows = self._window_cd
+        windows_serialized: list[_ColsWindowData] = []
+        for path_i, title_i, is_active in zip(
+            windows.path_is, windows.title_is, windows.is_active
+        ):
+            window_serialized: _ColsWindowData = {  # type: ignore
+                "title": title_i,
+                "path": path_i,
             }
-            if entry.duration_since_last_input is not None:
-                entry_serialized[
-                    "durationSinceLastInput"
-                ] = entry.duration_since_last_input
+            if is_active:
+                window_serialized["isActive"] = True
+            windows_serialized.append(window_serialized)
 
-            obj["entries"].append(entry_serialized)
+        return windows_serialized
 
-        return obj
+    def _iter_serialized_entries(self, compact=False) -> Iterator[_ColsEntryData]:
+        """Generate the serialized entries one by one."""
+        window_is = self._window_is
+        starts = self._window_starts
+        ends = self._window_ends
+
+        serialize_windows: Callable[[slice], Iterable]
+        if compact:
+            serialize_windows = window_is.__getitem__
+        else:
+            # Entries share the serialized window objects.
+            windows_serialized = self._serialize_windows()
+
+            def serialize_window_objects(indexes: slice) -> list[_ColsWindowData]:
+                return [windows_serialized[w] for w in window_is[indexes]]
+
+            serialize_windows = serialize_window_objects
+
+        for i, timestamp in enumerate(self._timestamps):
+            start = starts[i]
+            end = ends[i]
+            entry_serialized: _ColsEntryData = {"time": timestamp}  # type: ignore
+
+            if not compact or i == 0:
+                entry_serialized["windows"] = list(serialize_windows(slice(start, end)))
+            elif start != starts[i - 1] or end != ends[i - 1]:
+                previous_start = starts[i - 1]
+                previous_end = ends[i - 1]
+                n_common = min(end - start, previous_end - previous_start)
+
+                n_prefix = 0
+                while (
+                    n_prefix < n_common
+                    and window_is[previous_start + n_prefix]
+                    == window_is[start + n_prefix]
+                ):
+                    n_prefix += 1
+                n_suffix = 0
+                while (
+                    n_suffix < n_common - n_prefix
+                    and window_is[previous_end - 1 - n_suffix]
+                    == window_is[end - 1 - n_suffix]
+                ):
+                    n_suffix += 1
+
+                n_deleted = previous_end - previous_start - n_prefix - n_suffix
+                n_inserted = end - start - n_prefix - n_suffix
+                if n_inserted == n_deleted == 0:
+                    # Identical windows stored separately.
+                    pass
+                elif n_inserted < end - start:
+                    entry_serialized["windowsSplice"] = [
+                        n_prefix,
+                        n_deleted,
+                        list(
+                            serialize_windows(slice(start + n_prefix, end - n_suffix))
+                        ),
+                    ]
+                else:
+                    entry_serialized["windows"] = list(
+                        serialize_windows(slice(start, end))
+                    )
+
+            if self._durations[i] != _NO_DURATION:
+                entry_serialized["durationSinceLastInput"] = self._durations[i]
+
+            yield entry_serialized
 
     def append_from_serialized(self, serialized: ConsolidatedOwlLogsSerialized):
         """Append from serialized data.
@@ -186,205 +529,965 @@ class Consolidator:
         serialized : ConsolidatedOwlLogsSerialized
             Serialized :class:`Consolidator`
         """
-        title_set = find_first(  # type: ignore
-            serialized["dictionaries"], lambda elem: elem["name"] == "windows[].title"
-        )["set"]
-        path_set = find_first(  # type: ignore
-            serialized["dictionaries"], lambda elem: elem["name"] == "windows[].path"
-        )["set"]
+        self.append_serialized_entries(
+            serialized["dictionaries"],
+            serialized["entries"],
+            serialized.get("version"),
+            serialized.get("rollups"),
+        )
+
+    def append_serialized_entries(
+        self,
+        dictionaries: Sequence[_ColsDictionaryData],
+        entries: Iterable[_ColsEntryData],
+        version: Optional[str] = None,
+        rollups: Optional[_RollupsData] = None,
+    ):
+        """Append serialized entries, one at a time.
 
-        title_dmap = DictionaryMapper(title_set, self._title_cd)
-        path_dmap = DictionaryMapper(path_set, self._path_cd)
+        Unlike :meth:`append_from_serialized`, `entries` can be
+        any iterable, e.g. :meth:`ColfReader.iter_entries`, so the
+        entries do not have to be decoded all at once.
 
-        for entry in serialized["entries"]:
-            windows_mapped: list[_Window] = []
+        Parameters
+        ----------
+        dictionaries : Sequence[_ColsDictionaryData]
+            Dictionaries of the serialized data.
+        entries : Iterable[_ColsEntryData]
+            Serialized entries.
+        version : Optional[str], optional
+            COLF version of the serialized data, by default None
+            for the original version.
+        rollups : Optional[_RollupsData], optional
+            Rollups of the serialized data, by default None. They are kept
+            for :meth:`generate_col` if this :class:`Consolidator` was empty,
+            until other entries are appended.
+        """
+        was_empty = not self._timestamps
+        title_set = _dictionary_values(
+            find_first(  # type: ignore
+                dictionaries, lambda elem: elem["name"] == "windows[].title"
+            )
+        )
+        path_set = find_first(  # type: ignore
+            dictionaries, lambda elem: elem["name"] == "windows[].path"
+        )["set"]
+        window_dictionary = find_first(
+            dictionaries, lambda elem: elem["name"] == "windows[]"
+        )
 
-            if "windows" in entry:
-                for w in entry["windows"] or []:
-                    windows_mapped.append(
-                        _Window(
-                            path_dmap.source_to_target(w["path"]),
-                            title_dmap.source_to_target(w["title"]),
-                            w.get("isActive") or False,
+        def window_key(w: _ColsWindowData) -> _WindowKey:
+            return (path_set[w["path"]], title_set[w["title"]], bool(w.get("isActive")))
+
+        window_mapper = None
+        windows_to_target: Callable[[list], array[int]]
+        if window_dictionary is not None:
+            # The windows of the entries are indexes of the window dictionary.
+            window_mapper = DictionaryMapper(
+                [window_key(w) for w in window_dictionary["set"]],
+                self._window_cd,
+                defer_counts=True,
+            )
+            windows_to_target = window_mapper.sources_to_targets
+        else:
+            # Windows are looked up by their serialized indexes first,
+            # to avoid looking up their path and title strings.
+            use_window = self._window_cd.use_value
+            counts = self._window_cd._counts
+            targets: dict[tuple, int] = {}
+            if (
+                DictionaryMapper(path_set, self._path_cd).is_identity
+                and DictionaryMapper(title_set, self._title_cd).is_identity
+            ):
+                # The paths and titles are a prefix of this Consolidator's,
+                # e.g. when reading back its own output, so the serialized
+                # indexes of the windows already appended are known.
+                target_windows = self._window_cd
+                targets.update(
+                    zip(
+                        zip(
+                            target_windows.path_is,
+                            target_windows.title_is,
+                            [True if a else None for a in target_windows.is_active],
                         ),
+                        range(target_windows.size),
                     )
-
-            self._entries.append(
-                _Entry(
-                    entry["time"], windows_mapped, entry.get("durationSinceLastInput")
                 )
-            )
+
+            def window_to_target(w: _ColsWindowData) -> int:  # type: ignore
+                serialized_key = (w["path"], w["title"], w.get("isActive"))
+                i = targets.get(serialized_key)
+                if i is None:
+                    i = targets[serialized_key] = use_window(window_key(w))
+                else:
+                    counts[i] += 1
+                return i
+
+            def serialized_windows_to_target(
+                windows: list[_ColsWindowData],
+            ) -> array[int]:
+                return array("I", map(window_to_target, windows))
+
+            windows_to_target = serialized_windows_to_target
+
+        previous_windows = None
+        try:
+            for entry, entry_windows in _iter_serialized_windows(entries, version):
+                self._check_chronological(entry["time"])
+                duration_since_last_input = entry.get("durationSinceLastInput")
+                if duration_since_last_input is None:
+                    duration_since_last_input = _NO_DURATION
+
+                if entry_windows is previous_windows:
+                    appended = self._append(entry["time"], duration_since_last_input)
+                else:
+                    appended = self._append(
+                        entry["time"],
+                        duration_since_last_input,
+                        windows_to_target(entry_windows),
+                    )
+                # The windows of a dropped duplicate are not the latest ones.
+                previous_windows = entry_windows if appended else None
+        finally:
+            if window_mapper is not None:
+                window_mapper.count_pending_uses()
+
+        if rollups is not None and was_empty:
+            key_map = [self._path_cd.index_of(path) for path in path_set]
+            self._rollups = Rollups.from_serialized(rollups, key_map)
 
         self._optimized = False
 
+    def append_from_consolidator(self, consolidator: Consolidator):
+        """Append the entries of another :class:`Consolidator`.
 
-class _WindowView(Window):
-    _window: _Window
-    _paths: list[str]
-    _titles: list[str]
+        The paths, titles and windows of `consolidator` are remapped
+        into this :class:`Consolidator`'s dictionaries, in the same
+        order as if its entries were appended with :meth:`append_entry`.
+        `consolidator` itself is left untouched.
 
-    __slots__ = ("_window", "_paths", "_titles")
+        Parameters
+        ----------
+        consolidator : Consolidator
+            Consolidator to append from.
+        """
+        self.append_from_consolidators([consolidator])
 
-    def __init__(self, window: _Window, paths: list[str], titles: list[str]):
-        self._window = window
-        self._paths = paths
-        self._titles = titles
+    def append_from_consolidators(self, consolidators: Sequence[Consolidator]):
+        """Append the entries of multiple :class:`Consolidator`,
+        interleaved in chronological order.
 
-    @property
-    def path(self) -> str:
-        return self._paths[self._window.path_i]
+        Entries of different consolidators with the same timestamp
+        are appended in the order of `consolidators`. The result is
+        the same as appending the entries one by one with
+        :meth:`append_entry` in that order. Long runs of entries
+        of one consolidator that do not interleave with the others,
+        e.g. consolidators that do not overlap in time, are appended
+        in bulk if NumPy is available.
 
-    @property
-    def title(self) -> str:
-        return self._titles[self._window.title_i]
+        Parameters
+        ----------
+        consolidators : Sequence[Consolidator]
+            Consolidators to append from.
+        """
+        mappers = [
+            DictionaryMapper(c._window_cd.values, self._window_cd, defer_counts=True)
+            for c in consolidators
+        ]
+        # Next entry of every consolidator, in the order it is appended.
+        heap = [
+            (c._timestamps[0], k, 0)
+            for k, c in enumerate(consolidators)
+            if c._timestamps
+        ]
+        heapq.heapify(heap)
+
+        previous = None
+        try:
+            while heap:
+                timestamp, k, i = heapq.heappop(heap)
+                source = consolidators[k]
+                mapper = mappers[k]
+                timestamps = source._timestamps
+
+                # The entries before the next entry of another consolidator
+                # are appended in one run, e.g. a consolidator entirely
+                # after the others.
+                if not heap:
+                    end = len(timestamps)
+                elif k < heap[0][1]:
+                    end = bisect_right(timestamps, heap[0][0], i + 1)
+                else:
+                    end = bisect_left(timestamps, heap[0][0], i + 1)
+                if end < len(timestamps):
+                    heapq.heappush(heap, (timestamps[end], k, end))
+
+                self._check_chronological(timestamp)
+                appended = self._append_from(source, mapper, i, previous == (k, i - 1))
+                if (
+                    appended
+                    and np is not None
+                    and end - i > _BULK_RUN_MIN
+                    and not (
+                        self._deduplicate
+                        and _has_duplicate_timestamps(timestamps, i, end)
+                    )
+                ):
+                    self._extend_from(source, mapper, i, end)
+                    appended = True
+                    i = end - 1
+                else:
+                    for i in range(i + 1, end):
+                        appended = self._append_from(source, mapper, i, appended)
+                # The windows of a dropped duplicate are not the latest ones.
+                previous = (k, i) if appended else None
+        finally:
+            for mapper in mappers:
+                mapper.count_pending_uses()
 
-    @property
-    def is_active(self) -> bool:
-        return self._window.is_active
+        self._optimized = False
 
+    def _append_from(
+        self,
+        source: Consolidator,
+        mapper: DictionaryMapper[_WindowKey],
+        i: int,
+        follows_previous: bool,
+    ) -> bool:
+        """Append the `i`-th entry of `source`.
 
-class _EntryView(Entry):
-    _entry: _Entry
-    _paths: list[str]
-    _titles: list[str]
+        Parameters
+        ----------
+        source : Consolidator
+            Consolidator to append from.
+        mapper : DictionaryMapper[_WindowKey]
+            Mapper of the windows of `source` to this :class:`Consolidator`.
+        i : int
+            Index of the entry in `source`.
+        follows_previous : bool
+            If the latest entry appended is the previous entry of `source`.
 
-    __slots__ = ("_entry", "_paths", "_titles")
+        Returns
+        -------
+        bool
+            False if the entry was dropped as a duplicate.
+        """
+        start = source._window_starts[i]
+        end = source._window_ends[i]
+        if (
+            follows_previous
+            and source._window_starts[i - 1] == start
+            and source._window_ends[i - 1] == end
+        ):
+            return self._append(source._timestamps[i], source._durations[i])
+
+        window_is = mapper.sources_to_targets(source._window_is[start:end])
+        return self._append(source._timestamps[i], source._durations[i], window_is)
+
+    def _extend_from(
+        self,
+        source: Consolidator,
+        mapper: DictionaryMapper[_WindowKey],
+        first: int,
+        end: int,
+    ):
+        """Append the entries of `source` after the `first` one until `end`
+        in bulk, the latest entry appended being the `first` one.
+        Requires NumPy.
 
-    def __init__(self, entry: _Entry, paths: list[str], titles: list[str]):
-        self._entry = entry
-        self._paths = paths
-        self._titles = titles
+        The windows are remapped with a single lookup table, and the window
+        ranges of the entries are offset, rather than appending every entry.
+        With `deduplicate`, the entries must have distinct timestamps.
+        """
+        starts = self._window_starts
+        ends = self._window_ends
+        first_start = starts[-1]
+        first_end = ends[-1]
+
+        source_starts = np.frombuffer(source._window_starts, dtype=np.uint64)
+        source_ends = np.frombuffer(source._window_ends, dtype=np.uint64)
+        run_starts = source_starts[first + 1 : end].astype(np.int64)
+        run_ends = source_ends[first + 1 : end].astype(np.int64)
+        # The first entries may share the windows of the `first` one,
+        # the windows of the others follow them in `source`.
+        shares_first = (run_starts == int(source_starts[first])) & (
+            run_ends == int(source_ends[first])
+        )
+        n_sharing_first = int(np.count_nonzero(shares_first))
+        windows_start = int(source_ends[first])
+        windows_end = int(source_ends[end - 1])
+        offset = len(self._window_is) - windows_start
+
+        window_is = mapper.lookup_targets(source._window_is[windows_start:windows_end])
+        self._window_is.frombytes(window_is.tobytes())
+        starts.frombytes(
+            np.where(shares_first, first_start, run_starts + offset)
+            .astype(np.uint64)
+            .tobytes()
+        )
+        ends.frombytes(
+            np.where(shares_first, first_end, run_ends + offset)
+            .astype(np.uint64)
+            .tobytes()
+        )
+        self._timestamps.extend(source._timestamps[first + 1 : end])
+        self._durations.extend(source._durations[first + 1 : end])
 
-    @property
-    def timestamp(self) -> int:
-        return self._entry.timestamp
+        # Every entry uses all of its windows once.
+        if n_sharing_first:
+            self._window_cd.count_uses(
+                self._window_is[first_start:first_end], n_sharing_first
+            )
+        run_starts = run_starts[n_sharing_first:]
+        run_ends = run_ends[n_sharing_first:]
+        if len(run_starts):
+            shared = (run_starts[1:] == run_starts[:-1]) & (
+                run_ends[1:] == run_ends[:-1]
+            )
+            range_firsts = np.flatnonzero(np.concatenate(([True], ~shared)))
+            n_range_entries = np.diff(np.append(range_firsts, len(run_starts)))
+            uses = np.bincount(
+                window_is,
+                weights=np.repeat(
+                    n_range_entries.astype(np.float64),
+                    run_ends[range_firsts] - run_starts[range_firsts],
+                ),
+            )
+            counts = self._window_cd._counts
+            used = np.flatnonzero(uses)
+            for i, n in zip(used.tolist(), uses[used].astype(np.int64).tolist()):
+                counts[i] += n
 
-    @property
-    def duration_since_last_input(self):
-        return self._entry.duration_since_last_input
+    def merge_from_serialized(self, serialized: ConsolidatedOwlLogsSerialized):
+        """Merge serialized data, which may overlap in time
+        with the entries already appended.
 
-    @property
-    def windows_view(self) -> list[_WindowView]:
-        return [_WindowView(x, self._paths, self._titles) for x in self._entry.windows]
+        See :meth:`merge_from_consolidators`.
+
+        Parameters
+        ----------
+        serialized : ConsolidatedOwlLogsSerialized
+            Serialized :class:`Consolidator`
+        """
+        consolidator = Consolidator()
+        consolidator.append_from_serialized(serialized)
+        self.merge_from_consolidators([consolidator])
+
+    def merge_from_consolidators(self, consolidators: Sequence[Consolidator]):
+        """Merge the entries of multiple :class:`Consolidator`
+        with the entries already appended, in chronological order.
+
+        Unlike :meth:`append_from_consolidators`, the entries of
+        `consolidators` can be earlier than the latest entry of this
+        :class:`Consolidator`. All the entries are interleaved
+        in a single pass, so the dictionaries are rebuilt
+        and this :class:`Consolidator` is no longer optimized.
+        With `deduplicate`, entries already present are dropped.
+
+        Parameters
+        ----------
+        consolidators : Sequence[Consolidator]
+            Consolidators to merge from.
+        """
+        merged = Consolidator(self._deduplicate, self._compact_titles)
+        merged.append_from_consolidators([self, *consolidators])
+
+        self._path_cd = merged._path_cd
+        self._title_cd = merged._title_cd
+        self._window_cd = merged._window_cd
+        self._timestamps = merged._timestamps
+        self._durations = merged._durations
+        self._window_starts = merged._window_starts
+        self._window_ends = merged._window_ends
+        self._window_is = merged._window_is
+        self._optimized = False
+        self._rollups = None
 
 
-class _Window:
-    """One-off private class to store window data
-    only to be used in :class:`Consolidator`.
+class _WindowDictionary(Dictionary[_WindowKey]):
+    """Dictionary of the distinct windows of a :class:`Consolidator`.
+
+    Besides the windows themselves, the path and title index
+    of every window are stored in columns. The paths and titles
+    of new windows are added to the path and title dictionaries.
     """
 
-    path_i: int
-    title_i: int
-    is_active: bool
+    path_cd: Dictionary[str]
+    title_cd: Dictionary[str]
 
-    __slots__ = ("path_i", "title_i", "is_active")
+    path_is: array[int]
+    """Path index of every window."""
+    title_is: array[int]
+    """Title index of every window."""
+    is_active: bytearray
+    """1 if the user is active in the window, 0 otherwise."""
 
-    def __init__(self, path_i: int, title_i: int, is_active=False):
+    def __init__(
+        self,
+        path_cd: Dictionary[str],
+        title_cd: Dictionary[str],
+        values: Optional[Sequence[_WindowKey]] = None,
+        counts: Optional[Sequence[int]] = None,
+    ):
         """
         Parameters
         ----------
-        path_i : int
-            Window path's index
-        title_i : int
-            Window title's index
-        is_active : bool, optional
-            True if the user is active in the window, by default False
+        path_cd : Dictionary[str]
+            Path dictionary.
+        title_cd : Dictionary[str]
+            Title dictionary.
+        values : Optional[Sequence[_WindowKey]], optional
+            Initial windows, by default None. Their columns
+            must be set by the caller.
+        counts : Optional[Sequence[int]], optional
+            Number of times each of `values` has already been used,
+            by default 0 for every value.
         """
-        self.path_i = path_i
-        self.title_i = title_i
-        self.is_active = is_active
-
-    @classmethod
-    def from_window_data(
-        cls,
-        window: WindowData,
-        path_cd: Dictionary,
-        title_cd: Dictionary,
-    ) -> _Window:
-        """Create window structure from :class:`WindowData`,
-        and path and title :class:`Dictionary`.
+        super().__init__(values, counts)
+        self.path_cd = path_cd
+        self.title_cd = title_cd
+        self.path_is = array("I")
+        self.title_is = array("I")
+        self.is_active = bytearray()
+
+    def use_value(self, value: _WindowKey) -> int:
+        i = self._dict.get(value)
+        if i is not None:
+            self._counts[i] += 1
+            return i
+
+        i = self._dict[value] = len(self._values)
+        self._values.append(value)
+        self._counts.append(1)
+
+        path, title, is_active = value
+        self.path_is.append(self.path_cd.use_value(path))
+        self.title_is.append(self.title_cd.use_value(title))
+        self.is_active.append(1 if is_active else 0)
+
+        return i
+
+
+class _CompactWindowDictionary(_WindowDictionary):
+    """:class:`_WindowDictionary` that does not hold the windows
+    themselves, so their titles are only stored in a
+    :class:`CompactDictionary`.
+
+    The windows are looked up in an open addressing hash index
+    of their columns, instead of a `dict` of tuples.
+    """
 
+    _table: array[int]
+    """Hash index of the windows, with -1 for the empty slots.
+    Never more than half full."""
+
+    def __init__(self, path_cd: Dictionary[str], title_cd: CompactDictionary):
+        """
         Parameters
         ----------
-        window : WindowData
-            Window data
-        path_cd : Dictionary
-            Paths dictionary
-        title_cd : Dictionary
-            Titles dictionary
+        path_cd : Dictionary[str]
+            Path dictionary.
+        title_cd : CompactDictionary
+            Title dictionary.
+        """
+        super().__init__(path_cd, title_cd)
+        self._counts = array("q")  # type: ignore
+        self._table = array("i", [-1]) * 8
+
+    def _find(self, value: _WindowKey) -> tuple[int, int]:
+        """Find `value` in the hash index.
 
         Returns
         -------
-        _Window
+        tuple[int, int]
+            Slot of the hash index, and the index of the window,
+            or -1 if the window is not in the dictionary.
         """
-        path_i = path_cd.use_value(window.get("path") or "")
-        title_i = title_cd.use_value(window.get("title") or "")
+        path, title, is_active = value
+        is_active = bool(is_active)
+        paths = self.path_cd.values
+        titles = self.title_cd.values
+
+        table = self._table
+        mask = len(table) - 1
+        # Paths and titles are hashed rather than their indexes,
+        # which change when the dictionaries are optimized.
+        slot = hash((path, title, is_active)) & mask
+        while True:
+            i = table[slot]
+            if i < 0 or (
+                self.is_active[i] == is_active
+                and paths[self.path_is[i]] == path
+                and titles[self.title_is[i]] == title
+            ):
+                return slot, i
+            slot = (slot + 1) & mask
+
+    def _rebuild_table(self, n_slots: int):
+        """Rebuild the hash index with `n_slots` slots, a power of 2."""
+        table = self._table = array("i", [-1]) * n_slots
+        mask = n_slots - 1
+        for i, value in enumerate(self.values):
+            slot = hash(value) & mask
+            while table[slot] >= 0:
+                slot = (slot + 1) & mask
+            table[slot] = i
+
+    def index_of(self, value: _WindowKey) -> Optional[int]:
+        i = self._find(value)[1]
+        return None if i < 0 else i
+
+    def use_value(self, value: _WindowKey) -> int:
+        slot, i = self._find(value)
+        if i >= 0:
+            self._counts[i] += 1
+            return i
+
+        i = len(self._counts)
+        self._table[slot] = i
+        self._counts.append(1)
+
+        path, title, is_active = value
+        self.path_is.append(self.path_cd.use_value(path))
+        self.title_is.append(self.title_cd.use_value(title))
+        self.is_active.append(1 if is_active else 0)
+
+        if 2 * len(self._counts) > len(self._table):
+            self._rebuild_table(2 * len(self._table))
+        return i
+
+    @property
+    def values(self) -> Sequence[_WindowKey]:
+        """Windows that have been used, by index, built when accessed."""
+        return _CompactWindowValues(self)
+
+    def generate_values_list(self) -> list[_WindowKey]:
+        return list(self.values)
+
+    def __getstate__(self) -> dict:
+        # Hashes differ between processes, so the hash index is rebuilt.
+        state = self.__dict__.copy()
+        del state["_table"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._rebuild_table(max(8, 1 << (2 * len(self._counts)).bit_length()))
+
+
+class _CompactWindowValues(Sequence[_WindowKey]):
+    """Windows of a :class:`_CompactWindowDictionary`, built when accessed."""
 
-        is_active = False
-        if "isActive" in window:
-            is_active = window["isActive"]
+    __slots__ = ("_dictionary",)
 
-        return cls(path_i, title_i, bool(is_active))
+    def __init__(self, dictionary: _CompactWindowDictionary):
+        self._dictionary = dictionary
 
+    def __len__(self) -> int:
+        return len(self._dictionary.is_active)
 
-class _Entry:
-    """One-off private class to store entry data
-    only to be used in :class:`Consolidator`.
+    @overload
+    def __getitem__(self, i: int) -> _WindowKey: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[_WindowKey]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        d = self._dictionary
+        return (
+            d.path_cd.values[d.path_is[i]],
+            d.title_cd.values[d.title_is[i]],
+            bool(d.is_active[i]),
+        )
+
+
+def _iter_serialized_windows(
+    entries: Iterable[_ColsEntryData], version: Optional[str] = None
+) -> Iterator[tuple[_ColsEntryData, list]]:
+    """Pair serialized entries with their full list of windows,
+    undoing the encoding of the :data:`COMPACT_VERSION` of COLF.
+
+    Parameters
+    ----------
+    entries : Iterable[_ColsEntryData]
+        Serialized entries.
+    version : Optional[str], optional
+        COLF version of the serialized data, by default None
+        for the original version.
+
+    Yields
+    ------
+    tuple[_ColsEntryData, list]
+        Serialized entry, and its windows. The same list object is
+        yielded again for entries that repeat the previous windows.
+    """
+    if version is None or tuple(map(int, version.split("."))) < _DELTA_VERSION:
+        for entry in entries:
+            yield entry, entry.get("windows") or []
+        return
+
+    windows: list = []
+    for entry in entries:
+        if "windows" in entry:
+            windows = entry["windows"] or []
+        elif "windowsSplice" in entry:
+            start, n_deleted, inserted = entry["windowsSplice"]  # type: ignore
+            windows = windows[:start] + inserted + windows[start + n_deleted :]
+        yield entry, windows
+
+
+def _split_suffixes(titles: Sequence[str]) -> tuple[list[str], list[str], list[int]]:
+    """Split the suffixes shared by multiple `titles` off them.
+
+    Suffixes start at a :data:`_TITLE_SEPARATOR`, and the longest
+    suffix shared with another title is split off every title.
+
+    Returns
+    -------
+    tuple[list[str], list[str], list[int]]
+        The titles without their suffix, the shared suffixes, and
+        the index of the suffix of every title, or -1.
+        See :data:`COMPACT_VERSION`.
     """
+    suffix_counts: dict[str, int] = {}
+    for title in titles:
+        i = title.find(_TITLE_SEPARATOR)
+        while i >= 0:
+            suffix = title[i:]
+            suffix_counts[suffix] = suffix_counts.get(suffix, 0) + 1
+            i = title.find(_TITLE_SEPARATOR, i + 1)
+
+    stems: list[str] = []
+    suffixes: dict[str, int] = {}
+    suffix_is: list[int] = []
+    for title in titles:
+        i = title.find(_TITLE_SEPARATOR)
+        while i >= 0 and suffix_counts[title[i:]] < 2:
+            i = title.find(_TITLE_SEPARATOR, i + 1)
+
+        if i < 0:
+            stems.append(title)
+            suffix_is.append(-1)
+        else:
+            stems.append(title[:i])
+            suffix_is.append(suffixes.setdefault(title[i:], len(suffixes)))
+
+    return stems, list(suffixes), suffix_is
+
+
+def _dictionary_values(dictionary: _ColsDictionaryData) -> list[str]:
+    """Get the values of a serialized dictionary, with the shared
+    suffixes of :data:`COMPACT_VERSION` appended to their stems."""
+    suffixes = dictionary.get("suffixes")
+    if suffixes is None:
+        return dictionary["set"]
+    return [
+        stem if suffix_i < 0 else stem + suffixes[suffix_i]
+        for stem, suffix_i in zip(
+            dictionary["set"], dictionary["suffixIndexes"]  # type: ignore
+        )
+    ]
+
+
+def _sum_counts(indices: array[int], counts: list[int], size: int) -> list[int]:
+    """Sum the `counts` of the items with the same index.
+    NumPy is used if it is available.
+
+    Parameters
+    ----------
+    indices : array[int]
+        Index of every item, with the "I" type code.
+    counts : list[int]
+        Count of every item.
+    size : int
+        Number of distinct indexes.
+
+    Returns
+    -------
+    list[int]
+        Total count of every index.
+    """
+    if np is not None:
+        totals = np.bincount(
+            np.frombuffer(indices, dtype=np.uint32),
+            weights=np.array(counts, dtype=np.float64),
+            minlength=size,
+        )
+        return totals.astype(np.int64).tolist()
 
-    _timestamp: int
-    _duration_since_last_input: Optional[int]
-    _windows: list[_Window]
+    totals = [0] * size
+    for i, count in zip(indices, counts):
+        totals[i] += count
+    return totals
 
-    __slots__ = ("_timestamp", "_duration_since_last_input", "_windows")
 
-    def __init__(
-        self,
-        timestamp: int,
-        windows: list[_Window],
-        duration_since_last_input: Optional[int],
-    ):
-        """Constructs :class:`_Entry`."""
-        self._timestamp = timestamp
-        self._windows = windows
-        self._duration_since_last_input = duration_since_last_input
-
-    @classmethod
-    def from_entry_data(
-        cls,
-        entry: EntryData,
-        path_cd: Dictionary,
-        title_cd: Dictionary,
-    ) -> _Entry:
-        """Creates :class:`_Entry` using :class:`EntryData`."""
-        windows = []
-        timestamp = entry["timestamp"]
-        if "durationSinceLastUserInput" in entry:
-            duration_since_last_input = entry["durationSinceLastUserInput"]
+def _has_duplicate_timestamps(timestamps: array[int], start: int, end: int) -> bool:
+    """Check if entries from `start` to `end` share timestamps. Requires NumPy."""
+    run = np.frombuffer(timestamps, dtype=np.int64)[start:end]
+    return bool(np.any(run[1:] == run[:-1]))
+
+
+def _frequency_order(counts: list[int]) -> Optional[list[int]]:
+    """Order indexes from the most to the least used.
+    Indexes used equally often keep their relative order.
+
+    Parameters
+    ----------
+    counts : list[int]
+        Number of uses of every index.
+
+    Returns
+    -------
+    Optional[list[int]]
+        The indexes in their new order,
+        or None if the order is unchanged.
+    """
+    if np is not None:
+        order = np.argsort(-np.array(counts, dtype=np.int64), kind="stable").tolist()
+    else:
+        order = sorted(range(len(counts)), key=counts.__getitem__, reverse=True)
+
+    if order == list(range(len(counts))):
+        return None
+    return order
+
+
+def _inverse_order(order: list[int]) -> list[int]:
+    """Map every old index to its position in `order`."""
+    old_to_new = [0] * len(order)
+    for new_i, old_i in enumerate(order):
+        old_to_new[old_i] = new_i
+    return old_to_new
+
+
+def _remap(indices: array[int], old_to_new: list[int]) -> array[int]:
+    """Create a new array of `indices` mapped through `old_to_new`.
+    NumPy is used if it is available.
+
+    Parameters
+    ----------
+    indices : array[int]
+        Array of indices, with the "I" type code.
+    old_to_new : list[int]
+        New index of every old index.
+
+    Returns
+    -------
+    array[int]
+        Remapped indices. A new array is created rather than
+        remapping in place, so views generated before
+        optimizing stay consistent.
+    """
+    if np is not None:
+        old_to_new_np = np.array(old_to_new, dtype=np.uint32)
+        remapped = array("I")
+        remapped.frombytes(
+            old_to_new_np[np.frombuffer(indices, dtype=np.uint32)].tobytes()
+        )
+        return remapped
+
+    return array("I", [old_to_new[i] for i in indices])
+
+
+class _Columns:
+    """Snapshot of the columns of a :class:`Consolidator`,
+    shared by the views generated by :meth:`Consolidator.generate_col`.
+    """
+
+    __slots__ = (
+        "timestamps",
+        "durations",
+        "window_starts",
+        "window_ends",
+        "window_is",
+        "path_is",
+        "title_is",
+        "is_active",
+        "paths",
+        "titles",
+        "window_views",
+        "last_range",
+        "last_windows_view",
+    )
+
+    window_views: dict[int, _WindowView]
+    """View of every window accessed so far, by window dictionary index."""
+    last_range: tuple[int, int]
+    """Range of `window_is` of the last windows view created."""
+    last_windows_view: tuple[_WindowView, ...]
+
+    def __init__(self, consolidator: Consolidator):
+        self.timestamps = consolidator._timestamps
+        self.durations = consolidator._durations
+        self.window_starts = consolidator._window_starts
+        self.window_ends = consolidator._window_ends
+        self.window_is = consolidator._window_is
+        self.path_is = consolidator._window_cd.path_is
+        self.title_is = consolidator._window_cd.title_is
+        self.is_active = consolidator._window_cd.is_active
+        self.paths = consolidator._path_cd.values
+        self.titles = consolidator._title_cd.values
+        self.window_views = {}
+        self.last_range = (0, 0)
+        self.last_windows_view = ()
+
+    def get_windows_view(self, start: int, end: int) -> tuple[_WindowView, ...]:
+        """Get the views of the windows of `window_is` from `start` to `end`.
+
+        Window views are shared by all the entries, and the windows
+        view is reused by consecutive entries sharing their windows.
+        """
+        if (start, end) == self.last_range:
+            return self.last_windows_view
+
+        window_views = self.window_views
+        windows_view = []
+        for w in self.window_is[start:end]:
+            view = window_views.get(w)
+            if view is None:
+                view = window_views[w] = _WindowView(self, w)
+            windows_view.append(view)
+
+        self.last_range = (start, end)
+        self.last_windows_view = tuple(windows_view)
+        return self.last_windows_view
+
+    def iter_window_blocks(
+        self, n_entries: int
+    ) -> Iterator[tuple[int, int, list[tuple[int, int, bool]]]]:
+        """Generate the :data:`~.consolidated_owl_logs.WindowBlocks`
+        of the first `n_entries` entries, directly from the columns.
+
+        Consecutive entries sharing their range of `window_is`
+        are in the same block.
+        """
+        if not n_entries:
+            return
+
+        window_starts = self.window_starts
+        window_ends = self.window_ends
+        if np is not None:
+            starts_np = np.frombuffer(window_starts, dtype=np.uint64)[:n_entries]
+            ends_np = np.frombuffer(window_ends, dtype=np.uint64)[:n_entries]
+            changes = np.flatnonzero(
+                (starts_np[1:] != starts_np[:-1]) | (ends_np[1:] != ends_np[:-1])
+            )
+            block_starts = [0, *(changes + 1).tolist()]
+            # Release the buffers, so the columns can still be appended to
+            del starts_np, ends_np
         else:
-            duration_since_last_input = None
+            block_starts = [0]
+            for i in range(1, n_entries):
+                if (
+                    window_starts[i] != window_starts[i - 1]
+                    or window_ends[i] != window_ends[i - 1]
+                ):
+                    block_starts.append(i)
+        block_starts.append(n_entries)
+
+        path_is = self.path_is
+        title_is = self.title_is
+        is_active = self.is_active
+        window_is = self.window_is
+        for block_start, block_end in zip(block_starts, block_starts[1:]):
+            yield block_start, block_end, [
+                (path_is[w], title_is[w], bool(is_active[w]))
+                for w in window_is[
+                    window_starts[block_start] : window_ends[block_start]
+                ]
+            ]
+
+
+class _WindowView(WindowBase):
+    _columns: _Columns
+    _i: int
+    """Window dictionary index."""
+
+    __slots__ = ("_columns", "_i")
+
+    def __init__(self, columns: _Columns, i: int):
+        self._columns = columns
+        self._i = i
 
-        entry_windows = entry.get("windows")
-        if entry_windows:
-            for w in entry_windows:
-                windows.append(_Window.from_window_data(w, path_cd, title_cd))
+    @property
+    def path(self) -> str:
+        return self._columns.paths[self._columns.path_is[self._i]]
 
-        return cls(timestamp, windows, duration_since_last_input)
+    @property
+    def title(self) -> str:
+        return self._columns.titles[self._columns.title_is[self._i]]
 
     @property
-    def timestamp(self):
-        """Timestamp when the entry was recorded."""
-        return self._timestamp
+    def is_active(self) -> bool:
+        return bool(self._columns.is_active[self._i])
+
+
+class _EntryView(EntryBase):
+    _columns: _Columns
+    _i: int
+
+    __slots__ = ("_columns", "_i")
+
+    def __init__(self, columns: _Columns, i: int):
+        self._columns = columns
+        self._i = i
+
+    @property
+    def timestamp(self) -> int:
+        return self._columns.timestamps[self._i]
 
     @property
     def duration_since_last_input(self):
-        """Duration since last user input."""
-        return self._duration_since_last_input
+        duration = self._columns.durations[self._i]
+        if duration == _NO_DURATION:
+            return None
+        return duration
 
     @property
-    def windows(self):
-        """Windows captured."""
-        return self._windows
+    def windows_view(self) -> tuple[_WindowView, ...]:
+        columns = self._columns
+        return columns.get_windows_view(
+            columns.window_starts[self._i], columns.window_ends[self._i]
+        )
+
+
+class _EntryViews(Sequence[EntryBase]):
+    """Entries of :meth:`Consolidator.generate_col`,
+    whose views are created when they are accessed."""
+
+    _columns: _Columns
+    _len: int
+
+    __slots__ = ("_columns", "_len")
+
+    def __init__(self, columns: _Columns, n_entries: int):
+        self._columns = columns
+        self._len = n_entries
+
+    def __len__(self) -> int:
+        return self._len
+
+    @overload
+    def __getitem__(self, i: int) -> _EntryView: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[_EntryView]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [_EntryView(self._columns, j) for j in range(*i.indices(self._len))]
+        if i < 0:
+            i += self._len
+        if i < 0 or i >= self._len:
+            raise IndexError("Entry index out of range.")
+        return _EntryView(self._columns, i)
+
+    def __iter__(self) -> Iterator[_EntryView]:
+        columns = self._columns
+        for i in range(self._len):
+            yield _EntryView(columns, i)
 
 
 class ConsolidatedOwlLogsSerialized(TypedDict):
@@ -392,6 +1495,9 @@ class ConsolidatedOwlLogsSerialized(TypedDict):
 
     version: str
     dictionaries: list[_ColsDictionaryData]
+    rollups: Optional[_RollupsData]
+    """Rollups of the foreground durations by path index,
+    see :meth:`Consolidator.serialize`."""
     entries: list[_ColsEntryData]
 
 
@@ -399,7 +1505,13 @@ class _ColsDictionaryData(TypedDict):
     """Consolidated owl logs dictionary data."""
 
     name: str
-    set: list[str]
+    set: list
+    """Paths or titles, or the :class:`_ColsWindowData`
+    of the "windows[]" dictionary."""
+    suffixes: Optional[list[str]]
+    """Suffixes shared by the titles, see :data:`COMPACT_VERSION`."""
+    suffixIndexes: Optional[list[int]]
+    """Index of the suffix of every title, or -1."""
 
 
 class _ColsEntryData(TypedDict):
@@ -407,7 +1519,12 @@ class _ColsEntryData(TypedDict):
 
     time: int
     durationSinceLastInput: Optional[int]
-    windows: Optional[list[_ColsWindowData]]
+    windows: Optional[list]
+    """Windows as :class:`_ColsWindowData`, or as indexes
+    of the "windows[]" dictionary if there is one."""
+    windowsSplice: Optional[list]
+    """Change of the windows since the previous entry,
+    see :data:`COMPACT_VERSION`."""
 
 
 class _ColsWindowData(TypedDict):
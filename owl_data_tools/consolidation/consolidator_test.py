@@ -1,9 +1,16 @@
+import io
+import json
+import pickle
+import random
+from pathlib import Path
+
 import pytest
 
 from ..exceptions import OwlError
 from .consolidator_test_objects import SERIALIZATION_TEST_OBJECTS
 from .test_utils import compare_entry
-from .consolidator import Consolidator
+from . import consolidator as consolidator_module
+from .consolidator import COMPACT_VERSION, Consolidator
 from ..types import Entry, EntryData, Window, WindowData
 
 from ..version import VERSION
@@ -15,6 +22,7 @@ PATHS: list[str] = [
     "/program/3.exe",
 ]
 TITLES: list[str] = ["Zero", "One", "Two", "Three"]
+SPECIFICATION_DIR = Path(__file__).parents[2] / "specifications" / "colf"
 
 
 def window_data_mock(i: int, active=False) -> WindowData:
@@ -113,6 +121,96 @@ def test_unsorted_entry_error():
         consolidator.append_entry({"timestamp": 50})  # type: ignore
 
 
+def test_unsorted_serialized_error():
+    january = Consolidator()
+    january.append_entry({"timestamp": 100})  # type: ignore
+    february = Consolidator()
+    february.append_entry({"timestamp": 200})  # type: ignore
+
+    with pytest.raises(OwlError):
+        february.append_from_serialized(january.serialize())
+    with pytest.raises(OwlError):
+        february.append_from_consolidator(january)
+
+
+def test_merge_from_serialized():
+    entries: list[EntryData] = [
+        {"timestamp": i, "windows": [window_data_mock(i % 4, i % 3 == 0)]}
+        for i in range(12)
+    ]  # type: ignore
+    consolidator_reference = Consolidator()
+    consolidator_reference.append_entries(entries)
+
+    january = Consolidator()
+    january.append_entries(entries[::2])
+    february = Consolidator()
+    february.append_entries(entries[1::2])
+
+    february.merge_from_serialized(january.serialize())
+    assert february.serialize() == consolidator_reference.serialize()
+
+    # Without deduplication, overlapping entries are all kept.
+    february.merge_from_serialized(january.serialize())
+    assert len(february.serialize()["entries"]) == 18
+
+
+def test_merge_deduplicate():
+    entries: list[EntryData] = [
+        {"timestamp": 0, "windows": [window_data_mock(0)]},
+        {"timestamp": 1, "windows": [window_data_mock(1), window_data_mock(2)]},
+        {"timestamp": 1, "windows": [window_data_mock(2)]},
+        {"timestamp": 2, "windows": [window_data_mock(2)]},
+        {"timestamp": 3, "windows": [window_data_mock(3, True)]},
+    ]  # type: ignore
+    consolidator_reference = Consolidator()
+    consolidator_reference.append_entries(entries)
+
+    # Overlapping backups, one of them with duplicates of its own.
+    backup_1 = Consolidator()
+    backup_1.append_entries(entries[:4] + entries[3:4])
+    backup_2 = Consolidator()
+    backup_2.append_entries(entries[1:])
+
+    consolidator = Consolidator(deduplicate=True)
+    consolidator.append_from_consolidator(backup_1)
+    consolidator.merge_from_serialized(backup_2.serialize())
+    consolidator.merge_from_consolidators([backup_1, backup_2])
+    assert consolidator.serialize() == consolidator_reference.serialize()
+
+    # Uses of dropped entries are not counted.
+    counts = consolidator._window_cd.generate_counts_list()
+    assert sum(counts) == sum(len(e.get("windows", [])) for e in entries)
+
+    # An entry sharing the windows of a dropped duplicate keeps its windows.
+    existing: list[EntryData] = [
+        {"timestamp": 1, "windows": [window_data_mock(0)]},
+        {"timestamp": 1, "windows": [window_data_mock(1)]},
+    ]  # type: ignore
+    source = Consolidator()
+    source.append_entries(
+        [
+            {"timestamp": 1, "windows": [window_data_mock(0)]},
+            {"timestamp": 2, "windows": [window_data_mock(0)]},
+        ]  # type: ignore
+    )
+    consolidator_reference = Consolidator()
+    consolidator_reference.append_entries(
+        existing + [{"timestamp": 2, "windows": [window_data_mock(0)]}]  # type: ignore
+    )
+
+    appends = [
+        lambda c: c.append_from_consolidators([source]),
+        lambda c: c.merge_from_consolidators([source]),
+        lambda c: c.append_from_serialized(source.serialize(compact=True)),
+        lambda c: c.merge_from_serialized(source.serialize(compact=True)),
+    ]
+    for append in appends:
+        consolidator = Consolidator(deduplicate=True)
+        consolidator.append_entries(existing)
+        append(consolidator)
+        assert consolidator.serialize() == consolidator_reference.serialize()
+
+
 def test_empty():
     consolidator_1 = Consolidator()
     consolidator_2 = Consolidator()
@@ -120,3 +218,554 @@ def test_empty():
     consolidator_2.append_from_serialized(consolidator_1.serialize())
 
     assert consolidator_1.serialize() == consolidator_2.serialize()
+
+
+def test_append_from_consolidator():
+    consolidator_reference = Consolidator()
+    consolidator_merger = Consolidator()
+
+    for test_obj in SERIALIZATION_TEST_OBJECTS:
+        consolidator_reference.append_entries(test_obj["before"])
+
+        consolidator = Consolidator()
+        consolidator.append_entries(test_obj["before"])
+        consolidator.optimize()
+        serialized = consolidator.serialize()
+
+        consolidator_merger.append_from_consolidator(consolidator)
+        assert consolidator.serialize() == serialized
+
+    assert consolidator_merger.serialize() == consolidator_reference.serialize()
+
+
+def test_append_from_consolidators_interleaved():
+    entries = SERIALIZATION_TEST_OBJECTS[0]["before"] + [
+        {"timestamp": 100001, "windows": [window_data_mock(3)]},  # type: ignore
+        {"timestamp": 100003, "windows": [window_data_mock(0, True)]},  # type: ignore
+    ]
+    sorted_entries = sorted(entries, key=lambda e: e["timestamp"])
+
+    consolidator_reference = Consolidator()
+    consolidator_reference.append_entries(sorted_entries)
+
+    consolidator_1 = Consolidator()
+    consolidator_1.append_entries(entries[:3])
+    consolidator_2 = Consolidator()
+    consolidator_2.append_entries(entries[3:])
+
+    consolidator_merger = Consolidator()
+    consolidator_merger.append_from_consolidators([consolidator_1, consolidator_2])
+
+    assert consolidator_merger.serialize() == consolidator_reference.serialize()
+
+
+@pytest.mark.parametrize("deduplicate", [False, True])
+def test_append_from_consolidators_runs(monkeypatch, deduplicate: bool):
+    pytest.importorskip("numpy")
+
+    rng = random.Random(3)
+    consolidators = []
+    for start in [500, 0, 200, 250, 1000]:
+        windows = []
+        entries: list[EntryData] = []
+        for i in range(200):
+            if rng.random() < 0.3:
+                windows = [window_data_mock(rng.randrange(4)) for _ in range(2)]
+            timestamp = start + i // 2 if start == 250 else start + i
+            entries.append({"timestamp": timestamp, "windows": windows})  # type: ignore
+        consolidator = Consolidator()
+        consolidator.append_entries(entries)
+        consolidators.append(consolidator)
+    # Runs overlapping in time, and runs of duplicates.
+    consolidators.append(pickle.loads(pickle.dumps(consolidators[2])))
+
+    consolidator = Consolidator(deduplicate)
+    consolidator.append_from_consolidators(consolidators)
+    monkeypatch.setattr(consolidator_module, "np", None)
+    consolidator_reference = Consolidator(deduplicate)
+    consolidator_reference.append_from_consolidators(consolidators)
+
+    assert list(consolidator._window_starts) == list(
+        consolidator_reference._window_starts
+    )
+    assert (
+        consolidator._window_cd.generate_counts_list()
+        == consolidator_reference._window_cd.generate_counts_list()
+    )
+    assert consolidator.serialize() == consolidator_reference.serialize()
+
+
+def test_write_serialized():
+    consolidators = [Consolidator()]
+    for test_obj in SERIALIZATION_TEST_OBJECTS:
+        consolidator = Consolidator()
+        consolidator.append_entries(test_obj["before"])
+        consolidators.append(consolidator)
+
+    for consolidator in consolidators:
+        expected = json.dumps(consolidator.serialize())
+
+        for chunk_size in (1, 2, 1000):
+            files = [io.StringIO(), io.StringIO()]
+            consolidator.write_serialized(files, chunk_size=chunk_size)
+            assert [f.getvalue() for f in files] == [expected, expected]
+
+
+def test_views_survive_optimize():
+    entries = SERIALIZATION_TEST_OBJECTS[0]["before"]
+
+    consolidator = Consolidator()
+    consolidator.append_entries(entries)
+    entries_view = consolidator.generate_col().get_entries_view(0, 999999)
+
+    consolidator.optimize()
+    entries_view_optimized = consolidator.generate_col().get_entries_view(0, 999999)
+
+    assert len(entries_view) == len(entries)
+    for i in range(len(entries)):
+        assert compare_entry(entries_view[i], entries_view_optimized[i])
+        assert entries_view[i].duration_since_last_input == entries[i].get(
+            "durationSinceLastUserInput"
+        )
+
+
+def test_lazy_views():
+    windows = [window_data_mock(0), window_data_mock(1, True)]
+    entries: list[EntryData] = [
+        {"timestamp": 0, "windows": windows},
+        {"timestamp": 1, "windows": windows},
+        {"timestamp": 2, "windows": windows[1:]},
+    ]  # type: ignore
+
+    consolidator = Consolidator()
+    consolidator.append_entries(entries)
+    col = consolidator.generate_col()
+    view = col.get_entries_view(0, 2)
+
+    assert [entry.timestamp for entry in view] == [0, 1, 2]
+    assert col.get_time_range() == (0, 2)
+    assert view[0].windows_view is view[1].windows_view
+    assert view[2].windows_view[0] is view[0].windows_view[1]
+    assert [w.title for w in view[0].windows_view] == TITLES[:2]
+
+    # Repeated traversals are identical.
+    assert [
+        [(w.path, w.title, w.is_active) for w in entry.windows_view] for entry in view
+    ] == [
+        [(w.path, w.title, w.is_active) for w in entry.windows_view]
+        for entry in reversed(view)
+    ][
+        ::-1
+    ]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_optimize_numpy_fallback(monkeypatch, use_numpy: bool):
+    rng = random.Random(0)
+    entries: list[EntryData] = [
+        {  # type: ignore
+            "timestamp": i,
+            "windows": [window_data_mock(rng.randrange(4)) for _ in range(3)],
+        }
+        for i in range(200)
+    ]
+
+    consolidator_reference = Consolidator()
+    consolidator_reference.append_entries(entries)
+    monkeypatch.setattr(consolidator_module, "np", None)
+    serialized_reference = consolidator_reference.serialize()
+    monkeypatch.undo()
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(consolidator_module, "np", None)
+
+    consolidator = Consolidator()
+    consolidator.append_entries(entries)
+    assert consolidator.serialize() == serialized_reference
+
+    # Optimizing an already optimized order.
+    consolidator.append_entries(entries[-1:])
+    consolidator_reference.append_entries(entries[-1:])
+    monkeypatch.undo()
+    assert consolidator.serialize() == consolidator_reference.serialize()
+
+
+def test_dictionary_counts():
+    rng = random.Random(1)
+    entries: list[EntryData] = [
+        {  # type: ignore
+            "timestamp": i,
+            "windows": [window_data_mock(rng.randrange(4)) for _ in range(2)],
+        }
+        for i in range(50)
+    ]
+
+    consolidator = Consolidator()
+    consolidator.append_entries(entries[:20])
+    consolidator.optimize()
+    consolidator.merge_from_serialized(consolidator.serialize())
+    other = Consolidator()
+    other.append_entries(entries[20:])
+    consolidator.append_from_consolidator(other)
+
+    for optimize in [False, True]:
+        if optimize:
+            consolidator.optimize()
+
+        counts = consolidator._window_cd.generate_counts_list()
+        used = [
+            consolidator._window_is[j]
+            for start, end in zip(
+                consolidator._window_starts, consolidator._window_ends
+            )
+            for j in range(start, end)
+        ]
+        assert counts == [used.count(i) for i in range(len(counts))]
+
+
+def test_append_own_serialized(monkeypatch):
+    entries: list[EntryData] = [
+        {  # type: ignore
+            "timestamp": i,
+            "windows": [window_data_mock(i % 4, i % 3 == 0), window_data_mock(i % 2)],
+        }
+        for i in range(40)
+    ]
+    consolidator_reference = Consolidator()
+    consolidator_reference.append_entries(entries)
+    serialized = consolidator_reference.serialize(optimize=False)
+
+    # The dictionaries of the serialized data extend the consolidator's,
+    # so its windows are known by their serialized indexes.
+    consolidator = Consolidator()
+    consolidator.append_entries(entries[:20])
+    window_cd = consolidator._window_cd
+    n_windows = window_cd.size
+    monkeypatch.setattr(window_cd, "use_value", None)
+    consolidator.append_serialized_entries(
+        serialized["dictionaries"],
+        [e for e in serialized["entries"] if e["time"] >= 20],
+    )
+    monkeypatch.undo()
+
+    assert window_cd.size == n_windows
+    assert consolidator.serialize() == consolidator_reference.serialize()
+    assert sum(window_cd.generate_counts_list()) == 2 * len(entries)
+
+
+def test_shared_windows():
+    windows = [window_data_mock(0), window_data_mock(1, True)]
+    consolidator = Consolidator()
+    consolidator.append_entries(
+        [
+            {"timestamp": 0, "windows": windows},  # type: ignore
+            {"timestamp": 1, "windows": list(windows)},  # type: ignore
+            {"timestamp": 2, "windows": windows[:1]},  # type: ignore
+            {"timestamp": 3, "windows": windows[:1]},  # type: ignore
+        ]
+    )
+
+    assert len(consolidator._window_is) == 3
+    assert consolidator._window_cd.generate_counts_list() == [4, 2]
+
+    entries = consolidator.generate_col().get_entries_view(0, 3)
+    assert [len(e.windows_view) for e in entries] == [2, 2, 1, 1]
+    assert entries[1].windows_view[1].is_active
+
+
+def test_serialize_compact():
+    consolidator = Consolidator()
+    consolidator.append_entries(
+        [
+            {"timestamp": 0, "windows": [window_data_mock(0), window_data_mock(1)]},
+            {"timestamp": 1, "windows": [window_data_mock(0), window_data_mock(1)]},
+            {
+                "timestamp": 2,
+                "windows": [
+                    window_data_mock(0),
+                    window_data_mock(2, True),
+                    window_data_mock(1),
+                ],
+            },
+            {"timestamp": 3, "windows": [window_data_mock(3)]},
+            {"timestamp": 4, "windows": []},
+            {"timestamp": 5, "durationSinceLastUserInput": 3},
+        ]  # type: ignore
+    )
+
+    serialized = consolidator.serialize(compact=True)
+    assert serialized["version"] == ".".join(map(str, COMPACT_VERSION))
+    assert serialized["dictionaries"][2] == {
+        "name": "windows[]",
+        "set": [
+            {"title": 0, "path": 0},
+            {"title": 1, "path": 1},
+            {"title": 2, "path": 2, "isActive": True},
+            {"title": 3, "path": 3},
+        ],
+    }
+    assert serialized["entries"] == [
+        {"time": 0, "windows": [0, 1]},
+        {"time": 1},
+        {"time": 2, "windowsSplice": [1, 0, [2]]},
+        {"time": 3, "windows": [3]},
+        {"time": 4, "windows": []},
+        {"time": 5, "durationSinceLastInput": 3},
+    ]
+
+    buffer = io.StringIO()
+    consolidator.write_serialized([buffer], compact=True)
+    assert buffer.getvalue() == json.dumps(serialized)
+
+    consolidator_copy = Consolidator()
+    consolidator_copy.append_from_serialized(serialized)
+    assert consolidator_copy.serialize() == consolidator.serialize()
+    assert len(consolidator_copy._window_is) == len(consolidator._window_is)
+
+
+def test_compact_title_suffixes():
+    titles = [
+        "a.py - project - Visual Studio Code",
+        "b.py - project - Visual Studio Code",
+        "c.py - other - Visual Studio Code",
+        "Inbox - Google Chrome",
+        "New Tab - Google Chrome",
+        "Task Manager",
+        "Only - One",
+    ]
+    consolidator = Consolidator()
+    consolidator.append_entries(
+        [
+            {"timestamp": i, "windows": [{"path": PATHS[0], "title": title}]}
+            for i, title in enumerate(titles)
+        ]  # type: ignore
+    )
+
+    serialized = consolidator.serialize(compact=True)
+    assert serialized["dictionaries"][1] == {
+        "name": "windows[].title",
+        "suffixes": [
+            " - project - Visual Studio Code",
+            " - Visual Studio Code",
+            " - Google Chrome",
+        ],
+        "suffixIndexes": [0, 0, 1, 2, 2, -1, -1],
+        "set": [
+            "a.py",
+            "b.py",
+            "c.py - other",
+            "Inbox",
+            "New Tab",
+            "Task Manager",
+            "Only - One",
+        ],
+    }
+
+    consolidator_copy = Consolidator()
+    consolidator_copy.append_from_serialized(json.loads(json.dumps(serialized)))
+    assert consolidator_copy.serialize() == consolidator.serialize()
+
+
+def test_compact_round_trip():
+    consolidator_reference = Consolidator()
+    consolidator_merger = Consolidator()
+
+    for test_obj in SERIALIZATION_TEST_OBJECTS:
+        consolidator_reference.append_entries(test_obj["before"])
+
+        consolidator = Consolidator()
+        consolidator.append_entries(test_obj["before"])
+        consolidator_merger.append_from_serialized(consolidator.serialize(compact=True))
+
+        consolidator_copy = Consolidator()
+        consolidator_copy.append_from_serialized(consolidator.serialize(compact=True))
+        assert consolidator_copy.serialize() == consolidator.serialize()
+
+        consolidator_merged = Consolidator()
+        consolidator_merged.append_from_consolidators([consolidator_copy])
+        assert consolidator_merged.serialize(compact=True) == consolidator.serialize(
+            compact=True
+        )
+
+    assert consolidator_merger.serialize() == consolidator_reference.serialize()
+
+
+def test_compact_titles():
+    rng = random.Random(2)
+    entries: list[EntryData] = [
+        {  # type: ignore
+            "timestamp": i,
+            "windows": [
+                {
+                    "path": PATHS[rng.randrange(4)],
+                    "title": f"Título {rng.randrange(30)}",
+                }
+                for _ in range(rng.randrange(4))
+            ],
+        }
+        for i in range(200)
+    ]
+    other = Consolidator()
+    other.append_entries(entries[150:])
+
+    def consolidate(consolidator: Consolidator) -> Consolidator:
+        consolidator.append_entries(entries[:50])
+        consolidator.optimize()
+        consolidator.append_entries(entries[50:100])
+        consolidator.merge_from_serialized(
+            {**other.serialize(compact=True), "entries": []}  # type: ignore
+        )
+        consolidator.append_entries(entries[100:150])
+        consolidator.append_from_consolidator(pickle.loads(pickle.dumps(other)))
+        return pickle.loads(pickle.dumps(consolidator))
+
+    consolidator_reference = consolidate(Consolidator())
+    consolidator = consolidate(Consolidator(compact_titles=True))
+
+    assert consolidator.serialize() == consolidator_reference.serialize()
+    assert consolidator.serialize(compact=True) == consolidator_reference.serialize(
+        compact=True
+    )
+    view = consolidator.generate_col().get_entries_view(0, 200)
+    view_reference = consolidator_reference.generate_col().get_entries_view(0, 200)
+    assert len(view) == len(view_reference) == 200
+    for i in range(len(view)):
+        assert compare_entry(view[i], view_reference[i])
+
+    # Compact titles as the source of a merge.
+    consolidator_merged = Consolidator()
+    consolidator_merged.append_from_consolidator(consolidator)
+    assert consolidator_merged.serialize() == consolidator_reference.serialize()
+
+
+def test_rollups():
+    consolidator = Consolidator()
+    for i in range(1000):
+        consolidator.append_entry(
+            {  # type: ignore
+                "timestamp": 1_700_000_000 + i * 37,
+                "windows": [window_data_mock(i % 3 // 2, True), window_data_mock(3)],
+            }
+        )
+    assert "rollups" not in consolidator.serialize()
+
+    serialized = consolidator.serialize(rollups=True)
+    rollups = serialized["rollups"]
+    assert rollups == consolidator.generate_col().get_rollups().serialize()
+    assert list(serialized) == ["version", "dictionaries", "rollups", "entries"]
+
+    buffer = io.StringIO()
+    consolidator.write_serialized([buffer], rollups=True)
+    assert json.loads(buffer.getvalue()) == serialized
+
+    # The loaded rollups are used, with the indexes of the loaded paths.
+    loaded = Consolidator()
+    loaded.append_from_serialized(serialized)
+    col = loaded.generate_col()
+    assert col._rollups is loaded._rollups is not None
+    assert (
+        col.get_total_durations() == consolidator.generate_col().get_total_durations()
+    )
+
+    # Until other entries are appended.
+    loaded.append_entry({"timestamp": 1_800_000_000})  # type: ignore
+    assert loaded._rollups is None
+
+    # Not loaded into a consolidator that is not empty.
+    other = Consolidator()
+    other.append_entry(
+        {"timestamp": 0, "windows": [window_data_mock(2, True)]}  # type: ignore
+    )
+    other.append_from_serialized(serialized)
+    assert other._rollups is None
+
+    # Nor kept once other entries are merged.
+    loaded = Consolidator()
+    loaded.append_from_serialized(serialized)
+    loaded.merge_from_consolidators([other])
+    assert loaded._rollups is None
+    assert not loaded._optimized
+
+
+def test_rollups_optimize():
+    serialized = {
+        "version": "0.0.0",
+        "dictionaries": [
+            {"name": "windows[].path", "set": PATHS[:2]},
+            {"name": "windows[].title", "set": ["Zero", "One"]},
+        ],
+        "rollups": {
+            "maxDuration": 60,
+            "levels": [
+                {
+                    "resolution": 3600,
+                    "origin": 0,
+                    "keys": [0, 1],
+                    "starts": [[0], [0]],
+                    "durations": [[60], [120]],
+                }
+            ],
+        },
+        "entries": [
+            {"time": 0, "windows": [{"path": 1, "title": 1, "isActive": True}]},
+            {"time": 60},
+            {"time": 120, "windows": [{"path": 0, "title": 0, "isActive": True}]},
+            {"time": 180, "windows": [{"path": 0, "title": 0, "isActive": True}]},
+        ],
+    }
+    consolidator = Consolidator()
+    consolidator.append_from_serialized(serialized)  # type: ignore
+    assert consolidator._path_cd.index_of(PATHS[1]) == 0
+
+    # The paths are reordered by their uses.
+    consolidator.optimize()
+    assert consolidator._path_cd.index_of(PATHS[0]) == 0
+    assert consolidator.generate_col().get_rollups().levels[0].get_durations() == {
+        consolidator._path_cd.index_of(PATHS[0]): {0: 60},
+        consolidator._path_cd.index_of(PATHS[1]): {0: 120},
+    }
+
+
+def test_view_slots():
+    consolidator = Consolidator()
+    consolidator.append_entry(
+        {"timestamp": 0, "windows": [window_data_mock(0, True)]}  # type: ignore
+    )
+    entries = consolidator.generate_col().get_entries_view(0, 0)
+    entry = entries[0]
+
+    for obj in (entries, entry, entry.windows_view[0], entries._items):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.undeclared = 1  # type: ignore
+
+
+def test_schema():
+    jsonschema = pytest.importorskip("jsonschema")
+    schema = json.loads((SPECIFICATION_DIR / "colf.schema.json").read_text("utf-8"))
+    validator = jsonschema.Draft202012Validator(schema)
+
+    for path in sorted(SPECIFICATION_DIR.glob("colf-example-*.json")):
+        serialized = json.loads(path.read_text("utf-8"))
+        validator.validate(serialized)
+        Consolidator().append_from_serialized(serialized)
+
+    consolidator = Consolidator()
+    consolidator.append_entries(SERIALIZATION_TEST_OBJECTS[0]["before"])
+    validator.validate(consolidator.serialize())
+    validator.validate(consolidator.serialize(compact=True))
+
+    # Titles split off their shared suffixes can repeat.
+    consolidator = Consolidator()
+    for i, title in enumerate(["a - Code", "a - Browser", "b - Code", "b - Browser"]):
+        window = {"path": "/a", "title": title, "isActive": True}
+        consolidator.append_entry({"timestamp": i, "windows": [window]})  # type: ignore
+    serialized = consolidator.serialize(compact=True)
+    assert "suffixes" in serialized["dictionaries"][1]
+    validator.validate(serialized)
+
+    serialized = consolidator.serialize(rollups=True)
+    assert serialized["rollups"]["levels"][0]["keys"] == [0]
+    validator.validate(serialized)
@@ -1,7 +1,21 @@
-from typing import Optional, Sequence
+from __future__ import annotations
+from array import array
+from collections import Counter
+from typing import Generic, Hashable, Iterable, Optional, Sequence, TypeVar, overload
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
 
-class Dictionary:
+V = TypeVar("V", bound=Hashable)
+"""Type of the values of a dictionary, typically `str`."""
+
+_BULK_COUNT_MIN = 256
+"""Minimum number of indices counted in bulk by :meth:`Dictionary.count_uses`."""
+
+
+class Dictionary(Generic[V]):
     """A wrapper of a dictionary intended to store values and
     their index. This class is used to reduce redundant data
     being stored in memory/file.
@@ -10,10 +24,10 @@ class Dictionary:
     as input, and returns a unique number representing it.
 
     In order to get the value represented by a number, you will
-    need to get the list of values in the dictionary by calling
-    :meth:`generate_values_list`, and using the unique number
-    as index for the list. See the examples below for more
-    clarity.
+    need to get the list of values in the dictionary from
+    :attr:`values` or :meth:`generate_values_list`, and use
+    the unique number as index for the list. See the examples
+    below for more clarity.
 
     Examples
     --------
@@ -26,29 +40,63 @@ class Dictionary:
     >>> limbs.append(limb_dict.use_value("leg"))
     >>> print(limbs)
     [0, 1, 1, 2, 2]
-    >>> limbs_list = limb_dict.generate_values_list()
-    >>> print(limb_list[limbs[2]])
+    >>> print(limb_dict.values[limbs[2]])
     arm
     """
 
-    _dict: dict[str, int]
-    _size = 0
+    _dict: dict[V, int]
+    _values: list[V]
+    """Values by index, appended to as values are added."""
+    _counts: list[int]
+    """Number of times every value has been used, by index."""
 
-    def __init__(self, values: Optional[Sequence[str]] = None):
-        """Constructs :class:`Dictionary`"""
-        self._dict = {}
-        if values:
-            for value in values:
-                self._dict[value] = self._size
-                self._size += 1
+    def __init__(
+        self,
+        values: Optional[Sequence[V]] = None,
+        counts: Optional[Sequence[int]] = None,
+    ):
+        """Constructs :class:`Dictionary`
 
-    def use_value(self, value: str) -> int:
+        Parameters
+        ----------
+        values : Optional[Sequence[V]], optional
+            Initial values, by default None
+        counts : Optional[Sequence[int]], optional
+            Number of times each of `values` has already been used,
+            by default 0 for every value.
+        """
+        self._values = list(values) if values else []
+        self._dict = {value: i for i, value in enumerate(self._values)}
+
+        if counts is None:
+            self._counts = [0] * len(self._values)
+        else:
+            self._counts = list(counts)
+
+    def index_of(self, value: V) -> Optional[int]:
+        """Gets the dictionary index for `value`, without
+        creating it or counting a use.
+
+        Parameters
+        ----------
+        value : V
+            Value to look up.
+
+        Returns
+        -------
+        Optional[int]
+            The dictionary index for `value`,
+            or None if it is not in the dictionary.
+        """
+        return self._dict.get(value)
+
+    def use_value(self, value: V) -> int:
         """Gets or creates the unique dictionary index
         for `value`.
 
         Parameters
         ----------
-        value : str
+        value : V
             Value to be referenced from the dictionary.
 
         Returns
@@ -57,61 +105,364 @@ class Dictionary:
             The dictionary index for `value`
         """
 
-        if value in self._dict:
-            return self._dict[value]
+        i = self._dict.get(value)
+        if i is not None:
+            self._counts[i] += 1
+            return i
 
-        self._dict[value] = self._size
-        self._size += 1
+        i = self._dict[value] = len(self._values)
+        self._values.append(value)
+        self._counts.append(1)
 
-        return self._dict[value]
+        return i
 
-    def generate_values_list(self) -> list[str]:
+    def count_uses(self, indices: Iterable[int], n: int = 1):
+        """Counts another use of the values at `indices`,
+        without looking the values up.
+
+        Parameters
+        ----------
+        indices : Iterable[int]
+            Dictionary indices of the used values.
+        n : int, optional
+            Number of uses to count, by default 1.
+            A negative number takes back uses counted before.
+        """
+        counts = self._counts
+        if not isinstance(indices, array) or len(indices) < _BULK_COUNT_MIN:
+            for i in indices:
+                counts[i] += n
+            return
+
+        # One addition per distinct index.
+        distinct_uses: Iterable[tuple[int, int]]
+        if np is not None and indices.typecode == "I":
+            uses = np.bincount(np.frombuffer(indices, dtype=np.uint32))
+            used = np.flatnonzero(uses)
+            distinct_uses = zip(used.tolist(), uses[used].tolist())
+        else:
+            distinct_uses = Counter(indices).items()
+        for i, uses_i in distinct_uses:
+            counts[i] += uses_i * n
+
+    @property
+    def values(self) -> Sequence[V]:
+        """Values that have been used, by index.
+
+        This is the list kept by the dictionary, not a copy, so it grows
+        as new values are used. It must not be modified.
+        """
+        return self._values
+
+    def generate_values_list(self) -> list[V]:
         """Generates a list of values that has been used.
+        Unlike :attr:`values`, the list is a copy.
 
         Returns
         -------
-        list[str]
+        list[V]
             List of values
         """
-        values = [""] * self._size
-        for value, index in self._dict.items():
-            values[index] = value
+        return list(self._values)
 
-        return values
+    def generate_counts_list(self) -> list[int]:
+        """Generates a list of the number of times every value has
+        been used, in the same order as :meth:`generate_values_list`.
+
+        Returns
+        -------
+        list[int]
+            List of counts
+        """
+        return list(self._counts)
+
+    def reordered(self, order: Sequence[int]) -> Dictionary[V]:
+        """Create a copy of the dictionary with its values
+        and counts in `order`.
+
+        Parameters
+        ----------
+        order : Sequence[int]
+            Current index of the value at every new index.
+
+        Returns
+        -------
+        Dictionary[V]
+            Reordered dictionary.
+        """
+        values = self._values
+        counts = self._counts
+        return Dictionary([values[i] for i in order], [counts[i] for i in order])
 
     @property
     def size(self) -> int:
         """Number of values in the dictionary."""
-        return self._size
+        return len(self._counts)
+
+
+class CompactDictionary(Dictionary[str]):
+    """A :class:`Dictionary` of strings, stored in one contiguous
+    UTF-8 buffer, with the offsets of every value and an open
+    addressing hash index in arrays.
+
+    Every value costs close to its UTF-8 size, instead of a `str`
+    object, a `dict` entry and a `list` slot, which adds up with
+    millions of distinct values, e.g. window titles. In exchange,
+    values are slower to look up, and are decoded when accessed.
+    """
+
+    _arena: bytearray
+    """UTF-8 encoded values, one after another."""
+    _starts: array[int]
+    """Start offset of every value in :attr:`_arena`, by index."""
+    _ends: array[int]
+    """End offset of every value in :attr:`_arena`, by index."""
+    _table: array[int]
+    """Hash index of the values, with -1 for the empty slots.
+    Never more than half full."""
+
+    def __init__(
+        self,
+        values: Optional[Sequence[str]] = None,
+        counts: Optional[Sequence[int]] = None,
+    ):
+        """Constructs :class:`CompactDictionary`
+
+        Parameters
+        ----------
+        values : Optional[Sequence[str]], optional
+            Initial values, by default None
+        counts : Optional[Sequence[int]], optional
+            Number of times each of `values` has already been used,
+            by default 0 for every value.
+        """
+        super().__init__()
+        self._arena = bytearray()
+        self._starts = array("Q")
+        self._ends = array("Q")
+        self._counts = array("q")  # type: ignore
+
+        # Every initial value is kept, even a duplicate, like `Dictionary`.
+        for value in values or []:
+            self._starts.append(len(self._arena))
+            self._arena += value.encode()
+            self._ends.append(len(self._arena))
+        self._rebuild_table(max(8, 1 << (2 * len(self._starts)).bit_length()))
+        if counts is None:
+            self._counts = array("q", [0]) * len(self._starts)  # type: ignore
+        else:
+            self._counts = array("q", counts)  # type: ignore
+
+    def _find(self, encoded: bytes) -> tuple[int, int]:
+        """Find `encoded` in the hash index.
+
+        Returns
+        -------
+        tuple[int, int]
+            Slot of the hash index, and the index of the value,
+            or -1 if the value is not in the dictionary.
+        """
+        table = self._table
+        mask = len(table) - 1
+        slot = hash(encoded) & mask
+        while True:
+            i = table[slot]
+            if i < 0 or self._arena[self._starts[i] : self._ends[i]] == encoded:
+                return slot, i
+            slot = (slot + 1) & mask
+
+    def _rebuild_table(self, n_slots: int):
+        """Rebuild the hash index with `n_slots` slots, a power of 2.
+        The last index of a duplicate value is indexed, like `Dictionary`."""
+        table = self._table = array("i", [-1]) * n_slots
+        mask = n_slots - 1
+        arena = self._arena
+        starts = self._starts
+        ends = self._ends
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            encoded = arena[start:end]
+            slot = hash(bytes(encoded)) & mask
+            while table[slot] >= 0:
+                j = table[slot]
+                if arena[starts[j] : ends[j]] == encoded:
+                    break
+                slot = (slot + 1) & mask
+            table[slot] = i
 
+    def index_of(self, value: str) -> Optional[int]:
+        i = self._find(value.encode())[1]
+        return None if i < 0 else i
 
-class DictionaryMapper:
+    def use_value(self, value: str) -> int:
+        encoded = value.encode()
+        slot, i = self._find(encoded)
+        if i >= 0:
+            self._counts[i] += 1
+            return i
+
+        i = len(self._starts)
+        self._table[slot] = i
+        self._starts.append(len(self._arena))
+        self._arena += encoded
+        self._ends.append(len(self._arena))
+        self._counts.append(1)
+
+        if 2 * len(self._starts) > len(self._table):
+            self._rebuild_table(2 * len(self._table))
+        return i
+
+    @property
+    def values(self) -> Sequence[str]:
+        """Values that have been used, by index, decoded when accessed.
+
+        Like :attr:`Dictionary.values`, it is not a copy,
+        so it grows as new values are used.
+        """
+        return _CompactDictionaryValues(self)
+
+    def generate_values_list(self) -> list[str]:
+        return list(self.values)
+
+    def reordered(self, order: Sequence[int]) -> CompactDictionary:
+        """Create a copy of the dictionary with its values
+        and counts in `order`.
+
+        The encoded values are not copied, the buffer is shared
+        with the copy, which only appends to it.
+
+        Parameters
+        ----------
+        order : Sequence[int]
+            Current index of the value at every new index.
+
+        Returns
+        -------
+        CompactDictionary
+            Reordered dictionary.
+        """
+        dictionary = CompactDictionary()
+        dictionary._arena = self._arena
+        dictionary._starts = array("Q", [self._starts[i] for i in order])
+        dictionary._ends = array("Q", [self._ends[i] for i in order])
+        dictionary._counts = array(  # type: ignore
+            "q", [self._counts[i] for i in order]
+        )
+        dictionary._rebuild_table(len(self._table))
+        return dictionary
+
+    def __getstate__(self) -> dict:
+        # Hashes differ between processes, so the hash index is rebuilt.
+        state = self.__dict__.copy()
+        del state["_table"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._rebuild_table(max(8, 1 << (2 * len(self._starts)).bit_length()))
+
+
+class _CompactDictionaryValues(Sequence[str]):
+    """Values of a :class:`CompactDictionary`, decoded when accessed."""
+
+    __slots__ = ("_dictionary",)
+
+    def __init__(self, dictionary: CompactDictionary):
+        self._dictionary = dictionary
+
+    def __len__(self) -> int:
+        return len(self._dictionary._starts)
+
+    @overload
+    def __getitem__(self, i: int) -> str: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[str]: ...
+
+    def __getitem__(self, i):
+        d = self._dictionary
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return d._arena[d._starts[i] : d._ends[i]].decode()
+
+    def __iter__(self):
+        d = self._dictionary
+        arena = d._arena
+        for start, end in zip(d._starts, d._ends):
+            yield arena[start:end].decode()
+
+
+class DictionaryMapper(Generic[V]):
     """Class to map the indexes of a dictionary to another dictionary.
     Useful when combining multiple dictionaries into one.
+
+    The source values that are already in the target dictionary
+    are mapped upfront, in one pass. The other values are added
+    to the target dictionary when they are first mapped, so they
+    are added in the order they are used.
+
+    With `defer_counts`, the uses of the indexes mapped in bulk by
+    :meth:`sources_to_targets` are counted in batches, one addition
+    per distinct index, rather than one by one.
+    :meth:`count_pending_uses` must be called once done mapping.
     """
 
-    _source_values: Sequence[str]
-    _target_dict: Dictionary
+    _source_values: Sequence[V]
+    _target_dict: Dictionary[V]
+    _target_counts: list[int]
     _source_to_target: list[Optional[int]]
+    _n_unmapped: int
+    """Number of source values that are not in the target dictionary yet."""
+    _is_identity: Optional[bool]
+    _pending_uses: Optional[array[int]]
+    """Target indexes whose uses are not counted yet, if counts are deferred."""
+    _table: Optional[np.ndarray] = None
+    """Target index of every source index, once every source value is mapped."""
 
     def __init__(
-        self, source_dictionary_values: Sequence[str], target_dictionary: Dictionary
+        self,
+        source_dictionary_values: Sequence[V],
+        target_dictionary: Dictionary[V],
+        defer_counts=False,
     ):
         """
         Parameters
         ----------
-        source_dictionary_values : Sequence[str]
+        source_dictionary_values : Sequence[V]
             List of values of the source dictionary.
         target_dictionary : Dictionary
             Target dictionary.
+        defer_counts : bool, optional
+            Count the uses of the indexes mapped in bulk in batches,
+            by default False.
         """
         self._source_values = source_dictionary_values
         self._target_dict = target_dictionary
+        self._target_counts = target_dictionary._counts
+
+        self._source_to_target = list(
+            map(target_dictionary.index_of, self._source_values)
+        )
+        self._n_unmapped = self._source_to_target.count(None)
+
+        self._is_identity = None
+        self._pending_uses = array("I") if defer_counts else None
 
-        self._source_to_target = [None] * len(self._source_values)
+    @property
+    def is_identity(self) -> bool:
+        """If every source index maps to the same target index,
+        e.g. when the source dictionary is a prefix of the target dictionary."""
+        if self._n_unmapped:
+            return False
+        if self._is_identity is None:
+            self._is_identity = self._source_to_target == list(
+                range(len(self._source_to_target))
+            )
+        return self._is_identity
 
     def source_to_target(self, i_source: int) -> int:
         """Maps the index for the source dictionary to the target dictionary.
+        Like :meth:`Dictionary.use_value`, the use of the value
+        is counted in the target dictionary.
 
         Parameters
         ----------
@@ -123,10 +474,91 @@ class DictionaryMapper:
         int
             Index for the value in the target dictionary.
         """
-        if self._source_to_target[i_source] != None:
-            return self._source_to_target[i_source]  # type: ignore
+        i_target = self._source_to_target[i_source]
+        if i_target is not None:
+            self._target_counts[i_target] += 1
+            return i_target
 
-        self._source_to_target[i_source] = self._target_dict.use_value(
-            self._source_values[i_source]
-        )
-        return self._source_to_target[i_source]  # type: ignore
+        i_target = self._target_dict.use_value(self._source_values[i_source])
+        self._source_to_target[i_source] = i_target
+        self._n_unmapped -= 1
+        return i_target
+
+    def sources_to_targets(self, indices: Iterable[int]) -> array[int]:
+        """Maps many indexes at once, like :meth:`source_to_target`.
+
+        Once every source value is in the target dictionary, the indexes
+        are mapped in bulk with a lookup table, or simply copied
+        if :attr:`is_identity`.
+
+        Parameters
+        ----------
+        indices : Iterable[int]
+            Indexes for values in the source dictionary.
+
+        Returns
+        -------
+        array[int]
+            Indexes for the values in the target dictionary,
+            with the "I" type code.
+        """
+        if self._n_unmapped:
+            return array("I", map(self.source_to_target, indices))
+
+        if self.is_identity:
+            targets = array("I", indices)
+        else:
+            # Every index is mapped.
+            targets = array(
+                "I", map(self._source_to_target.__getitem__, indices)  # type: ignore
+            )
+
+        pending_uses = self._pending_uses
+        if pending_uses is None:
+            self._target_dict.count_uses(targets)
+        else:
+            pending_uses.extend(targets)
+            if len(pending_uses) >= 1 << 16:
+                self.count_pending_uses()
+        return targets
+
+    def lookup_targets(self, indices: array[int]) -> np.ndarray:
+        """Maps many indexes at once with a lookup table, without
+        counting their uses. Requires NumPy.
+
+        Source values that are not in the target dictionary yet are
+        added in the order they first appear in `indices`, and
+        their first use is taken back.
+
+        Parameters
+        ----------
+        indices : array[int]
+            Indexes for values in the source dictionary,
+            with the "I" type code.
+
+        Returns
+        -------
+        np.ndarray
+            Indexes for the values in the target dictionary.
+        """
+        source_to_target = self._source_to_target
+        if self._n_unmapped:
+            for i in dict.fromkeys(indices):
+                if source_to_target[i] is None:
+                    self._target_counts[self.source_to_target(i)] -= 1
+
+        table = self._table
+        if table is None:
+            # Source values not used yet have no target index.
+            table = np.array(
+                [0 if i is None else i for i in source_to_target], dtype=np.uint32
+            )
+            if not self._n_unmapped:
+                self._table = table
+        return table[np.frombuffer(indices, dtype=np.uint32)]
+
+    def count_pending_uses(self):
+        """Count the uses deferred by :meth:`sources_to_targets`."""
+        if self._pending_uses:
+            self._target_dict.count_uses(self._pending_uses)
+            self._pending_uses = array("I")
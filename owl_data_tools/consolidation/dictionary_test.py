@@ -1,4 +1,10 @@
-from .dictionary import Dictionary, DictionaryMapper
+import pickle
+from array import array
+
+import pytest
+
+from . import dictionary as dictionary_module
+from .dictionary import CompactDictionary, Dictionary, DictionaryMapper
 
 
 class TestConsolidatorDictionary:
@@ -20,6 +26,99 @@ class TestConsolidatorDictionary:
         cd_values = cd.generate_values_list()
         assert cd_values == []
 
+    def test_values(self):
+        cd = Dictionary(["aa"])
+        values = cd.values
+        cd.use_value("bb")
+        cd.use_value("aa")
+
+        assert values == ["aa", "bb"]
+        assert cd.values is values
+        assert cd.generate_values_list() is not values
+        assert cd.size == 2
+
+    def test_counts(self):
+        cd = Dictionary(["aa", "bb"], [3, 1])
+        cd.use_value("bb")
+        cd.use_value("cc")
+        cd.use_value("bb")
+
+        assert cd.generate_counts_list() == [3, 3, 1]
+        assert Dictionary(["aa"]).generate_counts_list() == [0]
+
+        cd.count_uses([2, 0])
+        assert cd.generate_counts_list() == [4, 3, 2]
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_count_uses_bulk(self, monkeypatch, use_numpy: bool):
+        if use_numpy:
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(dictionary_module, "np", None)
+
+        indices = array("I", [i % 7 for i in range(1000)] + [9] * 24)
+        cd = Dictionary([str(i) for i in range(10)], [1] * 10)
+        cd.count_uses(indices)
+        cd.count_uses(indices[:500], -1)
+
+        expected = [1 + list(indices[500:]).count(i) for i in range(10)]
+        assert cd.generate_counts_list() == expected
+
+
+class TestCompactDictionary:
+    def test_use_value(self):
+        cd = CompactDictionary(["aa"], [2])
+        values = cd.values
+        for i in range(100):
+            assert cd.use_value(f"välue {i}") == i + 1
+        assert cd.use_value("aa") == 0
+        assert cd.use_value("välue 42") == 43
+
+        assert cd.size == len(values) == 101
+        assert values[43] == "välue 42"
+        assert values[-1] == "välue 99"
+        assert cd.generate_values_list() == ["aa"] + [f"välue {i}" for i in range(100)]
+        assert cd.generate_counts_list()[:3] == [3, 1, 1]
+        assert cd.index_of("välue 7") == 8
+        assert cd.index_of("missing") is None
+
+    @pytest.mark.parametrize("dictionary_type", [Dictionary, CompactDictionary])
+    def test_duplicate_values(self, dictionary_type):
+        cd = dictionary_type(["a", "a", "b"], [1, 2, 3])
+
+        assert cd.size == 3
+        assert cd.generate_values_list() == ["a", "a", "b"]
+        assert cd.index_of("a") == 1
+        assert cd.use_value("a") == 1
+        assert cd.generate_counts_list() == [1, 3, 3]
+        assert cd.reordered([1, 2, 0]).index_of("a") == 2
+
+    def test_reordered(self):
+        cd = CompactDictionary(["aa", "bb", "cc"], [1, 2, 3])
+        reordered = cd.reordered([2, 0, 1])
+
+        assert reordered.generate_values_list() == ["cc", "aa", "bb"]
+        assert reordered.generate_counts_list() == [3, 1, 2]
+        assert reordered.use_value("bb") == 2
+        assert reordered.use_value("dd") == 3
+        assert cd.generate_values_list() == ["aa", "bb", "cc"]
+
+    def test_pickle(self):
+        cd = CompactDictionary([str(i) for i in range(20)])
+        copy = pickle.loads(pickle.dumps(cd))
+
+        assert copy.generate_values_list() == cd.generate_values_list()
+        assert copy.use_value("13") == 13
+        assert copy.use_value("20") == 20
+
+    def test_mapper(self):
+        target = CompactDictionary(["b"])
+        mapper = DictionaryMapper(["a", "b"], target)
+
+        assert list(mapper.sources_to_targets([1, 0, 0])) == [0, 1, 1]
+        assert target.generate_values_list() == ["b", "a"]
+        assert target.generate_counts_list() == [1, 2]
+
 
 class TestDictionaryMapper:
     def test_source_to_target(self):
@@ -41,3 +140,61 @@ class TestDictionaryMapper:
             assert mapper.source_to_target(2) == 7
             assert mapper.source_to_target(3) == 0
             assert mapper.source_to_target(4) == 2
+
+    def test_source_to_target_counts(self):
+        target = Dictionary(["a"])
+        mapper = DictionaryMapper(["b", "a"], target)
+
+        mapper.source_to_target(0)
+        mapper.source_to_target(0)
+        mapper.source_to_target(1)
+
+        assert target.generate_values_list() == ["a", "b"]
+        assert target.generate_counts_list() == [1, 2]
+
+    def test_sources_to_targets(self):
+        target = Dictionary(["a", "b", "c"])
+        prefix_mapper = DictionaryMapper(["a", "b"], target)
+        assert prefix_mapper.is_identity
+        assert list(prefix_mapper.sources_to_targets([1, 1, 0])) == [1, 1, 0]
+        assert target.generate_counts_list() == [1, 2, 0]
+
+        mapper = DictionaryMapper(["d", "c", "a"], target)
+        assert not mapper.is_identity
+        assert list(mapper.sources_to_targets([2, 1])) == [0, 2]
+        assert list(mapper.sources_to_targets([0, 2])) == [3, 0]
+        assert list(mapper.sources_to_targets([1, 0])) == [2, 3]
+        assert not mapper.is_identity
+
+        assert target.generate_values_list() == ["a", "b", "c", "d"]
+        assert target.generate_counts_list() == [3, 2, 2, 2]
+
+    def test_defer_counts(self):
+        target = Dictionary(["a", "b"])
+        mapper = DictionaryMapper(["b", "c"], target, defer_counts=True)
+
+        # Uses of values not mapped yet are counted immediately.
+        assert list(mapper.sources_to_targets([1, 0])) == [2, 1]
+        assert target.generate_counts_list() == [0, 1, 1]
+
+        assert list(mapper.sources_to_targets([0, 0, 1])) == [1, 1, 2]
+        assert target.generate_counts_list() == [0, 1, 1]
+        mapper.count_pending_uses()
+        assert target.generate_counts_list() == [0, 3, 2]
+        mapper.count_pending_uses()
+        assert target.generate_counts_list() == [0, 3, 2]
+
+    def test_lookup_targets(self):
+        pytest.importorskip("numpy")
+
+        target = Dictionary(["a", "b"], [1, 1])
+        mapper = DictionaryMapper(["c", "a", "d", "e"], target)
+
+        targets = mapper.lookup_targets(array("I", [2, 1, 0, 2]))
+        assert targets.tolist() == [2, 0, 3, 2]
+        assert target.generate_values_list() == ["a", "b", "d", "c"]
+        assert target.generate_counts_list() == [1, 1, 0, 0]
+
+        mapper.source_to_target(3)
+        assert mapper.lookup_targets(array("I", [3, 1])).tolist() == [4, 0]
+        assert target.generate_counts_list() == [1, 1, 0, 0, 1]
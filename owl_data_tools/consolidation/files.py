@@ -1,9 +1,108 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from glob import iglob
+import heapq
+from itertools import count, repeat
 import json
 from pathlib import Path
-from typing import Any, Callable, Optional, Sequence
+from typing import Any, Callable, Iterator, Optional, Sequence, Union
 
-from .consolidator import Consolidator
+from ..exceptions import OwlError
+from ..types import EntryData
+from .colf_reader import ColfReader
+from .compression import is_compressed, open_binary, open_text, strip_compression_suffix
+from .consolidator import Consolidator, _WindowKey
+from .dictionary import DictionaryMapper
+from .manifest import Manifest
+
+
+class LogFileReader:
+    """Lazily decodes the entries of a '.json.log' file.
+
+    The file is read one line at a time, so only a single line
+    is held in memory at once, regardless of the file size.
+    Files with a '.gz', '.bz2' or '.xz' suffix are decompressed
+    on the fly.
+
+    Examples
+    --------
+    >>> reader = LogFileReader("20230912.json.log")
+    >>> for entry in reader:
+    ...     consolidator.append_entry(entry)
+    """
+
+    path: Path
+    """Path to the '.json.log' file."""
+
+    _entry_transform: Optional[Callable[[dict[str, Any]], None]]
+    _start_offset: int
+    _skip_incomplete_line: bool
+
+    line_no = 0
+    """Line number of the most recently decoded entry,
+    counted from the starting offset."""
+
+    offset = 0
+    """Number of bytes of the file consumed so far.
+    Only complete lines are counted as consumed."""
+
+    def __init__(
+        self,
+        path: Path,
+        entry_transform: Optional[Callable[[dict[str, Any]], None]] = None,
+        offset: int = 0,
+        skip_incomplete_line: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        path : Path
+            Path to the '.json.log' file.
+        entry_transform : Optional[Callable[[dict[str, Any]], None]], optional
+            Function that transform the entry JSON before being
+            yielded, by default None
+        offset : int, optional
+            Byte offset to start reading from, by default 0.
+            It must point to the beginning of a line.
+            For compressed files, it is an offset in the decompressed data.
+        skip_incomplete_line : bool, optional
+            Stop silently instead of raising when the last line
+            has no trailing newline and cannot be decoded,
+            e.g. because it is still being written, by default False.
+        """
+        self.path = path
+        self._entry_transform = entry_transform
+        self._start_offset = offset
+        self._skip_incomplete_line = skip_incomplete_line
+        self.offset = offset
+
+    def __iter__(self) -> Iterator[EntryData]:
+        """Iterate over the decoded entries of the file."""
+        with open_binary(self.path, self._start_offset) as f:
+            self.offset = self._start_offset
+
+            for no, line in enumerate(f, 1):
+                end_offset = self.offset + len(line)
+                if b"{" not in line:
+                    self.offset = end_offset
+                    continue
+
+                self.line_no = no
+                try:
+                    entry = json.loads(line)
+                    if self._entry_transform:
+                        self._entry_transform(entry)
+                except Exception as e:
+                    if self._skip_incomplete_line and not line.endswith(b"\n"):
+                        return
+                    print(
+                        f"\nException occured while processing `{self.path}` "
+                        f"at line no: {no}"
+                    )
+                    raise e
+
+                self.offset = end_offset
+                yield entry
 
 
 def consolidator_from_files(
@@ -11,9 +110,18 @@ def consolidator_from_files(
     output_paths: Optional[Sequence[str]] = None,
     root_dir: Optional[Path] = None,
     entry_transform: Optional[Callable[[dict[str, Any]], None]] = None,
-) -> Consolidator:
+    jobs: int = 1,
+    incremental: bool = False,
+    compact: bool = False,
+    deduplicate: bool = False,
+    rollups: bool = False,
+) -> Optional[Consolidator]:
     """Create an instance of :class:`Consolidator` from multiple files.
 
+    The entries of all files are merged in chronological order,
+    so the files can be given in any order. Only the entries
+    of each file need to be sorted chronologically.
+
     Parameters
     ----------
     file_patterns : Sequence[str]
@@ -21,71 +129,416 @@ def consolidator_from_files(
         '.json' files will be assumed to contain JSON
         in the format of :class:`ConsolidatedOwlLogsSerialized`.
 
-        Normal paths, and globs are supported.
+        Normal paths, and globs are supported. Files compressed
+        with gzip, bzip2 or xz are supported with an additional
+        '.gz', '.bz2' or '.xz' suffix, e.g. '20230912.json.log.gz'.
     output_paths : Optional[Sequence[str]], optional
-        Output file paths, by default None
+        Output file paths, by default None. Outputs are compressed
+        if their path ends with '.gz', '.bz2' or '.xz'.
     root_dir : Optional[Path], optional
         Root directory to resolve any relative file paths, by default None
     entry_transform : Optional[Callable[[dict[str, Any]], None]], optional
         Function that transform the entry JSON before being
-        fed into :class:`Consolidator`, by default None
+        fed into :class:`Consolidator`, by default None.
+        It must be picklable when `jobs` is greater than 1.
+    jobs : int, optional
+        Number of worker processes used to decode the files, by default 1.
+        When greater than 1, every file is consolidated separately
+        in a process pool before the results are merged.
+        The merged result is identical to the one of a single process.
+    incremental : bool, optional
+        Only consolidate what has changed since the previous run,
+        by default False. A manifest of the consumed input files is kept
+        next to the first output path (see :class:`Manifest`).
+        Unchanged files are skipped, only the appended tail of a growing
+        '.json.log' file is read, and the result is appended to the
+        existing output. If a previously consumed part of a file has
+        been modified, everything is consolidated from scratch.
+    compact : bool, optional
+        Write the outputs in the compact version of COLF, where windows
+        that did not change since the previous entry are not repeated,
+        by default False.
+    deduplicate : bool, optional
+        Drop entries with the same timestamp and windows as an entry
+        already consolidated, by default False. Useful when the
+        input files overlap, e.g. exports restored from backups.
+    rollups : bool, optional
+        Write the rollups of the foreground durations by path
+        in the outputs, by default False.
 
     Returns
     -------
-    Consolidator
+    Optional[Consolidator]
+        None if `incremental` is set and neither the input files
+        nor the outputs have changed, in which case the outputs
+        are neither read nor written again.
+
+    Raises
+    ------
+    OwlError
+        If `incremental` is set without any output path.
     """
-    consolidator = Consolidator()
+    consolidator = Consolidator(deduplicate)
+    paths = list(_iter_input_paths(file_patterns, root_dir))
+    offsets: list[Optional[int]] = [0] * len(paths)
+    previous: Optional[Consolidator] = None
 
-    for file_pattern in file_patterns:
-        for path_str in iglob(file_pattern, root_dir=root_dir, recursive=True):
-            path = Path(path_str)
-            if root_dir and not path.exists():
-                path = Path(root_dir) / path
+    if incremental:
+        if not output_paths:
+            raise OwlError("Incremental consolidation requires an output path.")
+
+        resolved_output_paths = [_resolve_path(p, root_dir) for p in output_paths]
+        output_path = resolved_output_paths[0]
+        manifest_path = Manifest.path_for(output_path)
+        excluded = {manifest_path.resolve()}
+        excluded.update(p.resolve() for p in resolved_output_paths)
+        paths = [path for path in paths if path.resolve() not in excluded]
+
+        output_options = (resolved_output_paths, compact, rollups, deduplicate)
+        manifest, offsets, resume = _plan_incremental(
+            paths, manifest_path, output_options
+        )
+        if resume:
+            for path, offset in zip(paths, offsets):
+                if offset is None:
+                    print(path, end="\t")
+                    print("(UNCHANGED)")
+
+            if all(offset is None for offset in offsets):
+                print(output_path, end="\t")
+                print("(UNCHANGED OUTPUT)")
+                manifest.save(manifest_path)
+                return None
 
+            # The previous output is loaded as is, without decoding
+            # its entries, and only the new tails are merged into it.
+            previous = Consolidator(deduplicate)
+            print(output_path, end="\t")
+            print(_load_file(output_path, previous, None)[0])
+
+    loaded_paths = [path for path, offset in zip(paths, offsets) if offset is not None]
+    loaded_offsets = [offset for offset in offsets if offset is not None]
+    end_offsets: list[int] = []
+
+    if jobs > 1:
+        partials: list[Consolidator] = []
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(
+                _consolidate_file,
+                loaded_paths,
+                repeat(entry_transform),
+                loaded_offsets,
+                repeat(incremental),
+                chunksize=1,
+            )
+            for path, (status, end_offset, partial) in zip(loaded_paths, results):
+                print(path, end="\t")
+                if partial:
+                    partials.append(partial)
+                end_offsets.append(end_offset)
+                print(status)
+
+        if previous is not None:
+            consolidator = previous
+            _merge_tails(consolidator, partials)
+        else:
+            consolidator.append_from_consolidators(partials)
+    else:
+        sources: list[Optional[_Source]] = []
+        for path, offset in zip(loaded_paths, loaded_offsets):
             print(path, end="\t")
+            status, source = _open_source(path, entry_transform, offset, incremental)
+            sources.append(source)
+            print(status)
 
-            if "".join(path.suffixes).endswith(".json.log"):
-                with open(path, "r", encoding="utf-8") as f:
-                    for no, line in enumerate(f.readlines(), 1):
-                        if "{" in line:
-                            try:
-                                entry = json.loads(line)
-                                if entry_transform:
-                                    entry_transform(entry)
-                                consolidator.append_entry(entry)
-                            except Exception as e:
-                                print(
-                                    f"\nException occured while processing `{path}` "
-                                    f"at line no: {no}"
-                                )
-                                raise e
-
-                print("(LOADED LOGS)")
-            elif path.suffix == ".json":
-                with open(path, "r", encoding="utf-8") as f:
-                    try:
-                        serialized = json.load(f)
-                        consolidator.append_from_serialized(serialized)
-                    except Exception as e:
-                        print(f"\nException occured while processing `{path}` ")
-                        raise e
-
-                print("(LOADED SERIALIZED COL)")
-            else:
-                print("(IGNORED)")
-
-    col_json = json.dumps(consolidator.serialize())
+        _append_merged(consolidator, [s for s in sources if s])
+        end_offsets = [s.offset if s else 0 for s in sources]
+        if previous is not None:
+            _merge_tails(previous, [consolidator])
+            consolidator = previous
 
     if output_paths:
-        for path_str in output_paths:
-            path = Path(path_str)
-            if root_dir and not path.exists():
-                path = Path(root_dir) / path
+        resolved_output_paths = [_resolve_path(p, root_dir) for p in output_paths]
+        with ExitStack() as stack:
+            files = [
+                stack.enter_context(open_text(p, "w")) for p in resolved_output_paths
+            ]
+            consolidator.write_serialized(files, compact=compact, rollups=rollups)
 
+        for path in resolved_output_paths:
             print(path, end="\t")
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(col_json)
-
             print("(OUTPUT)")
 
+    if incremental:
+        for path, end_offset in zip(loaded_paths, end_offsets):
+            if _get_file_kind(path):
+                if not _is_appendable(path):
+                    end_offset = path.stat().st_size
+                manifest.record(path, end_offset)
+        manifest.record_output(*output_options)
+        manifest.save(manifest_path)
+
     return consolidator
+
+
+def _plan_incremental(
+    paths: list[Path],
+    manifest_path: Path,
+    output_options: tuple[list[Path], bool, bool, bool],
+) -> tuple[Manifest, list[Optional[int]], bool]:
+    """Find where to resume consuming each of `paths` from.
+
+    Everything is consolidated from scratch if the outputs are
+    not the ones recorded in the manifest, see :meth:`Manifest.matches_output`.
+
+    Returns
+    -------
+    tuple[Manifest, list[Optional[int]], bool]
+        The manifest to update, the resume offset of each path
+        (see :meth:`Manifest.resume_offset`), and whether the previous
+        output has to be loaded before appending to it.
+    """
+    manifest = Manifest.load(manifest_path)
+    if len(manifest) == 0:
+        return Manifest(), [0] * len(paths), False
+    if not manifest.matches_output(*output_options):
+        print("The outputs have changed.\nConsolidating all files from scratch.")
+        return Manifest(), [0] * len(paths), False
+
+    try:
+        offsets = [manifest.resume_offset(path, _is_appendable(path)) for path in paths]
+    except OwlError as e:
+        print(f"{e}\nConsolidating all files from scratch.")
+        return Manifest(), [0] * len(paths), False
+
+    return manifest, offsets, True
+
+
+def _merge_tails(consolidator: Consolidator, tails: Sequence[Consolidator]):
+    """Merge the entries of `tails` into `consolidator`, loaded
+    from a previous output. The entries of `consolidator` are
+    only walked again if some of `tails` overlap them in time.
+    """
+    timestamps = consolidator._timestamps
+    if all(
+        not timestamps or not tail._timestamps or tail._timestamps[0] >= timestamps[-1]
+        for tail in tails
+    ):
+        consolidator.append_from_consolidators(tails)
+    else:
+        consolidator.merge_from_consolidators(tails)
+
+
+def _resolve_path(path_str: str, root_dir: Optional[Path]) -> Path:
+    path = Path(path_str)
+    if root_dir and not path.exists():
+        path = Path(root_dir) / path
+    return path
+
+
+def _iter_input_paths(
+    file_patterns: Sequence[str], root_dir: Optional[Path]
+) -> Iterator[Path]:
+    for file_pattern in file_patterns:
+        for path_str in iglob(file_pattern, root_dir=root_dir, recursive=True):
+            yield _resolve_path(path_str, root_dir)
+
+
+def _get_file_kind(path: Path) -> Optional[str]:
+    """Get the kind of input file: "log" for '.json.log' files,
+    "col" for serialized consolidated owl logs, or None if
+    the file is not supported.
+
+    Files compressed with any of :data:`COMPRESSION_OPENERS`
+    are of the same kind as their decompressed counterpart."""
+    path = strip_compression_suffix(path)
+    if "".join(path.suffixes).endswith(".json.log"):
+        return "log"
+    if path.suffix == ".json":
+        return "col"
+    return None
+
+
+def _is_appendable(path: Path) -> bool:
+    """Check if data appended to the file at `path`
+    can be consolidated on its own."""
+    return _get_file_kind(path) == "log" and not is_compressed(path)
+
+
+class _SerializedFileSource:
+    """Entries of a serialized consolidated owl logs file.
+
+    The file is loaded into its own :class:`Consolidator`, so that
+    its entries are appended with their windows remapped by index,
+    as with :meth:`Consolidator.append_from_consolidators`,
+    rather than decoded back into :class:`EntryData`.
+    """
+
+    path: Path
+    consolidator: Consolidator
+    offset: int
+    """Number of bytes of the file consumed."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.consolidator = Consolidator()
+        self.offset = _load_file(path, self.consolidator, None)[1]
+
+
+_Source = Union[LogFileReader, _SerializedFileSource]
+
+
+def _open_source(
+    path: Path,
+    entry_transform: Optional[Callable[[dict[str, Any]], None]],
+    offset: int = 0,
+    skip_incomplete_line: bool = False,
+) -> tuple[str, Optional[_Source]]:
+    """Open the file at `path` as a source of entries.
+
+    Returns
+    -------
+    tuple[str, Optional[_Source]]
+        Status label of the file, and the source of entries,
+        or None if the file is not supported.
+    """
+    kind = _get_file_kind(path)
+    if kind == "log":
+        reader = LogFileReader(path, entry_transform, offset, skip_incomplete_line)
+        if offset:
+            return "(LOADED APPENDED LOGS)", reader
+        return "(LOADED LOGS)", reader
+    if kind == "col":
+        return "(LOADED SERIALIZED COL)", _SerializedFileSource(path)
+    return "(IGNORED)", None
+
+
+def _append_merged(consolidator: Consolidator, sources: Sequence[_Source]):
+    """Append the entries of multiple sources into `consolidator`,
+    interleaved in chronological order.
+
+    Every source must be sorted chronologically on its own.
+    Only the next entry of each '.json.log' file is held in memory.
+    Entries with the same timestamp are appended
+    in the order of `sources`.
+    """
+    streams: list[Iterator[tuple[tuple[int, Any], int]]] = []
+    # Mappers of the windows of the serialized files, by source index.
+    mappers: dict[int, DictionaryMapper[_WindowKey]] = {}
+    for k, source in enumerate(sources):
+        if isinstance(source, LogFileReader):
+            entries = ((entry["timestamp"], entry) for entry in source)
+            streams.append(zip(entries, repeat(k)))
+        else:
+            timestamps = source.consolidator._timestamps
+            streams.append(zip(zip(timestamps, count()), repeat(k)))
+            mappers[k] = DictionaryMapper(
+                source.consolidator._window_cd.values,
+                consolidator._window_cd,
+                defer_counts=True,
+            )
+
+    # Latest entry appended from a serialized file, see `_append_from`.
+    previous = None
+    try:
+        for (timestamp, item), k in heapq.merge(*streams, key=lambda x: x[0][0]):
+            source = sources[k]
+            try:
+                if isinstance(source, LogFileReader):
+                    consolidator.append_entry(item)
+                    previous = None
+                else:
+                    consolidator._check_chronological(timestamp)
+                    appended = consolidator._append_from(
+                        source.consolidator,
+                        mappers[k],
+                        item,
+                        previous == (k, item - 1),
+                    )
+                    # The windows of a dropped duplicate are not the latest ones.
+                    previous = (k, item) if appended else None
+            except Exception as e:
+                if isinstance(source, LogFileReader):
+                    print(
+                        f"\nException occured while processing `{source.path}` "
+                        f"at line no: {source.line_no}"
+                    )
+                else:
+                    print(f"\nException occured while processing `{source.path}` ")
+                raise e
+    finally:
+        for mapper in mappers.values():
+            mapper.count_pending_uses()
+
+    consolidator._optimized = False
+
+
+def _load_file(
+    path: Path,
+    consolidator: Consolidator,
+    entry_transform: Optional[Callable[[dict[str, Any]], None]],
+    offset: int = 0,
+    skip_incomplete_line: bool = False,
+) -> tuple[str, int]:
+    """Load the file at `path` into `consolidator`.
+
+    Returns
+    -------
+    tuple[str, int]
+        Status label of the file,
+        and the number of bytes of the file consumed.
+    """
+    kind = _get_file_kind(path)
+
+    if kind == "log":
+        log_reader = LogFileReader(path, entry_transform, offset, skip_incomplete_line)
+        for entry in log_reader:
+            try:
+                consolidator.append_entry(entry)
+            except Exception as e:
+                print(
+                    f"\nException occured while processing `{path}` "
+                    f"at line no: {log_reader.line_no}"
+                )
+                raise e
+
+        if offset:
+            return "(LOADED APPENDED LOGS)", log_reader.offset
+        return "(LOADED LOGS)", log_reader.offset
+
+    if kind == "col":
+        with open_text(path) as f:
+            colf_reader = ColfReader(f)
+            try:
+                header = colf_reader.read_header()
+                consolidator.append_serialized_entries(
+                    colf_reader.dictionaries,
+                    colf_reader.iter_entries(),
+                    header.get("version"),
+                    header.get("rollups"),
+                )
+            except Exception as e:
+                print(f"\nException occured while processing `{path}` ")
+                raise e
+
+        return "(LOADED SERIALIZED COL)", path.stat().st_size
+
+    return "(IGNORED)", 0
+
+
+def _consolidate_file(
+    path: Path,
+    entry_transform: Optional[Callable[[dict[str, Any]], None]],
+    offset: int = 0,
+    skip_incomplete_line: bool = False,
+) -> tuple[str, int, Optional[Consolidator]]:
+    """Consolidate a single file into its own :class:`Consolidator`.
+    Used by the worker processes of :func:`consolidator_from_files`.
+    """
+    consolidator = Consolidator()
+    status, end_offset = _load_file(
+        path, consolidator, entry_transform, offset, skip_incomplete_line
+    )
+    if status == "(IGNORED)":
+        return status, end_offset, None
+    return status, end_offset, consolidator
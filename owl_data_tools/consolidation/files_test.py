@@ -0,0 +1,376 @@
+import json
+import os
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from ..exceptions import OwlError
+from .colf_reader import ColfReader
+from .consolidator import Consolidator
+from .compression import open_text
+from . import files as files_module
+from .files import LogFileReader, consolidator_from_files
+from . import manifest as manifest_module
+from .manifest import Manifest
+
+
+def test_log_file_reader(tmp_path: Path):
+    p = tmp_path / "one.json.log"
+    p.write_text(
+        json.dumps({"timestamp": 0})
+        + "\n\n"
+        + json.dumps({"time": 1, "windows": []})
+        + "\r\n"
+        + json.dumps({"timestamp": 2})
+    )
+
+    def transform(entry):
+        if "time" in entry:
+            entry["timestamp"] = entry.pop("time")
+
+    reader = LogFileReader(p, transform)
+    line_nos = []
+    entries = []
+    for entry in reader:
+        line_nos.append(reader.line_no)
+        entries.append(entry)
+
+    assert entries == [
+        {"timestamp": 0},
+        {"timestamp": 1, "windows": []},
+        {"timestamp": 2},
+    ]
+    assert line_nos == [1, 3, 4]
+
+    # Iterating again should start from the beginning.
+    assert len(list(reader)) == 3
+
+
+def test_log_file_reader_invalid(tmp_path: Path):
+    p = tmp_path / "one.json.log"
+    p.write_text(json.dumps({"timestamp": 0}) + "\n{invalid json")
+
+    reader = LogFileReader(p)
+    iterator = iter(reader)
+    assert next(iterator) == {"timestamp": 0}
+
+    with pytest.raises(json.JSONDecodeError):
+        next(iterator)
+    assert reader.line_no == 2
+
+
+def _entry(timestamp: int, title: str) -> str:
+    entry = {
+        "timestamp": timestamp,
+        "windows": [{"path": "/program/0.exe", "title": title, "isActive": True}],
+    }
+    return json.dumps(entry) + "\n"
+
+
+def _read_entries(path: Path) -> list[tuple]:
+    col = Consolidator()
+    col.append_from_serialized(json.loads(path.read_text("utf-8")))
+    view = col.generate_col().get_entries_view(0, 2**62)
+    return [
+        (e.timestamp, [(w.path, w.title, w.is_active) for w in e.windows_view])
+        for e in view
+    ]
+
+
+def test_incremental(tmp_path: Path):
+    p_one = tmp_path / "one.json.log"
+    p_two = tmp_path / "two.json.log"
+    p_out = tmp_path / "out.json"
+    p_reference = tmp_path / "reference.json"
+    patterns = [str(p_one), str(p_two)]
+
+    def consolidate_and_check():
+        consolidator_from_files(patterns, [str(p_out)], incremental=True)
+        consolidator_from_files(patterns, [str(p_reference)])
+        assert _read_entries(p_out) == _read_entries(p_reference)
+
+    p_one.write_text(_entry(0, "a") + _entry(1, "b"))
+    p_two.write_text(_entry(2, "c"))
+    consolidate_and_check()
+    assert Manifest.path_for(p_out).exists()
+
+    # Unchanged inputs must not rewrite the output.
+    out_mtime = p_out.stat().st_mtime_ns
+    consolidate_and_check()
+    assert p_out.stat().st_mtime_ns == out_mtime
+
+    # Appended tail, with an incomplete last line.
+    with open(p_two, "a") as f:
+        f.write(_entry(3, "a") + '{"timestamp": 4, "win')
+    consolidator_from_files(patterns, [str(p_out)], incremental=True)
+    assert [e[0] for e in _read_entries(p_out)] == [0, 1, 2, 3]
+
+    with open(p_two, "a") as f:
+        f.write('dows": []}\n' + _entry(5, "d"))
+    consolidate_and_check()
+    assert [e[0] for e in _read_entries(p_out)] == [0, 1, 2, 3, 4, 5]
+
+    # Modifying an already consumed part triggers a full consolidation.
+    p_one.write_text(_entry(0, "z") + _entry(1, "b"))
+    consolidate_and_check()
+    assert _read_entries(p_out)[0][1][0][1] == "z"
+
+
+def test_incremental_outputs(tmp_path: Path):
+    p_one = tmp_path / "one.json.log"
+    p_out = tmp_path / "out.json"
+    p_second = tmp_path / "second.json"
+    p_reference = tmp_path / "reference.json"
+    p_one.write_text(_entry(0, "a") + _entry(1, "b"))
+    consolidator_from_files([str(p_one)], [str(p_out)], incremental=True)
+
+    # Other outputs or options rewrite every output.
+    outputs = [str(p_out), str(p_second)]
+    consolidator_from_files([str(p_one)], outputs, incremental=True, compact=True)
+    consolidator_from_files([str(p_one)], [str(p_reference)], compact=True)
+    assert p_out.read_bytes() == p_reference.read_bytes()
+    assert p_second.read_bytes() == p_reference.read_bytes()
+
+    consolidator_from_files([str(p_one)], outputs, incremental=True, rollups=True)
+    assert "rollups" in json.loads(p_second.read_text("utf-8"))
+
+    # A missing output is written again.
+    p_second.unlink()
+    consolidator_from_files([str(p_one)], outputs, incremental=True, rollups=True)
+    assert "rollups" in json.loads(p_second.read_text("utf-8"))
+
+
+def test_incremental_unchanged(tmp_path: Path, monkeypatch):
+    p_one = tmp_path / "one.json.log"
+    p_out = tmp_path / "out.json"
+    p_one.write_text(_entry(0, "a") + _entry(1, "b"))
+    consolidator_from_files([str(p_one)], [str(p_out)], incremental=True)
+
+    # The output is neither loaded nor written again.
+    def fail(path, *args):
+        raise AssertionError(f"{path} loaded")
+
+    monkeypatch.setattr(files_module, "_load_file", fail)
+    out_mtime = p_out.stat().st_mtime_ns
+    assert consolidator_from_files([str(p_one)], [str(p_out)], incremental=True) is None
+    assert p_out.stat().st_mtime_ns == out_mtime
+
+
+def test_incremental_touched(tmp_path: Path, monkeypatch):
+    p_one = tmp_path / "one.json.log"
+    p_out = tmp_path / "out.json"
+    p_one.write_text(_entry(0, "a") + _entry(1, "b"))
+    consolidator_from_files([str(p_one)], [str(p_out)], incremental=True)
+
+    # A touched file is hashed once, then recorded as unchanged.
+    mtime = p_one.stat().st_mtime_ns + 10**9
+    os.utime(p_one, ns=(mtime, mtime))
+    assert consolidator_from_files([str(p_one)], [str(p_out)], incremental=True) is None
+
+    def fail(path, *args):
+        raise AssertionError(f"{path} hashed")
+
+    monkeypatch.setattr(manifest_module, "hash_file", fail)
+    assert consolidator_from_files([str(p_one)], [str(p_out)], incremental=True) is None
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_incremental_tails(tmp_path: Path, jobs: int):
+    p_one = tmp_path / "one.json.log"
+    p_two = tmp_path / "two.json.log"
+    p_out = tmp_path / "out.json"
+    p_reference = tmp_path / "reference.json"
+    patterns = [str(p_one), str(tmp_path / "two*.json.log")]
+
+    def consolidate_and_check():
+        consolidator_from_files(patterns, [str(p_out)], jobs=jobs, incremental=True)
+        consolidator_from_files(patterns, [str(p_reference)], jobs=jobs)
+        assert p_out.read_bytes() == p_reference.read_bytes()
+
+    p_one.write_text(_entry(0, "a") + _entry(2, "b"))
+    consolidate_and_check()
+
+    # New entries after the previous output.
+    with open(p_one, "a") as f:
+        f.write(_entry(2, "c") + _entry(4, "a"))
+    consolidate_and_check()
+
+    # A new file overlapping the previous output.
+    p_two.write_text(_entry(1, "d") + _entry(3, "b") + _entry(5, "e"))
+    consolidate_and_check()
+
+
+def test_incremental_requires_output():
+    with pytest.raises(OwlError):
+        consolidator_from_files([], incremental=True)
+
+
+def test_unordered_inputs(tmp_path: Path):
+    p_one = tmp_path / "one.json.log"
+    p_two = tmp_path / "two.json.log"
+    p_three = tmp_path / "three.json"
+    p_out = tmp_path / "out.json"
+    p_out_parallel = tmp_path / "out_parallel.json"
+
+    p_one.write_text(_entry(5, "e") + _entry(6, "a") + _entry(9, "b"))
+    p_two.write_text(_entry(0, "a") + _entry(6, "c") + _entry(7, "d"))
+
+    three = Consolidator()
+    three.append_entries([json.loads(_entry(1, "b")), json.loads(_entry(8, "a"))])
+    p_three.write_text(json.dumps(three.serialize()))
+
+    patterns = [str(p_three), str(p_one), str(p_two)]
+    consolidator_from_files(patterns, [str(p_out)])
+    consolidator_from_files(patterns, [str(p_out_parallel)], jobs=2)
+
+    assert [(e[0], e[1][0][1]) for e in _read_entries(p_out)] == [
+        (0, "a"),
+        (1, "b"),
+        (5, "e"),
+        (6, "a"),
+        (6, "c"),
+        (7, "d"),
+        (8, "a"),
+        (9, "b"),
+    ]
+    assert p_out.read_bytes() == p_out_parallel.read_bytes()
+
+
+def test_compressed_files(tmp_path: Path):
+    logs = [_entry(0, "a") + _entry(1, "b"), _entry(2, "c") + _entry(3, "a")]
+
+    plain_paths = [tmp_path / "one.json.log", tmp_path / "two.json.log"]
+    compressed_paths = [tmp_path / "one.json.log.gz", tmp_path / "two.json.log.xz"]
+    for log, plain, compressed in zip(logs, plain_paths, compressed_paths):
+        plain.write_text(log)
+        with open_text(compressed, "w") as f:
+            f.write(log)
+
+    p_reference = tmp_path / "reference.json"
+    p_out = tmp_path / "out.colf.json.bz2"
+    consolidator_from_files([str(p) for p in plain_paths], [str(p_reference)])
+    consolidator_from_files([str(p) for p in compressed_paths], [str(p_out)])
+
+    with open_text(p_out) as f:
+        assert f.read() == p_reference.read_text("utf-8")
+
+    # Compressed COL files as input, and incremental output.
+    p_merged = tmp_path / "merged.json.gz"
+    consolidator_from_files([str(p_out)], [str(p_merged)], incremental=True)
+    consolidator_from_files([str(p_out)], [str(p_merged)], incremental=True)
+    with open_text(p_merged) as f:
+        assert f.read() == p_reference.read_text("utf-8")
+
+
+def test_compressed_files_memory(tmp_path: Path):
+    n_files = 30
+    padding = " " * (1 << 16) + "\n"
+    paths = [tmp_path / f"{k}.json.log.gz" for k in range(n_files)]
+    for k, path in enumerate(paths):
+        with open_text(path, "w") as f:
+            for j in range(10):
+                f.write(_entry(k + n_files * j, "a"))
+                f.write(padding * 4)
+
+    p_out = tmp_path / "out.json"
+    tracemalloc.start()
+    try:
+        consolidator_from_files([str(p) for p in paths], [str(p_out)])
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # Every open file holds one chunk read ahead at most,
+    # the other chunks are taken from a budget shared by all the files.
+    assert peak < 32 << 20
+    assert len(_read_entries(p_out)) == n_files * 10
+
+
+def test_compact(tmp_path: Path, monkeypatch):
+    p_logs = tmp_path / "one.json.log"
+    p_logs.write_text(
+        _entry(0, "a - Code")
+        + _entry(1, "a - Code")
+        + _entry(2, "a - Code")
+        + _entry(3, "b - Code")
+    )
+
+    p_reference = tmp_path / "reference.json"
+    p_compact = tmp_path / "compact.json"
+    consolidator_from_files([str(p_logs)], [str(p_reference)])
+    consolidator_from_files([str(p_logs)], [str(p_compact)], compact=True)
+    assert p_compact.stat().st_size < p_reference.stat().st_size
+
+    # COL files are not decoded back into entries.
+    def fail(self, entry):
+        raise AssertionError(f"{entry} decoded")
+
+    monkeypatch.setattr(Consolidator, "append_entry", fail)
+
+    # Compact COL files as input, in a single process and in parallel.
+    for jobs in [1, 2]:
+        p_out = tmp_path / f"out_{jobs}.json"
+        consolidator_from_files([str(p_compact)], [str(p_out)], jobs=jobs)
+        assert p_out.read_text("utf-8") == p_reference.read_text("utf-8")
+
+
+def test_deduplicate(tmp_path: Path):
+    p_one = tmp_path / "one.json.log"
+    p_two = tmp_path / "two.json.log"
+    p_one.write_text(_entry(0, "a") + _entry(1, "b") + _entry(2, "c"))
+    p_two.write_text(_entry(1, "b") + _entry(2, "a") + _entry(3, "d"))
+
+    p_out = tmp_path / "out.json"
+    p_out_parallel = tmp_path / "out_parallel.json"
+    patterns = [str(p_one), str(p_two)]
+    consolidator_from_files(patterns, [str(p_out)], deduplicate=True)
+    consolidator_from_files(patterns, [str(p_out_parallel)], jobs=2, deduplicate=True)
+
+    assert [(e[0], e[1][0][1]) for e in _read_entries(p_out)] == [
+        (0, "a"),
+        (1, "b"),
+        (2, "c"),
+        (2, "a"),
+        (3, "d"),
+    ]
+    assert p_out.read_bytes() == p_out_parallel.read_bytes()
+
+    # The entry after a dropped duplicate keeps its own windows.
+    p_one.write_text(_entry(1, "a") + _entry(1, "b"))
+    p_two.write_text(_entry(1, "a") + _entry(2, "a"))
+    consolidator_from_files(patterns, [str(p_out)], deduplicate=True)
+    consolidator_from_files(patterns, [str(p_out_parallel)], jobs=2, deduplicate=True)
+
+    assert [(e[0], e[1][0][1]) for e in _read_entries(p_out)] == [
+        (1, "a"),
+        (1, "b"),
+        (2, "a"),
+    ]
+    assert p_out.read_bytes() == p_out_parallel.read_bytes()
+
+
+def test_rollups(tmp_path: Path):
+    p_one = tmp_path / "one.json.log"
+    p_one.write_text(_entry(0, "a") + _entry(30, "b") + _entry(7200, "c"))
+
+    p_out = tmp_path / "out.json"
+    p_plain = tmp_path / "plain.json"
+    consolidator_from_files([str(p_one)], [str(p_out)], rollups=True)
+    consolidator_from_files([str(p_one)], [str(p_plain)])
+
+    serialized = json.loads(p_out.read_text("utf-8"))
+    assert serialized["rollups"]["levels"][0] == {
+        "resolution": 3600,
+        "origin": 0,
+        "keys": [0],
+        "starts": [[0]],
+        "durations": [[90]],
+    }
+    del serialized["rollups"]
+    assert serialized == json.loads(p_plain.read_text("utf-8"))
+
+    # The rollups are read with the header, without decoding the entries.
+    with open_text(p_out) as f:
+        header = ColfReader(f).read_header()
+    assert "rollups" in header
@@ -0,0 +1,209 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, Sequence, TypedDict
+
+from ..exceptions import OwlError
+
+
+class FileRecord(TypedDict):
+    """Describes how much of an input file has been consolidated."""
+
+    size: int
+    """File size in bytes when it was last consumed."""
+
+    mtime: int
+    """Modification time in nanoseconds when it was last consumed."""
+
+    hash: str
+    """SHA-256 hex digest of the consumed bytes."""
+
+    offset: int
+    """Number of bytes consumed."""
+
+
+class OutputRecord(TypedDict):
+    """Describes the outputs that the input files have been consolidated into."""
+
+    paths: list[str]
+    """Absolute paths of the output files."""
+
+    compact: bool
+    """If the outputs are written in the compact version of COLF."""
+
+    rollups: bool
+    """If the outputs contain the rollups."""
+
+    deduplicate: bool
+    """If duplicate entries have been dropped."""
+
+
+class Manifest:
+    """Keeps track of the input files that have already been
+    consolidated into an output COLF file, so that later
+    consolidations only need to read what has changed.
+
+    The manifest is stored as JSON next to the output COLF file,
+    see :meth:`path_for`.
+    """
+
+    _records: dict[str, FileRecord]
+    _output: Optional[OutputRecord]
+
+    def __init__(
+        self,
+        records: Optional[dict[str, FileRecord]] = None,
+        output: Optional[OutputRecord] = None,
+    ):
+        """
+        Parameters
+        ----------
+        records : Optional[dict[str, FileRecord]], optional
+            File records keyed by absolute file path, by default None
+        output : Optional[OutputRecord], optional
+            Record of the outputs, by default None
+        """
+        self._records = records or {}
+        self._output = output
+
+    @staticmethod
+    def path_for(output_path: Path) -> Path:
+        """Get the manifest path of an output COLF file."""
+        return output_path.with_name(output_path.name + ".manifest.json")
+
+    @classmethod
+    def load(cls, path: Path) -> Manifest:
+        """Load a manifest file. An empty manifest is returned
+        if the file does not exist."""
+        if not path.exists():
+            return cls()
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["files"], data.get("output"))
+
+    def save(self, path: Path):
+        """Save the manifest to `path`."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"files": self._records, "output": self._output}, f, indent=2)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def resume_offset(self, path: Path, appendable=True) -> Optional[int]:
+        """Get the byte offset to resume consuming `path` from.
+
+        Parameters
+        ----------
+        path : Path
+            Input file path.
+        appendable : bool, optional
+            If data appended to the file can be consumed
+            on its own, by default True.
+
+        The modification time of a file whose content has not changed
+        is recorded again, so that it is not hashed on later runs.
+
+        Returns
+        -------
+        Optional[int]
+            None if the file has not changed since it was recorded.
+            Otherwise, the number of bytes already consumed,
+            which is 0 for files that have never been recorded.
+
+        Raises
+        ------
+        OwlError
+            If the consumed part of the file has been modified.
+        """
+        record = self._records.get(_key(path))
+        if record is None:
+            return 0
+
+        stat = os.stat(path)
+        if (
+            stat.st_size == record["offset"]
+            and stat.st_size == record["size"]
+            and stat.st_mtime_ns == record["mtime"]
+        ):
+            return None
+
+        if stat.st_size >= record["offset"]:
+            if hash_file(path, record["offset"]).hexdigest() == record["hash"]:
+                if stat.st_size == record["offset"]:
+                    # Only touched, the file is not hashed again next time.
+                    record["size"] = stat.st_size
+                    record["mtime"] = stat.st_mtime_ns
+                    return None
+                if appendable:
+                    return record["offset"]
+
+        raise OwlError(f"`{path}` has been modified since it was consolidated.")
+
+    def matches_output(
+        self, paths: Sequence[Path], compact: bool, rollups: bool, deduplicate: bool
+    ) -> bool:
+        """Check if the recorded outputs are the files at `paths`,
+        written with the same options, and all of them still exist.
+        See :meth:`record_output` for the parameters."""
+        return self._output == _output_record(
+            paths, compact, rollups, deduplicate
+        ) and all(path.exists() for path in paths)
+
+    def record_output(
+        self, paths: Sequence[Path], compact: bool, rollups: bool, deduplicate: bool
+    ):
+        """Record the outputs that the input files have been consolidated into.
+
+        Parameters
+        ----------
+        paths : Sequence[Path]
+            Output file paths.
+        compact : bool
+            If the outputs are written in the compact version of COLF.
+        rollups : bool
+            If the outputs contain the rollups.
+        deduplicate : bool
+            If duplicate entries have been dropped.
+        """
+        self._output = _output_record(paths, compact, rollups, deduplicate)
+
+    def record(self, path: Path, offset: int):
+        """Record that the first `offset` bytes of `path` have been consumed."""
+        stat = os.stat(path)
+        self._records[_key(path)] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "hash": hash_file(path, offset).hexdigest(),
+            "offset": offset,
+        }
+
+
+def hash_file(path: Path, n_bytes: int, chunk_size=1 << 20):
+    """Compute the SHA-256 hash of the first `n_bytes` of a file."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while n_bytes > 0:
+            chunk = f.read(min(chunk_size, n_bytes))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            n_bytes -= len(chunk)
+    return hasher
+
+
+def _key(path: Path) -> str:
+    return str(path.resolve())
+
+
+def _output_record(
+    paths: Sequence[Path], compact: bool, rollups: bool, deduplicate: bool
+) -> OutputRecord:
+    return {
+        "paths": [_key(path) for path in paths],
+        "compact": compact,
+        "rollups": rollups,
+        "deduplicate": deduplicate,
+    }
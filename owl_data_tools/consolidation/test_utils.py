@@ -1,4 +1,4 @@
-from ..types import Entry, Window
+from ..types import Entry, EntryBase, Window
 
 
 PATHS: list[str] = [
@@ -14,7 +14,7 @@ def window_mock(i: int, active=False) -> Window:
     return Window(PATHS[i], TITLES[i], active)
 
 
-def compare_entry(a: Entry, b: Entry) -> bool:
+def compare_entry(a: EntryBase, b: EntryBase) -> bool:
     if not (
         a.duration_since_last_input == b.duration_since_last_input
         and a.timestamp == b.timestamp
@@ -3,7 +3,20 @@ Commonly used data structures
 """
 
 from __future__ import annotations
-from typing import Generic, Optional, Sequence, TypeVar, TypedDict
+import bisect
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    TypeVar,
+    TypedDict,
+    overload,
+)
 from abc import ABC, abstractmethod
 
 T = TypeVar("T")
@@ -18,13 +31,27 @@ class RangeView(Sequence, Generic[T]):
     to other functions or classes without unnecessary duplication
     of the data in the list. It is useful when you want to view
     or process only a subsection of a long list.
+
+    Slicing a rangeview returns another rangeview of the same list,
+    so a rangeview can be narrowed repeatedly without copying.
+
+    Examples
+    --------
+    >>> view = RangeView(2, 6, list(range(10)))
+    >>> list(view[1:5:2])
+    [3, 5]
+    >>> list(view.where(lambda x: x % 3 == 0))
+    [3, 6]
     """
 
-    _items: list[T]
+    __slots__ = ("_items", "_start_i", "_len", "_step")
+
+    _items: Sequence[T]
     _start_i: int
     _len: int
+    _step: int
 
-    def __init__(self, start_i: int, n_items: int, items: list[T]):
+    def __init__(self, start_i: int, n_items: int, items: Sequence[T], step: int = 1):
         """Create a rangeview from the list of items.
 
         Parameters
@@ -33,32 +60,179 @@ class RangeView(Sequence, Generic[T]):
             Index where the rangeview begins.
         n_items : int
             Number of items the rangeview will contain.
-        items : list[T]
+        items : Sequence[T]
             List of items.
+        step : int, optional
+            Difference between the indexes of consecutive items
+            of the rangeview in `items`, by default 1.
         """
         self._items = items
         self._start_i = start_i
         self._len = n_items
+        self._step = step
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> RangeView[T]: ...
+
+    def __getitem__(self, index):
+        """Get item, or a rangeview of the items of a slice."""
+        if isinstance(index, slice):
+            indexes = range(self._len)[index]
+            return RangeView(
+                self._start_i + indexes.start * self._step,
+                len(indexes),
+                self._items,
+                indexes.step * self._step,
+            )
 
-    def __getitem__(self, index: int) -> T:
-        """Get item."""
         if index < 0 or index >= self._len:
             raise IndexError(f"Rangeview index out of range.\n" f"index={index}")
 
-        return self._items[self._start_i + index]
+        return self._items[self._start_i + index * self._step]
 
     def __len__(self) -> int:
         """Get the number of items."""
         return self._len
 
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over the items."""
+        start = self._start_i
+        stop = start + self._len * self._step
+        return map(self._items.__getitem__, range(start, stop, self._step))
+
+    def index(self, value: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        """Find the index of the first item equal to `value`,
+        between `start` and `stop`, like :meth:`list.index`.
+
+        Raises
+        ------
+        ValueError
+            If there is no item equal to `value`.
+        """
+        indexes = range(self._len)[start:stop]
+        for i, item in zip(indexes, self[start:stop]):
+            if item is value or item == value:
+                return i
+        raise ValueError(f"{value!r} is not in the rangeview.")
+
+    def stride(self, step: int) -> RangeView[T]:
+        """Get a rangeview of every `step`-th item, same as ``view[::step]``."""
+        return self[::step]
+
+    def where(self, predicate: Callable[[T], Any]) -> FilteredView[T]:
+        """Get a lazy view of the items for which `predicate` is true.
+
+        Parameters
+        ----------
+        predicate : Callable[[T], Any]
+            Function called with every item when the view is iterated.
+        """
+        return FilteredView(self, predicate)
 
-class Entry(ABC):
-    _windows_view: Sequence[Window]
+    def bisect_left(self, x: Any, key: Optional[Callable[[T], Any]] = None) -> int:
+        """Find the index where `x` would be inserted before any equal item,
+        with the items sorted in ascending order, like :func:`bisect.bisect_left`.
+        """
+        return bisect.bisect_left(self, x, key=key)
+
+    def bisect_right(self, x: Any, key: Optional[Callable[[T], Any]] = None) -> int:
+        """Find the index where `x` would be inserted after any equal item,
+        with the items sorted in ascending order, like :func:`bisect.bisect_right`.
+        """
+        return bisect.bisect_right(self, x, key=key)
+
+
+class FilteredView(Iterable[T]):
+    """Lazy view of the items of a :class:`RangeView`, or of another
+    :class:`FilteredView`, that satisfy a predicate, and/or of every
+    `step`-th of them. The items are only tested when iterated,
+    so the view can be narrowed further without copying.
+    """
+
+    __slots__ = ("_source", "_predicate", "_step")
+
+    _source: Iterable[T]
+    _predicate: Optional[Callable[[T], Any]]
+    _step: int
+
+    def __init__(
+        self,
+        source: Iterable[T],
+        predicate: Optional[Callable[[T], Any]] = None,
+        step: int = 1,
+    ):
+        """
+        Parameters
+        ----------
+        source : Iterable[T]
+            Items to be filtered.
+        predicate : Optional[Callable[[T], Any]], optional
+            Function that must be true for an item to be in the view,
+            by default None to keep every item.
+        step : int, optional
+            Keep every `step`-th item that satisfies `predicate`,
+            by default 1.
+        """
+        if step < 1:
+            raise ValueError(f"Step must be positive.\nstep={step}")
+        self._source = source
+        self._predicate = predicate
+        self._step = step
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over the items of the view."""
+        items: Iterator[T] = iter(self._source)
+        if self._predicate is not None:
+            items = filter(self._predicate, items)
+        if self._step != 1:
+            items = islice(items, 0, None, self._step)
+        return items
+
+    def where(self, predicate: Callable[[T], Any]) -> FilteredView[T]:
+        """Get a lazy view of the items of this view
+        for which `predicate` is true."""
+        return FilteredView(self, predicate)
+
+    def stride(self, step: int) -> FilteredView[T]:
+        """Get a lazy view of every `step`-th item of this view."""
+        return FilteredView(self, step=step)
+
+
+class EntryBase(ABC):
+    """Interface of an entry, implemented by :class:`Entry`,
+    and by views of consolidated data that do not store
+    the entry themselves."""
+
+    __slots__ = ()
+
+    @property
+    @abstractmethod
+    def timestamp(self) -> int:
+        """Timestamp when the entry was recorded."""
+
+    @property
+    @abstractmethod
+    def duration_since_last_input(self) -> Optional[int]:
+        """Duration since last user input."""
+
+    @property
+    @abstractmethod
+    def windows_view(self) -> Sequence[WindowBase]:
+        """Readonly range view of the windows contained in the entry."""
+
+
+class Entry(EntryBase):
+    __slots__ = ("_timestamp", "_windows_view", "_duration_since_last_input")
+
+    _windows_view: Sequence[WindowBase]
 
     def __init__(
         self,
         timestamp: int,
-        windows_view: Optional[Sequence[Window]] = None,
+        windows_view: Optional[Sequence[WindowBase]] = None,
         duration_since_last_input: Optional[int] = None,
     ):
         self._timestamp = timestamp
@@ -79,12 +253,37 @@ class Entry(ABC):
         return self._duration_since_last_input
 
     @property
-    def windows_view(self) -> Sequence[Window]:
+    def windows_view(self) -> Sequence[WindowBase]:
         """Readonly range view of the windows contained in the entry."""
         return self._windows_view
 
 
-class Window(ABC):
+class WindowBase(ABC):
+    """Interface of a window, implemented by :class:`Window`,
+    and by views of consolidated data that do not store
+    the window themselves."""
+
+    __slots__ = ()
+
+    @property
+    @abstractmethod
+    def path(self) -> str:
+        """Program path that owns the window."""
+
+    @property
+    @abstractmethod
+    def title(self) -> str:
+        """Title of the window."""
+
+    @property
+    @abstractmethod
+    def is_active(self) -> bool:
+        """If the user is currently active on the window."""
+
+
+class Window(WindowBase):
+    __slots__ = ("_path", "_title", "_is_active")
+
     def __init__(self, path, title, is_active=False):
         self._path = path
         self._title = title
@@ -1,6 +1,6 @@
 import pytest
 
-from .types import RangeView
+from .types import Entry, RangeView, Window
 
 
 class TestRangeView:
@@ -30,3 +30,81 @@ class TestRangeView:
 
         with pytest.raises(IndexError):
             dv[0]
+
+    def test_slice(self):
+        long_list = list(range(0, 10))
+        dv = RangeView(2, 6, long_list)
+
+        assert list(dv[1:5]) == [3, 4, 5, 6]
+        assert list(dv[1:5:2]) == [3, 5]
+        assert list(dv[::-1]) == [7, 6, 5, 4, 3, 2]
+        assert list(dv[::-2][1:]) == [5, 3]
+        assert list(dv[-2:]) == [6, 7]
+        assert list(dv[10:]) == []
+        assert list(dv.stride(3)) == [2, 5]
+
+        sliced = dv[1:5][1:]
+        assert isinstance(sliced, RangeView)
+        assert len(sliced) == 3
+        assert sliced[0] == 4
+        with pytest.raises(IndexError):
+            sliced[3]
+
+    def test_iter(self):
+        long_list = list(range(0, 10))
+        assert list(RangeView(2, 6, long_list)) == long_list[2:8]
+        assert list(RangeView(7, 3, long_list, -2)) == [7, 5, 3]
+        assert list(RangeView(2, 0, long_list)) == []
+        assert list(reversed(RangeView(2, 3, long_list))) == [4, 3, 2]
+
+    def test_index_bisect(self):
+        long_list = list(range(0, 10))
+        dv = RangeView(2, 6, long_list)
+
+        assert dv.index(4) == 2
+        assert dv.index(4, 2) == 2
+        assert dv[::-1].index(4) == 3
+        with pytest.raises(ValueError):
+            dv.index(4, 3)
+        with pytest.raises(ValueError):
+            dv.index(9)
+
+        assert dv.bisect_left(4) == 2
+        assert dv.bisect_right(4) == 3
+        assert dv.bisect_left(0) == 0
+        assert dv.bisect_right(99) == 6
+        assert dv[::-1].bisect_left(-4, key=lambda x: -x) == 3
+
+    def test_where(self):
+        long_list = list(range(0, 10))
+        dv = RangeView(1, 9, long_list)
+
+        calls = []
+
+        def is_even(x: int) -> bool:
+            calls.append(x)
+            return x % 2 == 0
+
+        even = dv.where(is_even)
+        assert calls == []
+        assert list(even) == [2, 4, 6, 8]
+        assert list(even.where(lambda x: x > 2)) == [4, 6, 8]
+        assert list(even.stride(2)) == [2, 6]
+        assert list(even.stride(2).where(lambda x: x > 2)) == [6]
+        assert list(dv.stride(2).where(is_even)) == []
+        with pytest.raises(ValueError):
+            even.stride(0)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        Entry(10, [Window("/program/0.exe", "Zero", True)], 60),
+        Window("/program/0.exe", "Zero", True),
+        RangeView(0, 2, [1, 2, 3]),
+    ],
+)
+def test_slots(obj):
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.undeclared = 1